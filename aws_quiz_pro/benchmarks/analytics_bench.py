@@ -0,0 +1,91 @@
+"""
+Attempt Analytics Benchmark
+
+Writes a synthetic answer history to a temporary statistics directory,
+then times loading it into the attempt frame, computing every report,
+serving the cached report, and folding in one newly recorded quiz.
+Run from the aws_quiz_pro directory:
+    python -m benchmarks.analytics_bench [--attempts 1000000] [--quiz-size 65]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from core.analytics import AttemptAnalytics
+from core.statistics import StatisticsManager
+
+
+TOPICS = ["Security", "Compute", "Storage", "Database", "Networking", "Monitoring", "Management"]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+
+def write_history(stats: StatisticsManager, attempts: int, quiz_size: int, seed: int = 0) -> None:
+    """Append archived quizzes holding about the given number of answers"""
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(0, 1 << 64, size=5000, dtype=np.uint64)
+    start = datetime(2025, 1, 1)
+    quizzes = max(attempts // quiz_size, 1)
+    entries = []
+    for seq in range(1, quizzes + 1):
+        picks = rng.integers(0, len(keys), size=quiz_size)
+        topics = rng.integers(0, len(TOPICS), size=quiz_size)
+        entries.append({
+            "seq": seq,
+            "date": (start + timedelta(minutes=int(seq * 37))).isoformat(),
+            "key": keys[picks].tolist(),
+            "id": picks.tolist(),
+            "topic": [TOPICS[topic] for topic in topics.tolist()],
+            "difficulty": [DIFFICULTIES[level] for level in rng.integers(0, 3, size=quiz_size).tolist()],
+            "correct": (rng.random(quiz_size) < 0.5 + topics / 20).astype(int).tolist(),
+            "time": np.round(rng.gamma(2.0, 20.0, size=quiz_size), 3).tolist()
+        })
+    stats._append_lines(stats.answers_file, entries)
+    stats.seq = stats.archived_seq = stats.answers_seq = quizzes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark attempt analytics")
+    parser.add_argument("--attempts", type=int, default=1000000, help="answers in the history")
+    parser.add_argument("--quiz-size", type=int, default=65, help="answers per quiz")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        stats = StatisticsManager(os.path.join(directory, "stats.json"))
+        write_history(stats, args.attempts, args.quiz_size)
+        analytics = AttemptAnalytics(stats)
+        
+        start = time.perf_counter()
+        frame = analytics.get_frame()
+        load_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        report = analytics.get_report()
+        compute_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        assert analytics.get_report() is report
+        cached_time = time.perf_counter() - start
+        
+        # One more quiz is appended to the frame, not reloaded with it
+        question = {"question": "q", "options": ["a", "b"], "topic": "Compute", "difficulty": "Easy"}
+        results = {"score": 1, "total": 1, "percentage": 100, "total_time": 30, "wrong_count": 0,
+                   "is_exam": False}
+        stats.record_quiz(results, "random", [{"question": question, "is_correct": True, "time_taken": 30}])
+        start = time.perf_counter()
+        report = analytics.get_report()
+        update_time = time.perf_counter() - start
+        assert report["attempts"] == len(frame) + 1
+        
+        print(f"{report['attempts']} attempts, {len(report['by_question'])} questions, "
+              f"{len(report['trend'])} days")
+        print(f"load {load_time * 1000:.0f} ms, compute {compute_time * 1000:.0f} ms, "
+              f"cached {cached_time * 1e6:.1f} us, after one quiz {update_time * 1000:.0f} ms")
+        print(report["by_topic"].round(3).to_string())
+        print("time percentiles:", {p: round(t, 1) for p, t in report["time_percentiles"].items()})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Question Bank Memory and Selection Benchmark
+
+Compares a plain list of question dicts with QuestionBank on memory held
+(measured with tracemalloc), single and combined filters, exam sampling,
+shuffling, and reading question text back in order and for a random exam.
+Run from the aws_quiz_pro directory:
+    python -m benchmarks.bank_bench [--questions 50000] [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from benchmarks.synthetic_pdf import make_sentence
+from core.question_bank import QuestionBank
+from core.topic_classifier import TopicClassifier
+
+
+SHARED_OPTIONS = ["All of the above.", "None of the above.", "True.", "False."]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+SOURCES = 5
+
+
+def make_questions(count: int, seed: int = 0) -> List[Dict]:
+    """Build question dicts shaped like PDFParser output"""
+    rng = random.Random(seed)
+    classifier = TopicClassifier()
+    questions = []
+    for number in range(1, count + 1):
+        text = make_sentence(rng, rng.randint(20, 60))
+        options = [make_sentence(rng, rng.randint(4, 25)) for _ in range(3)]
+        options.append(rng.choice(SHARED_OPTIONS) if rng.random() < 0.3
+                       else make_sentence(rng, rng.randint(4, 25)))
+        answered = rng.choice([0, 0, 1, 2])
+        questions.append({
+            "id": number,
+            "question": text,
+            "options": options,
+            "correct_answers": sorted(rng.sample(range(4), 2 if rng.random() < 0.2 else 1)),
+            "explanation": make_sentence(rng, 30) if rng.random() < 0.5 else "",
+            "difficulty": rng.choice(DIFFICULTIES),
+            "times_answered": answered,
+            "times_correct": rng.randint(0, answered),
+            "source": f"dump{number % SOURCES}.pdf"
+        })
+    
+    topics = classifier.classify_many([question["question"] for question in questions])
+    for question, (topic, secondary_topics) in zip(questions, topics):
+        question["topic"] = topic
+        question["secondary_topics"] = secondary_topics
+    return questions
+
+
+def measure_memory(build: Callable[[], object]) -> int:
+    """Get bytes still allocated by the object a builder returns"""
+    tracemalloc.start()
+    result = build()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def read_exam(exam) -> List[tuple]:
+    """Read the strings shown for every question of an exam"""
+    return [(q["question"], q["options"], q["explanation"]) for q in exam]
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Get the fastest of several timed calls"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark question bank storage")
+    parser.add_argument("--questions", type=int, default=50000, help="questions in the bank")
+    parser.add_argument("--sample", type=int, default=65, help="questions drawn per exam")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per timing; best is kept")
+    args = parser.parse_args()
+    
+    dict_bytes = measure_memory(lambda: make_questions(args.questions))
+    # The dicts are consumed one at a time, so only the packed bank stays allocated
+    bank_bytes = measure_memory(lambda: QuestionBank(iter(make_questions(args.questions))))
+    
+    questions = make_questions(args.questions)
+    bank = QuestionBank(questions)
+    timings = {
+        "filter": (
+            best_time(lambda: [q for q in questions.copy() if q["difficulty"] == "Hard"], args.repeat),
+            best_time(lambda: bank.filter(difficulties=["Hard"]), args.repeat)
+        ),
+        "combined": (
+            best_time(lambda: [q for q in questions if q["topic"] in ("Storage", "Compute")
+                               and q["difficulty"] != "Easy" and len(q["correct_answers"]) > 1
+                               and q["source"] == "dump1.pdf"
+                               and q["times_answered"] > q["times_correct"]], args.repeat),
+            best_time(lambda: bank.filter(topics=["Storage", "Compute"], difficulties=["Medium", "Hard"],
+                                          multi_answer=True, sources=["dump1.pdf"],
+                                          previously_wrong=True), args.repeat)
+        ),
+        "sample": (
+            best_time(lambda: random.sample(questions, args.sample), args.repeat),
+            best_time(lambda: bank.sample(args.sample), args.repeat)
+        ),
+        "shuffle": (
+            best_time(lambda: random.shuffle(questions.copy()), args.repeat),
+            best_time(lambda: bank.copy().shuffle(), args.repeat)
+        ),
+        "read": (
+            best_time(lambda: [q["question"] for q in questions[:1000]], args.repeat),
+            best_time(lambda: [q["question"] for q in bank[:1000]], args.repeat)
+        ),
+        # A fresh exam each run, so its blocks are mostly not decompressed yet
+        "random": (
+            best_time(lambda: read_exam(random.sample(questions, args.sample)), args.repeat),
+            best_time(lambda: read_exam(bank.sample(args.sample)), args.repeat)
+        )
+    }
+    
+    print(f"{args.questions} questions")
+    print(f"{'':<10}{'dicts':>14}{'QuestionBank':>14}{'ratio':>8}")
+    print(f"{'memory':<10}{dict_bytes / 2 ** 20:>11.1f} MB{bank_bytes / 2 ** 20:>11.1f} MB"
+          f"{dict_bytes / bank_bytes:>7.1f}x")
+    for name, (dict_time, bank_time) in timings.items():
+        print(f"{name:<10}{dict_time * 1000:>11.2f} ms{bank_time * 1000:>11.2f} ms"
+              f"{dict_time / bank_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
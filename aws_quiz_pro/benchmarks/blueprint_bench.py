@@ -0,0 +1,64 @@
+"""
+Blueprint Exam Generation Benchmark
+
+Times generating a batch of topic-stratified exams in one vectorized call
+against building the same exams one at a time with random.sample, and
+checks that every exam holds distinct questions in the planned topic mix.
+Run from the aws_quiz_pro directory:
+    python -m benchmarks.blueprint_bench [--questions 50000] [--exams 1000]
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+import numpy as np
+from benchmarks.bank_bench import make_questions
+from core.exam_blueprint import ExamBlueprint
+from core.question_bank import QuestionBank
+
+
+BLUEPRINT_TOPICS = {"Security": 30, "Compute": 20, "Storage": 15, "Database": 15,
+                    "Networking": 10, "Monitoring": 5, "Management": 5}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark blueprint exam generation")
+    parser.add_argument("--questions", type=int, default=50000, help="questions in the bank")
+    parser.add_argument("--exams", type=int, default=1000, help="exams per batch")
+    parser.add_argument("--count", type=int, default=65, help="questions per exam")
+    args = parser.parse_args()
+    
+    bank = QuestionBank(make_questions(args.questions))
+    blueprint = ExamBlueprint()
+    blueprint.topics = BLUEPRINT_TOPICS
+    
+    start = time.perf_counter()
+    exams, distribution = blueprint.sample_exams(bank, args.count, args.exams)
+    batch_time = time.perf_counter() - start
+    
+    # The same exams built per exam and per topic in Python
+    pools = [pool.tolist() for pool in bank.get_topic_pools()]
+    _, _, counts = blueprint.allocate(bank, args.count)
+    start = time.perf_counter()
+    for _ in range(args.exams):
+        exam = []
+        for pool, count in zip(pools, counts.tolist()):
+            exam.extend(random.sample(pool, count))
+        random.shuffle(exam)
+    loop_time = time.perf_counter() - start
+    
+    codes = np.frombuffer(bank.topic_codes, dtype=np.uint16)
+    assert all(len(set(exam)) == args.count for exam in exams.tolist())
+    assert all(Counter(codes[exam].tolist()) == Counter(codes[exams[0]].tolist()) for exam in exams)
+    
+    print(f"{args.exams} exams of {args.count} from {args.questions} questions")
+    print(f"batch {batch_time * 1000:.1f} ms, per-exam loop {loop_time * 1000:.1f} ms "
+          f"({loop_time / batch_time:.1f}x)")
+    for topic, entry in distribution.items():
+        target = entry["target_percent"] or 0
+        print(f"  {topic:<12} target {target:5.1f}%  got {entry['count']:3d} ({entry['percent']:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+PDF Parser Throughput Benchmark
+
+Generates synthetic dumps and times every parsing stage, each in a fresh
+process so peak memory is measured per stage. Run from the aws_quiz_pro
+directory:
+    python -m benchmarks.parser_bench [--questions 300 3000] [--output results.json]
+    python -m benchmarks.parser_bench --baseline old.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import fitz
+from benchmarks.synthetic_pdf import generate_pdf, add_generator_arguments
+from core.cache_manager import CacheManager
+from core.pdf_parser import PDFParser
+from core.question_tokenizer import QuestionTokenizer
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak memory is then left out
+    resource = None
+
+
+STAGES = ["parse_cold", "parse_warm_pages", "parse_warm", "cache_load_full",
+          "tokenizer", "detect_topic", "detect_topic_batch"]
+
+
+def get_peak_rss_mb() -> Optional[float]:
+    """Get peak resident memory of this process and its finished children"""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return round(peak / scale, 1)
+
+
+def best_time(func: Callable[[], object], setup: Callable[[], None], repeat: int) -> float:
+    """Get the fastest of several timed calls, running setup untimed before each"""
+    best = float("inf")
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def clear_cache(cache_dir: str, pattern: str = "") -> None:
+    """Delete cache files whose name contains a pattern"""
+    for name in os.listdir(cache_dir):
+        if pattern in name:
+            os.remove(os.path.join(cache_dir, name))
+
+
+def run_stage(stage: str, pdf_filename: str, cache_dir: str, repeat: int) -> Dict:
+    """Time one stage; runs in its own process"""
+    def make_parser():
+        return PDFParser(cache_manager=CacheManager(cache_dir))
+    
+    def no_setup():
+        pass
+    
+    if stage == "parse_cold":
+        # Also leaves the caches in place for the warm stages
+        seconds = best_time(lambda: make_parser().parse_pdf(pdf_filename),
+                            lambda: clear_cache(cache_dir), repeat)
+    elif stage == "parse_warm_pages":
+        # Page texts cached, question bank not: fingerprint, tokenize, write bank
+        seconds = best_time(lambda: make_parser().parse_pdf(pdf_filename),
+                            lambda: clear_cache(cache_dir, ".bank"), repeat)
+    elif stage == "parse_warm":
+        seconds = best_time(lambda: make_parser().parse_pdf(pdf_filename), no_setup, repeat)
+    elif stage == "cache_load_full":
+        seconds = best_time(
+            lambda: [dict(question) for question in make_parser().get_cached_questions(pdf_filename)],
+            no_setup, repeat
+        )
+    elif stage == "tokenizer":
+        parser = make_parser()
+        text = "\n".join(text for _, text in parser._iter_page_texts(pdf_filename))
+        seconds = best_time(lambda: QuestionTokenizer().tokenize(text), no_setup, repeat)
+    elif stage == "detect_topic":
+        parser = make_parser()
+        texts = [question["question"] + " " + " ".join(question["options"])
+                 for question in parser.parse_pdf(pdf_filename)]
+        seconds = best_time(lambda: [parser._detect_topic(text) for text in texts],
+                            no_setup, repeat)
+    elif stage == "detect_topic_batch":
+        parser = make_parser()
+        texts = [question["question"] + " " + " ".join(question["options"])
+                 for question in parser.parse_pdf(pdf_filename)]
+        seconds = best_time(lambda: parser.topic_classifier.classify_many(texts), no_setup, repeat)
+    else:
+        raise ValueError(f"Unknown stage: {stage}")
+    
+    return {"seconds": round(seconds, 5), "peak_rss_mb": get_peak_rss_mb()}
+
+
+def benchmark_pdf(pdf_info: Dict, repeat: int) -> Dict[str, Dict]:
+    """Run all stages against one PDF"""
+    cache_dir = tempfile.mkdtemp(prefix="parser_bench_cache_")
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    try:
+        for stage in STAGES:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run_stage, stage, pdf_info["file"],
+                                         cache_dir, repeat).result()
+            seconds = max(result["seconds"], 1e-9)
+            result["pages_per_sec"] = round(pdf_info["pages"] / seconds, 1)
+            result["questions_per_sec"] = round(pdf_info["questions"] / seconds, 1)
+            results[stage] = result
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+def compare(results: List[Dict], baseline_file: str) -> None:
+    """Print per-stage speedups against a previous results file"""
+    with open(baseline_file, 'r') as f:
+        baseline = {(run["pdf"]["questions"], run["pdf"]["pages"]): run["stages"]
+                    for run in json.load(f)["runs"]}
+    
+    for run in results:
+        old_stages = baseline.get((run["pdf"]["questions"], run["pdf"]["pages"]))
+        if not old_stages:
+            continue
+        print(f"\nvs {baseline_file} ({run['pdf']['questions']} questions):")
+        for stage, result in run["stages"].items():
+            if stage in old_stages:
+                speedup = old_stages[stage]["seconds"] / max(result["seconds"], 1e-9)
+                print(f"  {stage:<18} {speedup:>7.2f}x")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark PDF parsing stages")
+    parser.add_argument("--questions", type=int, nargs="+", default=[300, 3000],
+                        help="question counts of the generated PDFs")
+    add_generator_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; best is kept")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    args = parser.parse_args()
+    
+    pdf_dir = tempfile.mkdtemp(prefix="parser_bench_pdf_")
+    runs = []
+    try:
+        for questions in args.questions:
+            pdf_info = generate_pdf(
+                os.path.join(pdf_dir, f"dump_{questions}.pdf"), questions, args.pages,
+                args.options, args.multi_answer_ratio, args.explanation_words,
+                not args.no_noise, args.seed
+            )
+            print(f"{questions} questions, {pdf_info['pages']} pages")
+            stages = benchmark_pdf(pdf_info, args.repeat)
+            for stage, result in stages.items():
+                print(f"  {stage:<18} {result['seconds']:>9.4f}s "
+                      f"{result['pages_per_sec']:>11.1f} pages/s "
+                      f"{result['questions_per_sec']:>11.1f} questions/s "
+                      f"{result['peak_rss_mb'] or 0:>8.1f} MB")
+            pdf_info["file"] = os.path.basename(pdf_info["file"])
+            runs.append({"pdf": pdf_info, "stages": stages})
+    finally:
+        shutil.rmtree(pdf_dir, ignore_errors=True)
+    
+    if args.baseline:
+        compare(runs, args.baseline)
+    
+    if args.output:
+        report = {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pymupdf": fitz.VersionBind,
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+            "runs": runs
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Synthetic Exam Dump PDF Generator
+
+Builds PDFs in the layout the parser expects, entirely offline. Run from the
+aws_quiz_pro directory:
+    python -m benchmarks.synthetic_pdf out.pdf [--questions N] [--pages N]
+"""
+
+import argparse
+import math
+import random
+import textwrap
+from typing import Dict, List, Optional
+import fitz
+
+
+SERVICES = ["EC2", "S3", "Lambda", "VPC", "subnet", "RDS", "Aurora", "DynamoDB",
+            "CloudWatch", "CloudTrail", "IAM", "KMS", "Route 53", "CloudFront",
+            "ECS", "EKS", "SQS", "SNS", "Kinesis", "Glacier", "billing", "Budgets"]
+WORDS = ["company", "application", "requirements", "solution", "architect", "data",
+         "users", "region", "latency", "cost", "securely", "traffic", "availability",
+         "workload", "storage", "instance", "policy", "encryption", "backup", "scale"]
+
+PAGE_HEADER = "AWS Certified Solutions Architect - Associate Exam Dump"
+FONT_SIZE = 7
+LINE_HEIGHT = FONT_SIZE * 1.2
+MARGIN = 30
+WRAP_WIDTH = 110
+
+
+def make_sentence(rng: random.Random, words: int) -> str:
+    """Build a sentence mixing service names and filler words"""
+    parts = [rng.choice(SERVICES) if rng.random() < 0.2 else rng.choice(WORDS)
+             for _ in range(words)]
+    return " ".join(parts).capitalize() + "."
+
+
+def make_question_lines(rng: random.Random, number: int, options: int,
+                        multi_answer_ratio: float, explanation_words: int,
+                        noise: bool) -> List[str]:
+    """Build the text lines of one question"""
+    lines = [f"Question #{number}"]
+    lines.extend(textwrap.wrap(make_sentence(rng, rng.randint(20, 60)), WRAP_WIDTH))
+    lines.append("Which solution will meet these requirements?")
+    
+    answer_count = 2 if options > 2 and rng.random() < multi_answer_ratio else 1
+    answers = sorted(rng.sample(range(options), answer_count))
+    voted = answers[0] if noise and rng.random() < 0.5 else None
+    for index in range(options):
+        option_lines = textwrap.wrap(
+            f"{chr(65 + index)}. {make_sentence(rng, rng.randint(4, 25))}", WRAP_WIDTH
+        )
+        if index == voted:
+            option_lines[-1] += " Most Voted"
+        lines.extend(option_lines)
+    
+    if noise and voted is None and rng.random() < 0.3:
+        lines.append("Most Voted")
+    lines.append("Correct Answer: " + "".join(chr(65 + index) for index in answers))
+    
+    if explanation_words:
+        explanation = "Explanation: " + make_sentence(rng, explanation_words)
+        lines.extend(textwrap.wrap(explanation, WRAP_WIDTH))
+        lines.append("")
+    return lines
+
+
+def generate_pdf(pdf_filename: str, questions: int = 300, pages: Optional[int] = None,
+                 options: int = 4, multi_answer_ratio: float = 0.2,
+                 explanation_words: int = 30, noise: bool = True,
+                 seed: int = 1) -> Dict:
+    """Write a synthetic dump PDF and return what was generated
+    
+    When ``pages`` is given, lines are spread evenly over that many pages as
+    far as the page height allows; otherwise pages are filled completely.
+    Noise adds a running header and footer to every page and "Most Voted"
+    markers to some questions.
+    """
+    rng = random.Random(seed)
+    lines = []
+    for number in range(1, questions + 1):
+        lines.extend(make_question_lines(rng, number, options, multi_answer_ratio,
+                                         explanation_words, noise))
+    
+    page_rect = fitz.paper_rect("a4")
+    max_lines = int((page_rect.height - 2 * MARGIN) / LINE_HEIGHT) - (2 if noise else 0)
+    lines_per_page = max_lines
+    if pages:
+        lines_per_page = max(1, min(max_lines, math.ceil(len(lines) / pages)))
+    
+    chunks = [lines[start:start + lines_per_page]
+              for start in range(0, len(lines), lines_per_page)]
+    doc = fitz.open()
+    for page_number, chunk in enumerate(chunks, 1):
+        page = doc.new_page(width=page_rect.width, height=page_rect.height)
+        if noise:
+            chunk = [PAGE_HEADER] + chunk + [f"Page {page_number} of {len(chunks)}"]
+        page.insert_text((MARGIN, MARGIN), chunk, fontsize=FONT_SIZE,
+                         lineheight=LINE_HEIGHT / FONT_SIZE)
+    doc.save(pdf_filename)
+    doc.close()
+    
+    return {
+        "file": pdf_filename,
+        "pages": len(chunks),
+        "questions": questions,
+        "options": options,
+        "multi_answer_ratio": multi_answer_ratio,
+        "explanation_words": explanation_words,
+        "noise": noise,
+        "seed": seed
+    }
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the generator options to a command line parser"""
+    parser.add_argument("--pages", type=int, help="spread questions over this many pages")
+    parser.add_argument("--options", type=int, default=4, help="options per question")
+    parser.add_argument("--multi-answer-ratio", type=float, default=0.2,
+                        help="fraction of questions with two correct answers")
+    parser.add_argument("--explanation-words", type=int, default=30,
+                        help="explanation length; 0 for no explanations")
+    parser.add_argument("--no-noise", action="store_true",
+                        help="omit page headers, footers and 'Most Voted' markers")
+    parser.add_argument("--seed", type=int, default=1)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic exam dump PDF")
+    parser.add_argument("output", help="PDF file to write")
+    parser.add_argument("--questions", type=int, default=300, help="number of questions")
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+    
+    info = generate_pdf(args.output, args.questions, args.pages, args.options,
+                        args.multi_answer_ratio, args.explanation_words,
+                        not args.no_noise, args.seed)
+    print(f"Wrote {info['questions']} questions on {info['pages']} pages to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
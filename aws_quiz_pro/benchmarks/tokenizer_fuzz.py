@@ -0,0 +1,243 @@
+"""
+Question Tokenizer Fuzz and Throughput Benchmark
+
+Run from the aws_quiz_pro directory:
+    python -m benchmarks.tokenizer_fuzz [--iterations N] [--size-mb MB] [--legacy]
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import re
+import time
+from typing import Callable, Dict, List, Optional
+from core.question_tokenizer import QuestionTokenizer
+
+
+# The DOTALL pattern the tokenizer replaced, kept for comparison runs
+LEGACY_PATTERN = re.compile(
+    r"Question #(\d+)\n(.*?)\n((?:[A-E]\. .*?\n)+)(?:Most Voted\n)?Correct Answer: ([A-E]+)(?:\nExplanation:\s*(.*?)(?=\n\n|\nQuestion #|\Z))?",
+    re.DOTALL
+)
+
+WORDS = ["instance", "bucket", "VPC", "subnet", "Lambda", "policy", "encryption",
+         "company", "requirements", "solution", "latency", "cost", "region"]
+
+
+def make_question(rng: random.Random, number: int, answer: bool = True,
+                  explanation: bool = True, options: int = 4) -> List[str]:
+    """Build the lines of one question"""
+    lines = [f"Question #{number}",
+             " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 40)))]
+    for index in range(options):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12)))
+        lines.append(f"{chr(65 + index)}. {text}")
+    if answer:
+        lines.append("Most Voted")
+        lines.append(f"Correct Answer: {chr(65 + rng.randrange(options))}")
+    if answer and explanation:
+        lines.append("Explanation: " + " ".join(rng.choice(WORDS) for _ in range(20)))
+        lines.append("")
+    return lines
+
+
+def build_dump(rng: random.Random, size: int, **question_args) -> str:
+    """Concatenate questions until the text reaches the given size"""
+    lines, length, number = [], 0, 1
+    while length < size:
+        question = make_question(rng, number, **question_args)
+        lines.extend(question)
+        length += sum(len(line) + 1 for line in question)
+        number += 1
+    return "\n".join(lines)
+
+
+def well_formed(rng: random.Random, size: int) -> str:
+    """Valid dump"""
+    return build_dump(rng, size, options=rng.choice([4, 5, 6]))
+
+
+def missing_answers(rng: random.Random, size: int) -> str:
+    """No question has a 'Correct Answer:' line; worst case for the legacy regex"""
+    return build_dump(rng, size, answer=False)
+
+
+def option_flood(rng: random.Random, size: int) -> str:
+    """A single header followed by an endless run of option lines"""
+    lines, length = ["Question #1", "stem"], 17
+    index = 0
+    while length < size:
+        line = f"{chr(65 + index % 26)}. {rng.choice(WORDS)}"
+        lines.append(line)
+        length += len(line) + 1
+        index += 1
+    return "\n".join(lines)
+
+
+def header_storm(rng: random.Random, size: int) -> str:
+    """Headers with no body at all"""
+    count = max(1, size // 16)
+    return "\n".join(f"Question #{i}" for i in range(count))
+
+
+def random_garbage(rng: random.Random, size: int) -> str:
+    """Random fragments of dump syntax"""
+    fragments = ["Question #", "A. ", "B. ", "Correct Answer: ", "Explanation:",
+                 "Most Voted", "\n", "\n\n", "7", "AB", " "] + WORDS
+    parts, length = [], 0
+    while length < size:
+        part = rng.choice(fragments)
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+
+CASES: Dict[str, Callable[[random.Random, int], str]] = {
+    "well_formed": well_formed,
+    "missing_answers": missing_answers,
+    "option_flood": option_flood,
+    "header_storm": header_storm,
+    "random_garbage": random_garbage,
+}
+
+
+def mutate(rng: random.Random, text: str) -> str:
+    """Randomly drop, duplicate or corrupt lines"""
+    lines = text.split("\n")
+    for _ in range(rng.randint(1, max(1, len(lines) // 10))):
+        position = rng.randrange(len(lines))
+        action = rng.random()
+        if action < 0.4:
+            del lines[position]
+        elif action < 0.7:
+            lines.insert(position, lines[position])
+        else:
+            lines[position] = lines[position][:rng.randint(0, len(lines[position]))]
+        if not lines:
+            lines = [""]
+    return "\n".join(lines)
+
+
+def check_invariants(text: str) -> None:
+    """Tokenize in random chunks and check every header is accounted for"""
+    rng = random.Random(len(text))
+    tokenizer = QuestionTokenizer()
+    blocks = []
+    position = 0
+    while position < len(text):
+        step = rng.randint(1, 4096)
+        blocks.extend(tokenizer.feed(text[position:position + step]))
+        position += step
+    blocks.extend(tokenizer.close())
+    
+    whole = QuestionTokenizer().tokenize(text)
+    assert blocks == whole, "chunked and whole-text tokenization differ"
+    
+    headers = sum(1 for line in text.split("\n")
+                  if QuestionTokenizer()._match_header(line) is not None)
+    assert len(blocks) <= headers, "more questions than headers"
+    assert len(blocks) + len(tokenizer.errors) >= headers, "header silently skipped"
+
+
+def fuzz(iterations: int, seed: int) -> int:
+    """Run mutation fuzzing; returns number of cases checked"""
+    rng = random.Random(seed)
+    for _ in range(iterations):
+        case = rng.choice(list(CASES.values()))
+        text = case(rng, rng.randint(200, 20000))
+        check_invariants(mutate(rng, text))
+    return iterations
+
+
+def measure(func: Callable[[], object]) -> float:
+    """Time a call in seconds"""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _run_legacy(text: str) -> None:
+    """Run the legacy regex over a text"""
+    list(LEGACY_PATTERN.finditer(text))
+
+
+def time_legacy(text: str, budget: float) -> Optional[float]:
+    """Time the legacy regex in a child process; None if it exceeds the budget
+    
+    Its backtracking is exponential on some inputs, so a run cannot simply be
+    interrupted from inside the interpreter.
+    """
+    process = multiprocessing.Process(target=_run_legacy, args=(text,))
+    start = time.perf_counter()
+    process.start()
+    process.join(budget)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return None
+    return time.perf_counter() - start
+
+
+def benchmark_legacy(text: str, budget: float) -> Dict[str, Optional[float]]:
+    """Time the legacy regex on doubling prefixes until it blows the budget"""
+    timings = {}
+    kilobytes = 1
+    while kilobytes <= 64:
+        elapsed = time_legacy(text[:kilobytes * 1024], budget)
+        timings[f"{kilobytes}kb"] = None if elapsed is None else round(elapsed, 4)
+        if elapsed is None:
+            break
+        kilobytes *= 2
+    return timings
+
+
+def benchmark(size_mb: float, legacy: bool, seed: int, budget: float = 5.0) -> List[Dict]:
+    """Measure tokenizer throughput for every case at two sizes"""
+    results = []
+    for name, case in CASES.items():
+        for scale in (0.25, 1.0):
+            size = int(size_mb * scale * 1024 * 1024)
+            text = case(random.Random(seed), size)
+            megabytes = len(text.encode('utf-8')) / (1024 * 1024)
+            elapsed = measure(lambda: QuestionTokenizer().tokenize(text))
+            results.append({
+                "case": name,
+                "size_mb": round(megabytes, 3),
+                "tokenizer_mb_per_sec": round(megabytes / elapsed, 2)
+            })
+        
+        if legacy:
+            results[-1]["legacy_seconds"] = benchmark_legacy(text, budget)
+    return results
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Fuzz and benchmark the question tokenizer")
+    parser.add_argument("--iterations", type=int, default=500, help="fuzz cases to run")
+    parser.add_argument("--size-mb", type=float, default=4.0, help="benchmark input size")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--legacy", action="store_true", help="also time the legacy regex")
+    parser.add_argument("--legacy-budget", type=float, default=5.0,
+                        help="seconds before a legacy regex run is abandoned")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+    
+    print(f"Fuzzed {fuzz(args.iterations, args.seed)} cases: all invariants held")
+    
+    results = benchmark(args.size_mb, args.legacy, args.seed, args.legacy_budget)
+    for result in results:
+        print(f"{result['case']:<16} {result['size_mb']:>8.2f} MB  "
+              f"{result['tokenizer_mb_per_sec']:>8.2f} MB/s")
+        for size, seconds in result.get("legacy_seconds", {}).items():
+            timing = "timed out" if seconds is None else f"{seconds:.4f}s"
+            print(f"{'':<16} legacy regex on {size}: {timing}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,14 @@ MIN_HEIGHT = 700
 # File Settings
 CONFIG_FILE = "quiz_config.json"
 STATS_FILE = "quiz_stats.json"
+REVIEW_FILE = "quiz_review.json"
+REVIEW_SAVE_EVERY = 5  # Answers recorded between review schedule saves
+BLUEPRINT_FILE = "exam_blueprint.json"
+JOURNAL_FILE = "quiz_session.jsonl"
+JOURNAL_SYNC_EVERY = 8  # Journal records written between fsyncs
+PERFORMANCE_DB = "quiz_performance.db"
+STORE_BATCH_SIZE = 64  # Answers committed per performance store transaction
+STORE_FLUSH_INTERVAL = 0.5  # Seconds a queued answer may wait for its batch
 CACHE_PREFIX = "quiz_cache_"
 
 # Quiz Settings
@@ -21,6 +29,18 @@ EXAM_QUESTION_COUNT = 65
 EXAM_PASSING_SCORE = 70
 PRACTICE_PASSING_SCORE = 80
 
+# PDF Extraction
+PDF_SERIAL_PAGE_THRESHOLD = 64  # Smaller documents are extracted in-process
+PDF_MIN_PAGES_PER_CHUNK = 8
+PDF_MAX_PAGES_PER_CHUNK = 64
+
+# Streaming Load
+STREAM_FIRST_BATCH = 50  # Questions parsed before a quiz can start
+CLASSIFY_BATCH_SIZE = 256  # Most parsed questions topic-classified together
+LOAD_PROGRESS_INTERVAL = 0.1  # Seconds between load progress updates
+MAX_LOAD_WORKERS = 4  # PDFs parsed at once when loading several
+SOURCE_ID_STRIDE = 100000  # Question id offset per source PDF in a merged bank
+
 # File Extensions
 PDF_EXTENSIONS = [("PDF files", "*.pdf"), ("All files", "*.*")]
 CSV_EXTENSIONS = [("CSV files", "*.csv"), ("All files", "*.*")]
@@ -21,7 +21,16 @@ class ConfigManager:
         "sound_enabled": True,
         "theme": "dark",
         "appearance_mode": "dark",
-        "default_question_order": "Random"
+        "default_question_order": "Random",
+        "cache_compression": "none",
+        "cache_dir": ".",
+        "cache_max_mb": 512,
+        "dedup_mode": "off",
+        "dedup_threshold": 0.85,
+        "review_batch_size": 20,
+        "weight_error_exponent": 1.0,
+        "weight_recency_exponent": 0.5,
+        "weight_topic_exponent": 1.0
     }
     
     def __init__(self, config_file: str):
@@ -0,0 +1,120 @@
+"""
+Attempt Analytics
+"""
+
+from typing import Dict, Iterable, Optional
+import numpy as np
+import pandas as pd
+from core.statistics import StatisticsManager
+
+
+class AttemptAnalytics:
+    """Accuracy and response-time reports over every recorded answer
+    
+    The answer history is held in one columnar DataFrame, one row per
+    attempt, with categorical topic and difficulty columns. Quizzes
+    recorded since the last refresh are appended without re-reading the
+    rest. Reports are grouped aggregations over whole columns and are
+    cached until the history version (the statistics event sequence
+    number, and a count of resets) changes.
+    """
+    
+    PERCENTILES = [50, 75, 90, 95, 99]
+    ROLLING_DAYS = 7
+    
+    def __init__(self, stats_manager: StatisticsManager):
+        self.stats_manager = stats_manager
+        self._frame = self.build_frame([])
+        self._frame_seq = 0
+        self._frame_generation = 0
+        self._report: Optional[Dict] = None
+        self._report_version: Optional[tuple] = None
+    
+    @staticmethod
+    def build_frame(entries: Iterable[Dict]) -> pd.DataFrame:
+        """Get a frame of attempts from per-quiz answer columns"""
+        columns = {"key": [], "id": [], "topic": [], "difficulty": [], "correct": [], "time": []}
+        dates, counts = [], []
+        for entry in entries:
+            for name, values in columns.items():
+                values.extend(entry[name])
+            dates.append(entry["date"])
+            counts.append(len(entry["correct"]))
+        
+        return pd.DataFrame({
+            "key": np.array(columns["key"], dtype=np.uint64),
+            "id": np.array(columns["id"], dtype=np.int64),
+            "topic": pd.Categorical(columns["topic"]),
+            "difficulty": pd.Categorical(columns["difficulty"]),
+            "correct": np.array(columns["correct"], dtype=np.int8),
+            "time": np.array(columns["time"], dtype=np.float32),
+            "answered_at": np.repeat(pd.to_datetime(dates, format="ISO8601").values, counts)
+        })
+    
+    def get_frame(self) -> pd.DataFrame:
+        """Get every recorded attempt, reading only quizzes not loaded yet"""
+        if self.stats_manager.generation != self._frame_generation:
+            # Statistics were reset
+            self._frame = self.build_frame([])
+            self._frame_seq = self.stats_manager.archived_seq
+            self._frame_generation = self.stats_manager.generation
+        if self.stats_manager.seq > self._frame_seq:
+            entries = list(self.stats_manager.iter_answers(self._frame_seq))
+            if entries:
+                frame = self.build_frame(entries)
+                if len(self._frame):
+                    # Align categories so the combined columns stay categorical
+                    for name in ("topic", "difficulty"):
+                        categories = self._frame[name].cat.categories.union(frame[name].cat.categories)
+                        self._frame[name] = self._frame[name].cat.set_categories(categories)
+                        frame[name] = frame[name].cat.set_categories(categories)
+                    frame = pd.concat([self._frame, frame], ignore_index=True)
+                self._frame = frame
+            self._frame_seq = self.stats_manager.seq
+        return self._frame
+    
+    def get_report(self) -> Dict:
+        """Get all reports, recomputed only when the history changed"""
+        version = (self.stats_manager.generation, self.stats_manager.seq)
+        if self._report is None or self._report_version != version:
+            self._report = self.compute(self.get_frame())
+            self._report_version = version
+        return self._report
+    
+    def compute(self, frame: pd.DataFrame) -> Dict:
+        """Compute accuracy by topic, difficulty, question and hour of day,
+        response-time percentiles and the daily accuracy trend"""
+        if frame.empty:
+            return {}
+        
+        def summarize(keys) -> pd.DataFrame:
+            grouped = frame.groupby(keys, observed=True, sort=True)
+            summary = grouped.agg(attempts=("correct", "size"), accuracy=("correct", "mean"),
+                                  median_time=("time", "median"))
+            summary["p90_time"] = grouped["time"].quantile(0.9)
+            return summary
+        
+        by_question = frame.groupby("key", sort=False).agg(
+            id=("id", "last"), attempts=("correct", "size"), accuracy=("correct", "mean"),
+            mean_time=("time", "mean"), last_answered=("answered_at", "max")
+        )
+        
+        daily = frame.groupby(frame["answered_at"].dt.floor("D"))["correct"].agg(["size", "sum"])
+        rolling = daily.rolling(f"{self.ROLLING_DAYS}D").sum()
+        trend = pd.DataFrame({
+            "attempts": daily["size"],
+            "accuracy": daily["sum"] / daily["size"],
+            "rolling_accuracy": rolling["sum"] / rolling["size"]
+        })
+        
+        return {
+            "attempts": len(frame),
+            "accuracy": float(frame["correct"].mean()),
+            "by_topic": summarize("topic"),
+            "by_difficulty": summarize("difficulty"),
+            "by_hour": summarize(frame["answered_at"].dt.hour.rename("hour")),
+            "by_question": by_question,
+            "time_percentiles": dict(zip(self.PERCENTILES,
+                                         np.percentile(frame["time"], self.PERCENTILES).tolist())),
+            "trend": trend
+        }
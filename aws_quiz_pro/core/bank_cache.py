@@ -0,0 +1,341 @@
+"""
+Binary Question Bank Cache
+
+Layout (little endian):
+    header    magic, version, compression, record count, names/records offsets
+    names     JSON lists of topic and difficulty names, referenced by code, and
+              of the extra keys any question has
+    records   fixed-size record per question (numeric fields, content key, payload offset)
+    payloads  per-question strings, optionally compressed per record
+
+Opening a bank only reads the header and the tiny names table; records are
+unpacked when a question is accessed and strings when they are first used.
+A QuestionBank can take over the records in bulk and keep reading strings
+from the mapping, so loading a cached bank never decodes its payloads.
+"""
+
+import json
+import lzma
+import mmap
+import struct
+import zlib
+from collections.abc import MutableMapping, Sequence
+from typing import Dict, List, Optional, Iterable, Tuple
+import numpy as np
+from core.question_identity import content_key
+
+
+MAGIC = b"AQPB"
+FORMAT_VERSION = 3
+
+COMPRESSION_CODES = {"none": 0, "zlib": 1, "lzma": 2}
+
+HEADER = struct.Struct("<4sHHIQIQ")
+RECORD = struct.Struct("<iIIHBBIQIQ")
+RECORD_DTYPE = np.dtype([("id", "<i4"), ("times_answered", "<u4"), ("times_correct", "<u4"),
+                         ("topic_code", "<u2"), ("difficulty_code", "u1"), ("option_count", "u1"),
+                         ("correct_mask", "<u4"), ("offset", "<u8"), ("length", "<u4"), ("key", "<u8")])
+LENGTH = struct.Struct("<I")
+
+# Payload string slots; options follow from OPTIONS_SLOT onwards
+QUESTION_SLOT, EXPLANATION_SLOT, EXTRAS_SLOT, OPTIONS_SLOT = range(4)
+
+BASE_FIELDS = ("id", "question", "options", "correct_answers", "explanation",
+               "topic", "difficulty", "times_answered", "times_correct")
+
+
+def _compress(data: bytes, compression: int) -> bytes:
+    """Compress a payload"""
+    if compression == 1:
+        return zlib.compress(data)
+    if compression == 2:
+        return lzma.compress(data)
+    return data
+
+
+def _decompress(data: bytes, compression: int) -> bytes:
+    """Decompress a payload"""
+    if compression == 1:
+        return zlib.decompress(data)
+    if compression == 2:
+        return lzma.decompress(data)
+    return data
+
+
+def _encode_payload(strings: List[str]) -> bytes:
+    """Encode strings as a count, a length table and the UTF-8 data"""
+    encoded = [s.encode('utf-8') for s in strings]
+    parts = [LENGTH.pack(len(encoded))]
+    parts.extend(LENGTH.pack(len(e)) for e in encoded)
+    parts.extend(encoded)
+    return b"".join(parts)
+
+
+def write_bank(cache_file: str, questions: Iterable[Dict], compression: str = "none") -> None:
+    """Write questions to a binary bank file"""
+    compression_code = COMPRESSION_CODES.get(compression, 0)
+    topics: List[str] = []
+    difficulties: List[str] = []
+    topic_codes: Dict[str, int] = {}
+    difficulty_codes: Dict[str, int] = {}
+    
+    extra_keys = set()
+    
+    records = []
+    payloads = []
+    payload_offset = 0
+    for question in questions:
+        topic = question.get("topic", "General")
+        if topic not in topic_codes:
+            topic_codes[topic] = len(topics)
+            topics.append(topic)
+        difficulty = question.get("difficulty", "Medium")
+        if difficulty not in difficulty_codes:
+            difficulty_codes[difficulty] = len(difficulties)
+            difficulties.append(difficulty)
+        
+        extras = {key: value for key, value in question.items() if key not in BASE_FIELDS}
+        extra_keys.update(extras)
+        strings = [
+            question.get("question", ""),
+            question.get("explanation", ""),
+            json.dumps(extras) if extras else "",
+            *question.get("options", [])
+        ]
+        payload = _compress(_encode_payload(strings), compression_code)
+        
+        correct_mask = 0
+        for index in question.get("correct_answers", []):
+            correct_mask |= 1 << index
+        
+        records.append(RECORD.pack(
+            question.get("id", 0),
+            question.get("times_answered", 0),
+            question.get("times_correct", 0),
+            topic_codes[topic],
+            difficulty_codes[difficulty],
+            len(question.get("options", [])),
+            correct_mask,
+            payload_offset,
+            len(payload),
+            content_key(question)
+        ))
+        payloads.append(payload)
+        payload_offset += len(payload)
+    
+    names = json.dumps({"topics": topics, "difficulties": difficulties,
+                        "extras": sorted(extra_keys)}).encode('utf-8')
+    names_offset = HEADER.size
+    records_offset = names_offset + len(names)
+    
+    with open(cache_file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, compression_code, len(records),
+                            names_offset, len(names), records_offset))
+        f.write(names)
+        f.write(b"".join(records))
+        for payload in payloads:
+            f.write(payload)
+
+
+class MappedBank(Sequence):
+    """Read-only question bank backed by a memory-mapped cache file
+    
+    ``close`` releases the mapping so the file can be replaced or deleted,
+    which Windows refuses while it is mapped. Questions read afterwards
+    map the file again; cache files are named by content, so it holds the
+    same bank if it still exists.
+    """
+    
+    def __init__(self, cache_file: str):
+        self.cache_file = cache_file
+        self._mmap: Optional[mmap.mmap] = None
+        self._count: Optional[int] = None
+        self._open()
+        
+        names = json.loads(self._mmap[self._names_offset:self._names_offset + self._names_length])
+        self.topics = names["topics"]
+        self.difficulties = names["difficulties"]
+        # Keys a question can only have once its strings are decoded
+        self.payload_keys = {"question", "explanation", "options", *names["extras"]}
+        self._payloads_offset = self._records_offset + self._count * RECORD.size
+        self._questions: Dict[int, "MappedQuestion"] = {}
+    
+    def _open(self) -> mmap.mmap:
+        """Map the cache file and check its header"""
+        with open(self.cache_file, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        (magic, version, compression, count,
+         names_offset, names_length, records_offset) = HEADER.unpack_from(mapping, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            mapping.close()
+            raise ValueError(f"Not a question bank cache: {self.cache_file}")
+        if self._count is not None and count != self._count:
+            mapping.close()
+            raise ValueError(f"Question bank cache changed: {self.cache_file}")
+        
+        self.compression = compression
+        self._count = count
+        self._names_offset = names_offset
+        self._names_length = names_length
+        self._records_offset = records_offset
+        self._mmap = mapping
+        return mapping
+    
+    def _get_mapping(self) -> mmap.mmap:
+        """Get the mapping, mapping the file again after close"""
+        return self._mmap if self._mmap is not None else self._open()
+    
+    def close(self) -> None:
+        """Release the memory mapping"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+    
+    @property
+    def closed(self) -> bool:
+        return self._mmap is None
+    
+    def __enter__(self) -> "MappedBank":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("question index out of range")
+        
+        # Memoized so in-memory counter updates stick to the same object
+        question = self._questions.get(index)
+        if question is None:
+            question = MappedQuestion(self, index)
+            self._questions[index] = question
+        return question
+    
+    def copy(self) -> List["MappedQuestion"]:
+        """Get questions as a list, mirroring list.copy()"""
+        return list(self)
+    
+    @property
+    def untouched(self) -> bool:
+        """True until a question has been accessed, and possibly changed, through the bank"""
+        return not self._questions
+    
+    def read_record(self, index: int) -> tuple:
+        """Unpack the fixed-size record of a question"""
+        return RECORD.unpack_from(self._get_mapping(), self._records_offset + index * RECORD.size)
+    
+    def read_records(self) -> np.ndarray:
+        """Get a copy of every fixed-size record as a structured array"""
+        records = np.frombuffer(self._get_mapping(), dtype=RECORD_DTYPE, count=self._count,
+                                offset=self._records_offset)
+        # The copy drops the view, which would otherwise keep the mapping from closing
+        return records.copy()
+    
+    def read_strings(self, offset: int, length: int) -> List[str]:
+        """Decode the payload strings of a question"""
+        start = self._payloads_offset + offset
+        payload = _decompress(self._get_mapping()[start:start + length], self.compression)
+        
+        (count,) = LENGTH.unpack_from(payload, 0)
+        lengths = struct.unpack_from(f"<{count}I", payload, LENGTH.size)
+        position = LENGTH.size * (count + 1)
+        strings = []
+        for size in lengths:
+            strings.append(payload[position:position + size].decode('utf-8'))
+            position += size
+        return strings
+
+
+class MappedQuestion(MutableMapping):
+    """Question dict view decoded lazily from a MappedBank
+    
+    Numeric fields come from the fixed record; question text, options,
+    explanation and extra keys are decoded on first access. Looking up or
+    assigning a key the bank's questions never store in their payload
+    does not decode. Assigned values are kept in memory and never written
+    back to the cache file.
+    """
+    
+    __slots__ = ("_bank", "_fields", "_payload", "_key", "_strings")
+    
+    def __init__(self, bank: MappedBank, index: int):
+        (question_id, times_answered, times_correct, topic_code, difficulty_code,
+         option_count, correct_mask, offset, length, key) = bank.read_record(index)
+        
+        self._bank = bank
+        self._payload = (offset, length)
+        self._key = key
+        self._strings: Optional[List[str]] = None
+        self._fields = {
+            "id": question_id,
+            "correct_answers": [i for i in range(option_count) if correct_mask >> i & 1],
+            "topic": bank.topics[topic_code],
+            "difficulty": bank.difficulties[difficulty_code],
+            "times_answered": times_answered,
+            "times_correct": times_correct
+        }
+    
+    def get_undecoded(self) -> Optional[Tuple[Dict, MappedBank, int, int, int]]:
+        """Get (fields in memory, bank, payload offset, payload length, content key)
+        while the strings are undecoded, else None
+        
+        The fields hold the record's numeric fields and any assigned since.
+        """
+        if self._strings is not None:
+            return None
+        return self._fields, self._bank, self._payload[0], self._payload[1], self._key
+    
+    def _load_strings(self) -> None:
+        """Decode payload strings into fields"""
+        strings = self._bank.read_strings(*self._payload)
+        self._strings = strings
+        self._fields.setdefault("question", strings[QUESTION_SLOT])
+        self._fields.setdefault("explanation", strings[EXPLANATION_SLOT])
+        self._fields.setdefault("options", strings[OPTIONS_SLOT:])
+        extras = json.loads(strings[EXTRAS_SLOT]) if strings[EXTRAS_SLOT] else {}
+        for key, value in extras.items():
+            self._fields.setdefault(key, value)
+    
+    def __getitem__(self, key):
+        if key not in self._fields and self._strings is None and key in self._bank.payload_keys:
+            self._load_strings()
+        return self._fields[key]
+    
+    def __contains__(self, key) -> bool:
+        if key in self._fields:
+            return True
+        if self._strings is None and key in self._bank.payload_keys:
+            self._load_strings()
+            return key in self._fields
+        return False
+    
+    def __setitem__(self, key, value):
+        # Decoding keeps assigned values, so there is no need to decode first
+        self._fields[key] = value
+    
+    def __delitem__(self, key):
+        if self._strings is None:
+            self._load_strings()
+        del self._fields[key]
+    
+    def __iter__(self):
+        if self._strings is None:
+            self._load_strings()
+        return iter(self._fields)
+    
+    def __len__(self) -> int:
+        if self._strings is None:
+            self._load_strings()
+        return len(self._fields)
+    
+    def __repr__(self) -> str:
+        return f"MappedQuestion({dict(self)!r})"
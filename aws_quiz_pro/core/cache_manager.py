@@ -0,0 +1,148 @@
+"""
+Cache Directory Management
+"""
+
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def atomic_write(filename: str, write_func: Callable[[str], None]) -> None:
+    """Write a file through a temporary sibling and rename it into place
+    
+    Readers in other processes see either the old file or the complete new
+    one, never a partially written file.
+    """
+    temp_filename = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write_func(temp_filename)
+        with open(temp_filename, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(temp_filename, filename)
+    finally:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+
+
+class CacheManager:
+    """Cache directory with least-recently-used eviction over a byte budget
+    
+    Last access is tracked through each file's modification time, which is
+    refreshed on every hit. That keeps the bookkeeping consistent across
+    several app instances sharing one cache directory.
+    """
+    
+    def __init__(self, cache_dir: str = ".", prefix: str = "quiz_cache_",
+                 max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or "."
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.pinned = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def path(self, name: str) -> str:
+        """Get full path of a cache entry"""
+        return os.path.join(self.cache_dir, f"{self.prefix}{name}")
+    
+    def pin(self, name: str) -> str:
+        """Exclude a small bookkeeping entry from eviction; returns its path"""
+        self.pinned.add(self.path(name))
+        return self.path(name)
+    
+    def lookup(self, name: str) -> Optional[str]:
+        """Get path of an existing entry and mark it as recently used"""
+        cache_file = self.path(name)
+        try:
+            os.utime(cache_file, None)
+        except OSError:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return cache_file
+    
+    def write(self, name: str, write_func: Callable[[str], None]) -> bool:
+        """Atomically write an entry, then evict old entries over budget"""
+        cache_file = self.path(name)
+        try:
+            atomic_write(cache_file, write_func)
+        except Exception as e:
+            print(f"Error writing cache entry {name}: {e}")
+            return False
+        
+        self.evict(keep=cache_file)
+        return True
+    
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Delete least recently used entries until the cache fits its budget
+        
+        A budget of None means unbounded.
+        """
+        if self.max_bytes is None:
+            return 0
+        
+        entries = self._get_entries()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        
+        for cache_file, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            if cache_file == keep:
+                continue
+            try:
+                os.remove(cache_file)
+                total -= size
+                evicted += 1
+            except OSError as e:
+                # Still mapped by another process on some platforms
+                print(f"Error evicting cache entry {cache_file}: {e}")
+        
+        self.evictions += evicted
+        return evicted
+    
+    def clear(self) -> int:
+        """Delete all evictable entries"""
+        count = 0
+        for cache_file, _, _ in self._get_entries():
+            try:
+                os.remove(cache_file)
+                count += 1
+            except OSError as e:
+                print(f"Error deleting cache entry {cache_file}: {e}")
+        return count
+    
+    def get_stats(self) -> Dict:
+        """Get cache usage and hit/miss/eviction counters"""
+        entries = self._get_entries()
+        return {
+            "files": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+    
+    def _get_entries(self) -> List[Tuple[str, int, int]]:
+        """Get (path, size, last access) of evictable entries"""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as scanner:
+                for entry in scanner:
+                    if not entry.name.startswith(self.prefix) or entry.name.endswith('.tmp'):
+                        continue
+                    if entry.path in self.pinned or not entry.is_file():
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        except OSError as e:
+            print(f"Error scanning cache directory: {e}")
+        return entries
@@ -0,0 +1,29 @@
+"""
+Cooperative Cancellation
+"""
+
+import threading
+
+
+class LoadCancelled(Exception):
+    """Raised inside a load when its cancellation token is set"""
+
+
+class CancellationToken:
+    """Flag shared between the UI thread and a loader thread"""
+    
+    def __init__(self):
+        self._event = threading.Event()
+    
+    def cancel(self) -> None:
+        """Request cancellation"""
+        self._event.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+    
+    def check(self) -> None:
+        """Raise LoadCancelled if cancellation was requested"""
+        if self._event.is_set():
+            raise LoadCancelled()
@@ -0,0 +1,192 @@
+"""
+Near-Duplicate Question Detection
+"""
+
+import hashlib
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from core.question_identity import normalize_words
+
+
+EMPTY_BIN = np.iinfo(np.uint32).max
+DENSIFY_STEP = 0x9E3779B1
+DENSIFY_CHUNK = 8192
+
+
+class QuestionDeduplicator:
+    """Finds near-duplicate questions with MinHash signatures and LSH banding
+    
+    Each question's normalized stem and options are split into overlapping
+    word shingles and summarized by a MinHash signature. Signatures are cut
+    into bands, and questions sharing a band are compared with the first
+    question in that band bucket, so the work grows linearly with the bank
+    instead of with the number of pairs. Matches above the similarity
+    threshold are grouped with union-find.
+    """
+    
+    def __init__(self, threshold: float = 0.85, num_hashes: int = 128, bands: int = 16,
+                 shingle_size: int = 3, seed: int = 1):
+        if num_hashes % bands:
+            raise ValueError("num_hashes must be a multiple of bands")
+        self.threshold = threshold
+        self.num_hashes = num_hashes
+        self.bands = bands
+        self.shingle_size = shingle_size
+        
+        # Odd multipliers combining the word hashes of a shingle
+        rng = np.random.default_rng(seed)
+        self._mixers = rng.integers(1, 2 ** 63, shingle_size, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    
+    def normalize(self, question: Dict) -> List[str]:
+        """Get the words of a question's stem and options, option order ignored"""
+        return normalize_words(question)
+    
+    def signatures(self, questions: Sequence[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Get MinHash signatures of shape (questions, num_hashes) and a has-text mask
+        
+        Uses one-permutation hashing: each shingle is hashed once and lands
+        in one of num_hashes bins, keeping the minimum per bin. Empty bins
+        borrow from the next filled bin. This costs one pass over the
+        shingles instead of one pass per hash function. Words are hashed
+        with blake2b, so signatures are the same in every process.
+        """
+        documents = [self.normalize(question) for question in questions]
+        lengths = np.fromiter(map(len, documents), dtype=np.int64, count=len(documents))
+        has_text = lengths > 0
+        signatures = np.full((len(questions), self.num_hashes), EMPTY_BIN, dtype=np.uint32)
+        if not has_text.any():
+            return signatures, has_text
+        
+        # Hash every distinct word once, then pad each document so every word starts a shingle
+        padding = ["\0"] * (self.shingle_size - 1)
+        vocabulary: Dict[str, int] = {}
+        word_numbers = np.fromiter(
+            (vocabulary.setdefault(word, len(vocabulary))
+             for document in documents if document for word in document + padding),
+            dtype=np.int64
+        )
+        word_hashes = np.fromiter((self._hash_word(word) for word in vocabulary),
+                                  dtype=np.uint64, count=len(vocabulary))[word_numbers]
+        
+        shingle_count = len(word_hashes) - self.shingle_size + 1
+        shingles = np.zeros(shingle_count, dtype=np.uint64)
+        for offset, mixer in enumerate(self._mixers):
+            shingles += word_hashes[offset:offset + shingle_count] * mixer
+        
+        # Keep the shingles starting on a real word; padding-only starts are skipped
+        text_lengths = lengths[has_text]
+        document_numbers = np.repeat(np.arange(len(text_lengths)), text_lengths)
+        positions = np.arange(len(document_numbers)) + (self.shingle_size - 1) * document_numbers
+        hashed = self._mix(shingles[positions])
+        
+        text_rows = np.flatnonzero(has_text)
+        bins = text_rows[document_numbers] * self.num_hashes + (hashed % np.uint64(self.num_hashes)).astype(np.int64)
+        np.minimum.at(signatures.reshape(-1), bins, (hashed >> np.uint64(32)).astype(np.uint32))
+        
+        for start in range(0, len(text_rows), DENSIFY_CHUNK):
+            chunk_rows = text_rows[start:start + DENSIFY_CHUNK]
+            signatures[chunk_rows] = self._densify(signatures[chunk_rows])
+        return signatures, has_text
+    
+    def _hash_word(self, word: str) -> int:
+        """Get a stable 64-bit word hash; the builtin hash() is salted per process"""
+        return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+    
+    def _mix(self, values: np.ndarray) -> np.ndarray:
+        """Scramble 64-bit hashes so that all output bits are usable"""
+        values = values ^ (values >> np.uint64(33))
+        values *= np.uint64(0xFF51AFD7ED558CCD)
+        values ^= values >> np.uint64(33)
+        values *= np.uint64(0xC4CEB9FE1A85EC53)
+        values ^= values >> np.uint64(33)
+        return values
+    
+    def _densify(self, signatures: np.ndarray) -> np.ndarray:
+        """Fill empty bins from the next filled bin to the right, wrapping around"""
+        empty = signatures == EMPTY_BIN
+        if not empty.any():
+            return signatures
+        
+        width = self.num_hashes
+        doubled = np.concatenate([signatures, signatures], axis=1)
+        columns = np.where(np.concatenate([~empty, ~empty], axis=1),
+                           np.arange(2 * width), 2 * width - 1)
+        next_filled = np.minimum.accumulate(columns[:, ::-1], axis=1)[:, ::-1][:, :width]
+        # Offset by the distance so borrowed values differ from the source bin
+        distance = (next_filled - np.arange(width)).astype(np.uint32)
+        borrowed = np.take_along_axis(doubled, next_filled, axis=1) + distance * np.uint32(DENSIFY_STEP)
+        return np.where(empty, borrowed, signatures)
+    
+    def find_clusters(self, questions: Sequence[Dict]) -> List[List[int]]:
+        """Get groups of near-duplicate question indexes, each sorted ascending"""
+        signatures, has_text = self.signatures(questions)
+        rows = np.flatnonzero(has_text)
+        parents = list(range(len(questions)))
+        
+        def find(index):
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+        
+        band_width = self.num_hashes // self.bands
+        pairs = set()
+        for band in range(self.bands):
+            band_values = np.ascontiguousarray(
+                signatures[rows, band * band_width:(band + 1) * band_width]
+            )
+            keys = band_values.view(np.dtype((np.void, band_values.dtype.itemsize * band_width)))
+            _, first, inverse = np.unique(keys.ravel(), return_index=True, return_inverse=True)
+            representatives = rows[first[inverse.ravel()]]
+            candidates = np.flatnonzero(representatives != rows)
+            if not len(candidates):
+                continue
+            
+            members = rows[candidates]
+            leaders = representatives[candidates]
+            similarity = (signatures[members] == signatures[leaders]).mean(axis=1)
+            matched = similarity >= self.threshold
+            pairs.update(zip(members[matched].tolist(), leaders[matched].tolist()))
+        
+        for member, leader in pairs:
+            root_member, root_leader = find(member), find(leader)
+            if root_member != root_leader:
+                parents[max(root_member, root_leader)] = min(root_member, root_leader)
+        
+        clusters: Dict[int, List[int]] = {}
+        for index in {index for pair in pairs for index in pair}:
+            clusters.setdefault(find(index), []).append(index)
+        return sorted(sorted(cluster) for cluster in clusters.values())
+    
+    def deduplicate(self, questions: Sequence[Dict], merge: bool = True) -> Tuple[List[Dict], List[Dict]]:
+        """Merge or flag near-duplicates; returns the questions and a cluster report
+        
+        The first question of each cluster is kept. Merging drops the others
+        and adds their answer counters to the kept question; flagging keeps
+        them all and marks the others with ``duplicate_of``.
+        """
+        clusters = self.find_clusters(questions)
+        removed = set()
+        report = []
+        for cluster in clusters:
+            kept = questions[cluster[0]]
+            duplicates = [questions[index] for index in cluster[1:]]
+            report.append({
+                "kept_id": kept.get("id"),
+                "duplicate_ids": [question.get("id") for question in duplicates],
+                "question": kept.get("question", "")[:100]
+            })
+            
+            if merge:
+                kept["times_answered"] = kept.get("times_answered", 0) + sum(
+                    question.get("times_answered", 0) for question in duplicates)
+                kept["times_correct"] = kept.get("times_correct", 0) + sum(
+                    question.get("times_correct", 0) for question in duplicates)
+                kept["duplicate_ids"] = report[-1]["duplicate_ids"]
+                removed.update(cluster[1:])
+            else:
+                for question in duplicates:
+                    question["duplicate_of"] = kept.get("id")
+        
+        result = [question for index, question in enumerate(questions) if index not in removed]
+        return result, report
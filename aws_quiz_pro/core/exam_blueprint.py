@@ -0,0 +1,129 @@
+"""
+Exam Blueprints - Topic-Stratified Exam Generation
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from core.question_bank import QuestionBank
+
+
+class ExamBlueprint:
+    """Target share of exam questions per topic, like an official exam guide
+    
+    The blueprint file is JSON of the form
+    ``{"name": "SAA-C03", "topics": {"Security": 30, "Compute": 26, ...}}``;
+    percentages are normalized, so they need not add up to 100. Without a
+    file, exams follow the bank's own topic mix.
+    
+    Each topic's count is apportioned by largest remainder. A topic with
+    too few questions gives its shortfall to the other blueprint topics in
+    proportion to their targets, and only when those run out too are
+    topics outside the blueprint used. Exams are drawn stratum by stratum
+    from the bank's per-topic pools, for a whole batch of exams at once.
+    """
+    
+    def __init__(self, blueprint_file: Optional[str] = None):
+        self.blueprint_file = blueprint_file
+        self.name = ""
+        self.topics: Dict[str, float] = {}
+        if blueprint_file:
+            self.load()
+    
+    def load(self) -> bool:
+        """Load topic targets from the blueprint file"""
+        try:
+            if os.path.exists(self.blueprint_file):
+                with open(self.blueprint_file, 'r') as f:
+                    data = json.load(f)
+                self.name = data.get("name", os.path.basename(self.blueprint_file))
+                self.topics = {topic: float(percent) for topic, percent in data["topics"].items()
+                               if float(percent) > 0}
+                return True
+        except Exception as e:
+            print(f"Error loading exam blueprint: {e}")
+        return False
+    
+    def allocate(self, bank: QuestionBank, count: int) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Get topic names with their target and achievable question counts
+        
+        Names start with the bank's topics in code order, followed by
+        blueprint topics the bank has no questions for.
+        """
+        names = bank.topics + [topic for topic in self.topics if topic not in set(bank.topics)]
+        capacity = np.array([len(pool) for pool in bank.get_topic_pools()]
+                            + [0] * (len(names) - len(bank.topics)), dtype=np.int64)
+        weights = np.array([self.topics.get(name, 0.0) for name in names])
+        if not weights.any():
+            weights = capacity.astype(np.float64)
+        
+        targets = self._apportion(weights, count)
+        counts = np.minimum(targets, capacity)
+        remaining = count - int(counts.sum())
+        while remaining > 0:
+            spare = capacity - counts
+            active = np.where(spare > 0, weights, 0.0)
+            if not active.any():
+                # Blueprint topics are exhausted; fill from the rest by pool size
+                active = np.where(spare > 0, capacity, 0).astype(np.float64)
+                if not active.any():
+                    break
+            extra = np.minimum(self._apportion(active, remaining), spare)
+            counts += extra
+            remaining -= int(extra.sum())
+        return names, targets, counts
+    
+    def _apportion(self, weights: np.ndarray, total: int) -> np.ndarray:
+        """Split total into integer parts proportional to weights by largest remainder"""
+        shares = weights / weights.sum() * total
+        parts = np.floor(shares).astype(np.int64)
+        leftover = total - int(parts.sum())
+        parts[np.argsort(parts - shares, kind='stable')[:leftover]] += 1
+        return parts
+    
+    def sample_exams(self, bank: QuestionBank, count: int, num_exams: int = 1,
+                     rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, Dict[str, Dict]]:
+        """Get bank indexes of num_exams exams, one row each, and the achieved distribution
+        
+        Every exam has the same per-topic counts; questions are distinct
+        within an exam and shuffled.
+        """
+        rng = rng or np.random.default_rng()
+        names, targets, counts = self.allocate(bank, count)
+        pools = bank.get_topic_pools()
+        
+        strata = [pools[code][self._draw(rng, len(pools[code]), int(counts[code]), num_exams)]
+                  for code in range(len(pools)) if counts[code]]
+        exams = np.concatenate(strata, axis=1) if strata else np.empty((num_exams, 0), dtype=np.int64)
+        order = np.argsort(rng.random(exams.shape), axis=1)
+        exams = np.take_along_axis(exams, order, axis=1)
+        
+        total = max(int(counts.sum()), 1)
+        weight_total = sum(self.topics.values())
+        distribution = {
+            name: {
+                "target_percent": self.topics.get(name, 0.0) / weight_total * 100 if weight_total else None,
+                "target": int(target),
+                "count": int(achieved),
+                "percent": float(achieved / total * 100)
+            }
+            for name, target, achieved in zip(names, targets, counts) if target or achieved
+        }
+        return exams, distribution
+    
+    def _draw(self, rng: np.random.Generator, pool_size: int, k: int, num_exams: int) -> np.ndarray:
+        """Get num_exams rows of k distinct positions in a pool"""
+        if k * k <= pool_size:
+            # Duplicates are rare here, so redraw the few rows that have one
+            draws = rng.integers(0, pool_size, (num_exams, k))
+            while k > 1:
+                ordered = np.sort(draws, axis=1)
+                repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+                if not repeated.any():
+                    break
+                draws[repeated] = rng.integers(0, pool_size, (int(repeated.sum()), k))
+            return draws
+        # Small pools: keep the k smallest of one random key per question
+        keys = rng.random((num_exams, pool_size))
+        return np.argpartition(keys, k - 1, axis=1)[:, :k]
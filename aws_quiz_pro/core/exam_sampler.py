@@ -0,0 +1,72 @@
+"""
+Weakness-Weighted Exam Sampling
+"""
+
+import time
+from array import array
+from typing import List, Optional
+import numpy as np
+from core.question_bank import QuestionBank
+
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+class WeightedExamSampler:
+    """Draws exam questions without replacement, favoring weak spots
+    
+    A question's weight multiplies its smoothed error rate, the time since
+    it was last answered and its topic's smoothed error rate, each raised
+    to a configurable exponent (0 turns a factor off). Unseen questions
+    count as half wrong and long unseen. The draw uses Gumbel-top-k: add
+    Gumbel noise to the log weights and keep the k largest, which is a
+    weighted sample without replacement in one vectorized pass.
+    """
+    
+    # Days since last answer at which the recency factor stops growing
+    RECENCY_CAP_DAYS = 30
+    
+    def __init__(self, error_exponent: float = 1.0, recency_exponent: float = 0.5,
+                 topic_exponent: float = 1.0, seed: Optional[int] = None):
+        self.error_exponent = error_exponent
+        self.recency_exponent = recency_exponent
+        self.topic_exponent = topic_exponent
+        self.rng = np.random.default_rng(seed)
+    
+    def get_weights(self, bank: QuestionBank, last_answered: Optional[array] = None,
+                    now: Optional[float] = None) -> np.ndarray:
+        """Get a positive sampling weight per question
+        
+        ``last_answered`` holds a timestamp per question, 0 if never answered.
+        """
+        answered = np.frombuffer(bank.times_answered, dtype=np.int64).astype(np.float64)
+        wrong = answered - np.frombuffer(bank.times_correct, dtype=np.int64)
+        weights = ((wrong + 1) / (answered + 2)) ** self.error_exponent
+        
+        if self.topic_exponent:
+            topics = np.frombuffer(bank.topic_codes, dtype=np.uint16)
+            topic_wrong = np.bincount(topics, weights=wrong, minlength=len(bank.topics))
+            topic_answered = np.bincount(topics, weights=answered, minlength=len(bank.topics))
+            topic_error = (topic_wrong + 1) / (topic_answered + 2)
+            weights *= topic_error[topics] ** self.topic_exponent
+        
+        if self.recency_exponent and last_answered is not None and len(last_answered) == len(bank):
+            now = time.time() if now is None else now
+            seen = np.frombuffer(last_answered, dtype=np.float64)
+            days = np.where(seen > 0, (now - seen) / DAY_SECONDS, self.RECENCY_CAP_DAYS)
+            days = np.clip(days, 0, self.RECENCY_CAP_DAYS)
+            weights *= ((days + 1) / (self.RECENCY_CAP_DAYS + 1)) ** self.recency_exponent
+        
+        return weights
+    
+    def sample(self, bank: QuestionBank, count: int, last_answered: Optional[array] = None,
+               now: Optional[float] = None) -> List[int]:
+        """Get indexes of count distinct questions, heaviest draws first"""
+        count = min(count, len(bank))
+        if count <= 0:
+            return []
+        
+        keys = np.log(self.get_weights(bank, last_answered, now))
+        keys += self.rng.gumbel(size=len(keys))
+        top = np.argpartition(-keys, count - 1)[:count]
+        return top[np.argsort(-keys[top])].tolist()
@@ -0,0 +1,102 @@
+"""
+File Fingerprinting
+"""
+
+import json
+import os
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+from core.cache_manager import atomic_write
+from core.cancellation import CancellationToken
+
+
+class FileFingerprinter:
+    """Content hashes for files, recomputed only when the file's stat changes
+    
+    A sidecar index maps each path to its (size, mtime_ns, inode) and the hash
+    computed for that state, so a warm lookup costs one os.stat() and never
+    reads the file itself. With ``autosave`` off, new hashes stay in memory
+    until the owner merges them into the index, so worker processes sharing
+    one index file do not overwrite each other's entries.
+    """
+    
+    READ_BUFFER_SIZE = 1024 * 1024
+    DIGEST_SIZE = 32
+    
+    def __init__(self, index_file: str, autosave: bool = True):
+        self.index_file = index_file
+        self.autosave = autosave
+        self.index = self._load_index()
+        self.memo: Dict[Tuple, str] = {}
+        # Files may be hashed from several loader threads at once
+        self._lock = threading.Lock()
+    
+    def get_hash(self, filename: str, cancel_token: Optional[CancellationToken] = None) -> str:
+        """Get content hash of a file, checking the token between reads while hashing"""
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        state = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        
+        memo_key = (path, *state)
+        if memo_key in self.memo:
+            return self.memo[memo_key]
+        
+        entry = self.index.get(path)
+        if entry and entry.get('stat') == state:
+            file_hash = entry['hash']
+        else:
+            file_hash = self._hash_file(path, cancel_token)
+            with self._lock:
+                self.index[path] = {'stat': state, 'hash': file_hash}
+                if self.autosave:
+                    self._save_index()
+        
+        self.memo[memo_key] = file_hash
+        return file_hash
+    
+    def get_entry(self, filename: str) -> Optional[Dict]:
+        """Get the indexed stat and hash of a file, if hashed"""
+        return self.index.get(os.path.abspath(filename))
+    
+    def merge(self, entries: Dict[str, Dict]) -> None:
+        """Add entries hashed elsewhere, keyed by absolute path, and save the index once"""
+        with self._lock:
+            self.index.update(entries)
+            self._save_index()
+    
+    def _hash_file(self, path: str, cancel_token: Optional[CancellationToken] = None) -> str:
+        """Hash full file contents"""
+        digest = hashlib.blake2b(digest_size=self.DIGEST_SIZE)
+        buffer = bytearray(self.READ_BUFFER_SIZE)
+        view = memoryview(buffer)
+        with open(path, 'rb', buffering=0) as f:
+            while True:
+                if cancel_token:
+                    cancel_token.check()
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                digest.update(view[:size])
+        return digest.hexdigest()
+    
+    def _load_index(self) -> Dict:
+        """Load fingerprint index"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error loading fingerprint index: {e}")
+        return {}
+    
+    def _save_index(self) -> None:
+        """Save fingerprint index"""
+        def write(index_file):
+            with open(index_file, 'w') as f:
+                json.dump(self.index, f)
+        
+        try:
+            atomic_write(self.index_file, write)
+        except Exception as e:
+            print(f"Error saving fingerprint index: {e}")
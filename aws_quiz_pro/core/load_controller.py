@@ -0,0 +1,233 @@
+"""
+Background PDF Load Control
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, Optional, Sequence, Tuple, Union
+from config.constants import (STREAM_FIRST_BATCH, LOAD_PROGRESS_INTERVAL,
+                              MAX_LOAD_WORKERS, SOURCE_ID_STRIDE)
+from core.cancellation import CancellationToken, LoadCancelled
+
+
+class LoadController:
+    """Runs one load of one or more PDFs at a time on background threads
+    
+    Starting a load cancels the previous one. Callbacks are marshalled to the
+    UI thread through ``dispatch`` and dropped there if their load has been
+    superseded in the meantime, so a stale load can never overwrite the
+    questions of a newer one.
+    
+    When several PDFs are loaded, cached banks are read first and the rest
+    are parsed concurrently, so a cache hit never waits on a cold parse.
+    The banks are merged in the order given; each question gets a globally
+    unique ``id`` of ``source index * SOURCE_ID_STRIDE + source_id`` and
+    keeps its provenance in ``source`` and ``source_id``.
+    """
+    
+    def __init__(self, pdf_parser, dispatch: Callable[[Callable[[], None]], None],
+                 first_batch_size: int = STREAM_FIRST_BATCH,
+                 postprocess: Optional[Callable[[List[Dict]], List[Dict]]] = None,
+                 max_workers: int = MAX_LOAD_WORKERS):
+        self.pdf_parser = pdf_parser
+        self.dispatch = dispatch
+        self.first_batch_size = first_batch_size
+        # Runs on the loader thread over the complete question list
+        self.postprocess = postprocess
+        self.max_workers = max_workers
+        self._generation = 0
+        self._token: Optional[CancellationToken] = None
+    
+    @property
+    def loading(self) -> bool:
+        return self._token is not None
+    
+    def start(self, pdf_filenames: Union[str, Sequence[str]],
+              on_complete: Callable[[List[Dict]], None],
+              on_first_batch: Optional[Callable[[List[Dict]], None]] = None,
+              on_progress: Optional[Callable[[int, int], None]] = None) -> None:
+        """Start loading one PDF or several, superseding any load in progress
+        
+        ``on_progress`` receives (pages done, total pages) while pages are
+        parsed, ``on_first_batch`` the first questions once enough have been
+        loaded to start a quiz, and ``on_complete`` the full list, which is
+        empty if parsing failed.
+        """
+        if isinstance(pdf_filenames, str):
+            pdf_filenames = [pdf_filenames]
+        
+        self.cancel()
+        self._generation += 1
+        self._token = CancellationToken()
+        
+        threading.Thread(
+            target=self._load,
+            args=(self._generation, self._token, list(pdf_filenames),
+                  on_complete, on_first_batch, on_progress),
+            daemon=True
+        ).start()
+    
+    def cancel(self) -> None:
+        """Cancel the load in progress, if any"""
+        if self._token:
+            self._token.cancel()
+            self._token = None
+    
+    def _deliver(self, generation: int, callback: Callable, *args) -> None:
+        """Run a callback on the UI thread unless its load was superseded"""
+        def deliver():
+            if generation == self._generation:
+                callback(*args)
+        self.dispatch(deliver)
+    
+    def _load(self, generation: int, token: CancellationToken, pdf_filenames: List[str],
+              on_complete: Callable, on_first_batch: Optional[Callable],
+              on_progress: Optional[Callable]) -> None:
+        """Load and merge PDFs; runs on the loader thread"""
+        merge = len(pdf_filenames) > 1
+        banks: List[Optional[List[Dict]]] = [None] * len(pdf_filenames)
+        lock = threading.Lock()
+        first_batch_sent = False
+        
+        def send_first_batch(questions):
+            nonlocal first_batch_sent
+            with lock:
+                if first_batch_sent or not on_first_batch:
+                    return
+                first_batch_sent = True
+            self._deliver(generation, on_first_batch, list(questions))
+        
+        # Page counts of the PDFs being parsed, summed for one progress bar
+        page_progress: Dict[int, Tuple[int, int]] = {}
+        last_progress = 0.0
+        
+        def report_progress(source_index, done, total):
+            nonlocal last_progress
+            if not on_progress:
+                return
+            with lock:
+                page_progress[source_index] = (done, total)
+                done = sum(pages[0] for pages in page_progress.values())
+                total = sum(pages[1] for pages in page_progress.values())
+                now = time.monotonic()
+                if done != total and now - last_progress < LOAD_PROGRESS_INTERVAL:
+                    return
+                last_progress = now
+            self._deliver(generation, on_progress, done, total)
+        
+        cold = []
+        for source_index, pdf_filename in enumerate(pdf_filenames):
+            try:
+                questions = self.pdf_parser.get_cached_questions(pdf_filename, token)
+            except LoadCancelled:
+                return
+            if questions:
+                banks[source_index] = self._tag_source(questions, source_index, pdf_filename, merge)
+            else:
+                cold.append(source_index)
+        
+        if cold:
+            cached = [question for bank in banks if bank for question in bank]
+            if cached:
+                send_first_batch(cached)
+            
+            def parse(source_index):
+                return self._parse(
+                    pdf_filenames[source_index], token,
+                    lambda done, total: report_progress(source_index, done, total),
+                    lambda questions: send_first_batch(
+                        self._tag_source(questions, source_index, pdf_filenames[source_index], merge)
+                    )
+                )
+            
+            executor = ThreadPoolExecutor(max_workers=min(len(cold), self.max_workers))
+            try:
+                futures = {executor.submit(parse, source_index): source_index
+                           for source_index in cold}
+                for future in as_completed(futures):
+                    source_index = futures[future]
+                    try:
+                        questions = future.result()
+                    except LoadCancelled:
+                        return
+                    except Exception as e:
+                        print(f"Error parsing PDF {pdf_filenames[source_index]}: {e}")
+                        continue
+                    banks[source_index] = self._tag_source(
+                        questions, source_index, pdf_filenames[source_index], merge
+                    )
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+        
+        if token.cancelled:
+            return
+        if merge:
+            questions = [question for bank in banks if bank for question in bank]
+        else:
+            # A cached bank is handed over as is, so its records can be taken in bulk
+            questions = banks[0] or []
+        self._finish(generation, on_complete, self._postprocess(questions))
+    
+    def _parse(self, pdf_filename: str, token: CancellationToken,
+               progress: Callable[[int, int], None],
+               on_first_batch: Callable[[List[Dict]], None]) -> List[Dict]:
+        """Parse and cache one PDF; runs on a worker thread"""
+        questions = []
+        for question in self.pdf_parser.iter_questions(pdf_filename, token, progress):
+            questions.append(question)
+            if len(questions) == self.first_batch_size:
+                on_first_batch(questions)
+        
+        token.check()
+        if questions:
+            # Streamed questions may already carry merged bank ids
+            self.pdf_parser.save_questions(pdf_filename, [self._strip_source(question)
+                                                          for question in questions])
+        return questions
+    
+    def _tag_source(self, questions: Sequence[Dict], source_index: int,
+                    pdf_filename: str, merge: bool) -> Sequence[Dict]:
+        """Give questions of a merged bank unique ids and record their source
+        
+        Tagging happens after caching and is idempotent, so the cache holds
+        the ids as printed in the PDF.
+        """
+        if not merge:
+            return questions
+        source = os.path.basename(pdf_filename)
+        for question in questions:
+            # Cached questions answer this from their record, without decoding
+            if "source_id" not in question:
+                question["source"] = source
+                question["source_id"] = question.get("id", 0)
+                question["id"] = source_index * SOURCE_ID_STRIDE + question["source_id"]
+        return questions
+    
+    def _strip_source(self, question: Dict) -> Dict:
+        """Get a question as printed in its PDF, without merged bank tags"""
+        if "source_id" not in question:
+            return question
+        untagged = {key: value for key, value in question.items()
+                    if key not in ("source", "source_id")}
+        untagged["id"] = question["source_id"]
+        return untagged
+    
+    def _postprocess(self, questions: List[Dict]) -> List[Dict]:
+        """Apply the postprocess hook, keeping the questions if it fails"""
+        if not self.postprocess or not questions:
+            return questions
+        try:
+            return self.postprocess(questions)
+        except Exception as e:
+            print(f"Error postprocessing questions: {e}")
+            return questions
+    
+    def _finish(self, generation: int, on_complete: Callable, questions: List[Dict]) -> None:
+        """Deliver the result of a load and mark it as no longer running"""
+        def finish():
+            if generation == self._generation:
+                self._token = None
+                on_complete(questions)
+        self.dispatch(finish)
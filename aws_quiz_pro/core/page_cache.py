@@ -0,0 +1,176 @@
+"""
+Per-Page Text Cache
+"""
+
+import os
+import struct
+import hashlib
+from typing import Dict, Optional, Set, Tuple
+from core.cache_manager import CacheManager
+
+
+class PageStore:
+    """Append-only page texts of one PDF, read and written one page at a time
+    
+    The file is a magic number followed by records of a 16-byte page
+    fingerprint, the text length and the UTF-8 text. Opening the store reads
+    only the record headers; a torn last record is ignored and overwritten.
+    """
+    
+    MAGIC = b"QPGS\x01"
+    HEADER = struct.Struct("<16sI")
+    
+    def __init__(self, cache_file: str):
+        self.cache_file = cache_file
+        self.offsets: Dict[bytes, Tuple[int, int]] = {}
+        self.size = 0
+        self.appended = 0
+        self._reader = None
+        self._writer = None
+        self._scan()
+    
+    def _scan(self) -> None:
+        """Index record headers up to the first incomplete record"""
+        try:
+            f = open(self.cache_file, 'rb')
+        except OSError:
+            return
+        with f:
+            if f.read(len(self.MAGIC)) != self.MAGIC:
+                return
+            end = os.fstat(f.fileno()).st_size
+            position = len(self.MAGIC)
+            while position + self.HEADER.size <= end:
+                f.seek(position)
+                fingerprint, length = self.HEADER.unpack(f.read(self.HEADER.size))
+                if position + self.HEADER.size + length > end:
+                    break
+                self.offsets[fingerprint] = (position, length)
+                position += self.HEADER.size + length
+            self.size = position
+    
+    def __contains__(self, fingerprint: str) -> bool:
+        return bytes.fromhex(fingerprint) in self.offsets
+    
+    def __len__(self) -> int:
+        return len(self.offsets)
+    
+    def get(self, fingerprint: str) -> Optional[str]:
+        """Get a cached page text, or None if missing or unreadable"""
+        key = bytes.fromhex(fingerprint)
+        entry = self.offsets.get(key)
+        if entry is None:
+            return None
+        position, length = entry
+        try:
+            if self._reader is None:
+                self._reader = open(self.cache_file, 'rb')
+            self._reader.seek(position)
+            data = self._reader.read(self.HEADER.size + length)
+            # The file may have been evicted or rewritten by another process
+            if len(data) == self.HEADER.size + length and data[:16] == key:
+                return data[self.HEADER.size:].decode('utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading page cache: {e}")
+        del self.offsets[key]
+        return None
+    
+    def put(self, fingerprint: str, text: str) -> None:
+        """Append a page text unless its fingerprint is already stored"""
+        key = bytes.fromhex(fingerprint)
+        if key in self.offsets:
+            return
+        data = text.encode('utf-8')
+        record = self.HEADER.pack(key, len(data)) + data
+        try:
+            if self._writer is None:
+                self._writer = self._open_writer()
+            # One write per record, so concurrent appenders do not interleave
+            self._writer.write(record)
+            end = self._writer.tell()
+        except OSError as e:
+            print(f"Error writing page cache: {e}")
+            return
+        self.offsets[key] = (end - len(record), len(data))
+        self.size = max(self.size, end)
+        self.appended += 1
+    
+    def _open_writer(self):
+        """Open the file for appending, dropping a torn tail or a foreign format"""
+        if self.size == 0:
+            with open(self.cache_file, 'wb') as f:
+                f.write(self.MAGIC)
+            self.size = len(self.MAGIC)
+            self.offsets.clear()
+        elif os.path.getsize(self.cache_file) > self.size:
+            with open(self.cache_file, 'r+b') as f:
+                f.truncate(self.size)
+        return open(self.cache_file, 'ab', buffering=0)
+    
+    def live_bytes(self, fingerprints: Set[str]) -> int:
+        """Get the bytes taken by the records of the given fingerprints"""
+        keys = {bytes.fromhex(fingerprint) for fingerprint in fingerprints}
+        return sum(self.HEADER.size + length for key, (_, length) in self.offsets.items() if key in keys)
+    
+    def write_copy(self, cache_file: str, fingerprints: Set[str]) -> None:
+        """Write a new store holding only the given pages, copied one at a time"""
+        with open(cache_file, 'wb') as f:
+            f.write(self.MAGIC)
+            for fingerprint in fingerprints:
+                text = self.get(fingerprint)
+                if text is not None:
+                    data = text.encode('utf-8')
+                    f.write(self.HEADER.pack(bytes.fromhex(fingerprint), len(data)))
+                    f.write(data)
+    
+    def close(self) -> None:
+        """Close open file handles"""
+        for handle in (self._reader, self._writer):
+            if handle is not None:
+                handle.close()
+        self._reader = self._writer = None
+
+
+class PageCache:
+    """Caches extracted page text keyed by page content fingerprint
+    
+    Republished dumps usually change only a few pages, so a re-parse only
+    needs to extract text for pages whose fingerprint is not cached yet.
+    Each PDF path has one append-only PageStore; new pages are appended as
+    they are extracted, and a whole-document pass compacts the store once
+    pages no longer in the document take up most of it.
+    """
+    
+    def __init__(self, cache_manager: CacheManager):
+        self.cache_manager = cache_manager
+    
+    def open(self, pdf_filename: str) -> PageStore:
+        """Open the page store of a PDF, creating it on the first write"""
+        name = self._get_cache_name(pdf_filename)
+        self.cache_manager.lookup(name)
+        return PageStore(self.cache_manager.path(name))
+    
+    def close(self, pdf_filename: str, store: PageStore,
+              fingerprints: Optional[Set[str]] = None) -> None:
+        """Close a store after a pass; ``fingerprints`` are all pages of the document
+        
+        Given the full set of current pages, the store is rewritten without
+        stale pages once those take more than half of it.
+        """
+        name = self._get_cache_name(pdf_filename)
+        if fingerprints is not None and store.live_bytes(fingerprints) * 2 < store.size - len(store.MAGIC):
+            def write(cache_file):
+                store.write_copy(cache_file, fingerprints)
+                # The old file must be closed before it can be replaced on Windows
+                store.close()
+            
+            self.cache_manager.write(name, write)
+        elif store.appended:
+            self.cache_manager.evict(keep=store.cache_file)
+        store.close()
+    
+    def _get_cache_name(self, pdf_filename: str) -> str:
+        """Get page cache entry name; keyed by path since the content changes"""
+        path = os.path.normcase(os.path.abspath(pdf_filename))
+        path_key = hashlib.md5(path.encode('utf-8')).hexdigest()[:16]
+        return f"pages_{path_key}.pages"
@@ -2,29 +2,43 @@
 PDF Parsing Functionality
 """
 
-import re
 import json
 import os
-import hashlib
-import fitz  # PyMuPDF
-from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor
-from config.constants import TOPIC_KEYWORDS
+from collections import deque
+from typing import List, Dict, Iterator, Optional, Tuple, Sequence, Callable
+from core.text_extraction import PageTextExtractor
+from core.cache_manager import CacheManager
+from core.page_cache import PageCache
+from core.fingerprint import FileFingerprinter
+from core.bank_cache import MappedBank, write_bank
+from core.question_tokenizer import QuestionTokenizer
+from core.topic_classifier import TopicClassifier
+from core.question_index import QuestionIndex
+from core.cancellation import CancellationToken
+from config.constants import CLASSIFY_BATCH_SIZE
 
 
 class PDFParser:
     """Handles PDF parsing and caching"""
     
-    def __init__(self, cache_prefix: str = "quiz_cache_"):
-        self.cache_prefix = cache_prefix
+    def __init__(self, cache_prefix: str = "quiz_cache_",
+                 extractor: Optional[PageTextExtractor] = None,
+                 cache_compression: str = "none",
+                 cache_manager: Optional[CacheManager] = None):
+        if cache_manager is None:
+            cache_dir, prefix = os.path.split(cache_prefix)
+            cache_manager = CacheManager(cache_dir, prefix)
+        self.cache_manager = cache_manager
+        self.cache_compression = cache_compression
+        self.extractor = extractor or PageTextExtractor()
+        self.page_cache = PageCache(cache_manager)
+        self.fingerprinter = FileFingerprinter(cache_manager.pin("fingerprints.json"))
+        self.topic_classifier = TopicClassifier()
     
-    def parse_pdf(self, pdf_filename: str) -> List[Dict]:
+    def parse_pdf(self, pdf_filename: str) -> Sequence[Dict]:
         """Parse PDF file and extract questions"""
         # Try cache first
-        cache_key = self._get_file_hash(pdf_filename)
-        cache_file = f"{self.cache_prefix}{cache_key}.json"
-        
-        cached_questions = self._load_from_cache(cache_file)
+        cached_questions = self.get_cached_questions(pdf_filename)
         if cached_questions:
             return cached_questions
         
@@ -32,86 +46,222 @@ class PDFParser:
         questions = self._extract_questions_from_pdf(pdf_filename)
         
         # Cache the results
-        self._save_to_cache(cache_file, questions)
+        self.save_questions(pdf_filename, questions)
         
         return questions
     
-    def _extract_questions_from_pdf(self, pdf_filename: str) -> List[Dict]:
-        """Extract questions from PDF file"""
-        questions = []
+    def get_cached_questions(self, pdf_filename: str,
+                             cancel_token: Optional[CancellationToken] = None
+                             ) -> Optional[Sequence[Dict]]:
+        """Get previously parsed questions for a PDF, or None on a cache miss
         
-        try:
-            doc = fitz.open(pdf_filename)
-            
-            # Extract text from all pages in parallel
-            with ThreadPoolExecutor(max_workers=4) as executor:
-                page_texts = list(executor.map(lambda page: page.get_text(), doc))
-            
-            doc.close()
-            full_text = "\n".join(page_texts)
-            
-            # Enhanced regex pattern
-            pattern = re.compile(
-                r"Question #(\d+)\n(.*?)\n((?:[A-E]\. .*?\n)+)(?:Most Voted\n)?Correct Answer: ([A-E]+)(?:\nExplanation:\s*(.*?)(?=\n\n|\nQuestion #|\Z))?",
-                re.DOTALL
-            )
-            
-            for match in pattern.finditer(full_text):
-                question_num = int(match.group(1))
-                question_text = match.group(2).strip()
-                options_block = match.group(3)
-                correct_letters = match.group(4).strip()
-                explanation = match.group(5).strip() if match.group(5) else ""
-                
-                # Parse options
-                options = self._parse_options(options_block)
-                
-                # Parse correct answers
-                correct_indices = [ord(letter) - ord('A') for letter in correct_letters 
-                                 if ord('A') <= ord(letter) <= ord('E')]
-                
-                # Categorize question
-                topic = self._detect_topic(question_text)
-                difficulty = self._detect_difficulty(question_text, len(options))
-                
-                questions.append({
-                    "id": question_num,
-                    "question": question_text,
-                    "options": options,
-                    "correct_answers": correct_indices,
-                    "explanation": explanation,
-                    "topic": topic,
-                    "difficulty": difficulty,
-                    "times_answered": 0,
-                    "times_correct": 0
-                })
+        Hashing a changed PDF reads the whole file; the cancellation token
+        is checked between reads.
+        """
+        cache_file = self.cache_manager.lookup(self._get_cache_name(pdf_filename, cancel_token))
+        return self._load_from_cache(cache_file) if cache_file else None
+    
+    def save_questions(self, pdf_filename: str, questions: List[Dict]) -> None:
+        """Cache parsed questions for a PDF"""
+        self.cache_manager.write(
+            self._get_cache_name(pdf_filename),
+            lambda cache_file: self._save_to_cache(cache_file, questions)
+        )
+    
+    def iter_questions(self, pdf_filename: str,
+                       cancel_token: Optional[CancellationToken] = None,
+                       progress: Optional[Callable[[int, int], None]] = None,
+                       page_numbers: Optional[Sequence[int]] = None,
+                       errors: Optional[List[Dict]] = None) -> Iterator[Dict]:
+        """Yield questions in page order as soon as each one is complete
         
+        Pages are fed to a streaming tokenizer, so questions spanning page
+        boundaries are handled while memory stays bounded by the largest
+        question rather than the whole document. Malformed blocks are
+        appended to ``errors`` if given. The cancellation token is checked
+        between pages and ``progress`` is called with (pages done, total).
+        ``page_numbers`` limits parsing to an ascending run of pages.
+        
+        Blocks are topic-classified in batches, which start at the
+        classifier's minimum batch and double up to CLASSIFY_BATCH_SIZE so
+        the first questions still arrive early.
+        """
+        tokenizer = QuestionTokenizer(errors)
+        batch_size = self.topic_classifier.MIN_BATCH
+        blocks = []
+        
+        first_page = True
+        for _, page_text in self._iter_page_texts(pdf_filename, cancel_token, progress,
+                                                  page_numbers):
+            chunk = page_text if first_page else f"\n{page_text}"
+            first_page = False
+            blocks.extend(tokenizer.feed(chunk))
+            if len(blocks) >= batch_size:
+                yield from self._build_questions(blocks)
+                blocks = []
+                batch_size = min(batch_size * 2, CLASSIFY_BATCH_SIZE)
+        
+        blocks.extend(tokenizer.close())
+        yield from self._build_questions(blocks)
+    
+    def parse_range(self, pdf_filename: str, start_question: int,
+                    end_question: int) -> List[Dict]:
+        """Parse only the pages holding questions start_question..end_question
+        
+        Pages are located through the question index, which probes single
+        pages for headers, so a small slice of a huge dump only extracts the
+        pages it needs.
+        """
+        index = self.get_question_index(pdf_filename)
+        read_page = lambda page_number: self._read_page(pdf_filename, page_number)
+        try:
+            first_page, last_page = index.find_page_range(start_question, end_question, read_page)
+            questions = [question for question in
+                         self.iter_questions(pdf_filename,
+                                             page_numbers=range(first_page, last_page + 1))
+                         if start_question <= question["id"] <= end_question]
         except Exception as e:
-            print(f"Error parsing PDF: {e}")
-            return []
+            print(f"Error parsing question range: {e}")
+            questions = []
         
+        self._save_index(pdf_filename, index)
         return questions
     
-    def _parse_options(self, options_block: str) -> List[str]:
-        """Parse answer options from text block"""
-        option_pattern = re.compile(r"([A-E])\. (.*?)(?=\n[A-E]\. |\n*$)", re.DOTALL)
-        options = []
+    def get_question(self, pdf_filename: str, question_number: int) -> Optional[Dict]:
+        """Parse a single question on demand"""
+        questions = self.parse_range(pdf_filename, question_number, question_number)
+        return questions[0] if questions else None
+    
+    def build_question_index(self, pdf_filename: str) -> QuestionIndex:
+        """Scan every page for question headers and persist the full index"""
+        index = self.get_question_index(pdf_filename)
+        for page_number, page_text in self._iter_page_texts(pdf_filename):
+            index.add_page(page_number, page_text)
+        self._save_index(pdf_filename, index)
+        return index
+    
+    def get_question_index(self, pdf_filename: str) -> QuestionIndex:
+        """Get the persisted question index of a PDF, or an empty one"""
+        page_count = self.extractor.get_page_count(pdf_filename)
+        index_file = self.cache_manager.lookup(self._get_index_name(pdf_filename))
+        if index_file:
+            try:
+                with open(index_file, 'r') as f:
+                    index = QuestionIndex.from_dict(json.load(f))
+                if index.page_count == page_count:
+                    return index
+            except Exception as e:
+                print(f"Error loading question index: {e}")
+        return QuestionIndex(page_count)
+    
+    def _save_index(self, pdf_filename: str, index: QuestionIndex) -> None:
+        """Persist a question index next to the question cache"""
+        if not index.modified:
+            return
         
-        for letter, text in option_pattern.findall(options_block):
-            clean_text = text.replace("Most Voted", "").strip()
-            options.append(clean_text)
+        def write(index_file):
+            with open(index_file, 'w') as f:
+                json.dump(index.to_dict(), f)
         
-        return options
+        if self.cache_manager.write(self._get_index_name(pdf_filename), write):
+            index.modified = False
     
-    def _detect_topic(self, question_text: str) -> str:
-        """Detect question topic based on keywords"""
-        question_lower = question_text.lower()
+    def _read_page(self, pdf_filename: str, page_number: int) -> str:
+        """Extract the text of a single page"""
+        for _, page_text in self.extractor.iter_page_texts(pdf_filename, [page_number]):
+            return page_text
+        return ""
+    
+    def _iter_page_texts(self, pdf_filename: str,
+                         cancel_token: Optional[CancellationToken] = None,
+                         progress: Optional[Callable[[int, int], None]] = None,
+                         page_numbers: Optional[Sequence[int]] = None
+                         ) -> Iterator[Tuple[int, str]]:
+        """Yield page texts, extracting only pages missing from the page cache
+        
+        Pages are fingerprinted and looked up one at a time, just ahead of
+        the extraction work they feed, and newly extracted texts are
+        appended to the page store as they arrive.
+        """
+        whole_document = page_numbers is None
+        if whole_document:
+            page_numbers = range(self.extractor.get_page_count(pdf_filename))
+        store = self.page_cache.open(pdf_filename)
+        page_fingerprints = self.extractor.iter_page_fingerprints(pdf_filename, page_numbers)
+        # Pages fingerprinted but not yet yielded, and those of them still to extract
+        pending = deque()
+        to_extract = deque()
+        fingerprints = set() if whole_document else None
+        
+        def scan_page() -> bool:
+            """Fingerprint and look up the next page; False once all are scanned"""
+            if cancel_token:
+                cancel_token.check()
+            page_number, fingerprint = next(page_fingerprints, (None, None))
+            if fingerprint is None:
+                return False
+            cached = fingerprint in store
+            pending.append((page_number, fingerprint, cached))
+            if not cached:
+                to_extract.append(page_number)
+            if fingerprints is not None:
+                fingerprints.add(fingerprint)
+            return True
         
-        for topic, keywords in TOPIC_KEYWORDS.items():
-            if any(word.lower() in question_lower for word in keywords):
-                return topic
+        def pages_to_extract():
+            """Feed uncached pages to the extractor, scanning ahead as far as it asks"""
+            while to_extract or scan_page():
+                if to_extract:
+                    yield to_extract.popleft()
         
-        return "General"
+        extracted = self.extractor.iter_page_texts(pdf_filename, pages_to_extract(), len(page_numbers))
+        completed = False
+        try:
+            for done in range(1, len(page_numbers) + 1):
+                if not pending:
+                    scan_page()
+                page_number, fingerprint, cached = pending.popleft()
+                page_text = store.get(fingerprint) if cached else None
+                if page_text is None:
+                    if cached:
+                        # Unreadable after all; extract it out of turn
+                        page_text = self._read_page(pdf_filename, page_number)
+                    else:
+                        _, page_text = next(extracted)
+                    store.put(fingerprint, page_text)
+                if progress:
+                    progress(done, len(page_numbers))
+                yield page_number, page_text
+            completed = True
+        finally:
+            # Stops queued extraction work right away when abandoned
+            extracted.close()
+            page_fingerprints.close()
+            self.page_cache.close(pdf_filename, store, fingerprints if completed else None)
+    
+    def _extract_questions_from_pdf(self, pdf_filename: str) -> List[Dict]:
+        """Extract questions from PDF file"""
+        try:
+            return list(self.iter_questions(pdf_filename))
+        except Exception as e:
+            print(f"Error parsing PDF: {e}")
+            return []
+    
+    def _build_questions(self, blocks: List[Dict]) -> List[Dict]:
+        """Build question dicts from tokenized blocks, classifying them as one batch"""
+        topics = self.topic_classifier.classify_many([block["question"] for block in blocks])
+        return [{
+            **block,
+            "topic": topic,
+            "secondary_topics": secondary_topics,
+            "difficulty": self._detect_difficulty(block["question"], len(block["options"])),
+            "times_answered": 0,
+            "times_correct": 0
+        } for block, (topic, secondary_topics) in zip(blocks, topics)]
+    
+    def _detect_topic(self, question_text: str) -> str:
+        """Detect primary question topic based on keywords"""
+        return self.topic_classifier.classify(question_text)[0]
     
     def _detect_difficulty(self, question_text: str, num_options: int) -> str:
         """Detect question difficulty"""
@@ -122,42 +272,52 @@ class PDFParser:
         else:
             return "Easy"
     
-    def _get_file_hash(self, filename: str) -> str:
-        """Get MD5 hash of file for caching"""
-        hash_md5 = hashlib.md5()
-        try:
-            with open(filename, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()[:8]
-        except:
-            return "default"
+    def get_cache_file(self, pdf_filename: str) -> str:
+        """Get cache filename for a PDF"""
+        return self.cache_manager.path(self._get_cache_name(pdf_filename))
     
-    def _load_from_cache(self, cache_file: str) -> List[Dict]:
-        """Load questions from cache"""
-        if not os.path.exists(cache_file):
-            return None
-        
+    def _get_cache_name(self, pdf_filename: str,
+                        cancel_token: Optional[CancellationToken] = None) -> str:
+        """Get cache entry name for a PDF"""
+        return f"{self._get_file_hash(pdf_filename, cancel_token)}.bank"
+    
+    def _get_index_name(self, pdf_filename: str) -> str:
+        """Get question index entry name for a PDF"""
+        return f"{self._get_file_hash(pdf_filename)}.index.json"
+    
+    def _get_file_hash(self, filename: str,
+                       cancel_token: Optional[CancellationToken] = None) -> str:
+        """Get content hash of file for caching"""
         try:
-            with open(cache_file, 'r') as f:
-                cached_data = json.load(f)
-                if cached_data.get('version') == '2.0':
-                    return cached_data['questions']
-        except:
-            pass
-        
-        return None
+            return self.fingerprinter.get_hash(filename, cancel_token)
+        except OSError:
+            return "default"
     
-    def _save_to_cache(self, cache_file: str, questions: List[Dict]) -> None:
-        """Save questions to cache"""
+    def export_json(self, questions: List[Dict], json_filename: str) -> bool:
+        """Export questions in the JSON cache format"""
         try:
             from datetime import datetime
-            cache_data = {
+            export_data = {
                 'version': '2.0',
                 'timestamp': datetime.now().isoformat(),
-                'questions': questions
+                'questions': [dict(question) for question in questions]
             }
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            with open(json_filename, 'w') as f:
+                json.dump(export_data, f, indent=2)
+            return True
+        except Exception as e:
+            print(f"Error exporting questions: {e}")
+            return False
+    
+    def _load_from_cache(self, cache_file: str) -> Optional[MappedBank]:
+        """Open cached questions; records are decoded lazily on access"""
+        try:
+            return MappedBank(cache_file)
         except Exception as e:
-            print(f"Error saving cache: {e}")
\ No newline at end of file
+            print(f"Error loading cache: {e}")
+        
+        return None
+    
+    def _save_to_cache(self, cache_file: str, questions: List[Dict]) -> None:
+        """Save questions to cache; errors propagate so no partial file is kept"""
+        write_bank(cache_file, questions, self.cache_compression)
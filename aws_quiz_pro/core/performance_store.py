@@ -0,0 +1,227 @@
+"""
+Per-Question Performance Store
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import numpy as np
+from core.question_bank import QuestionBank
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    session_id INTEGER NOT NULL,
+    question_key INTEGER NOT NULL,
+    answered_at REAL NOT NULL,
+    chosen_mask INTEGER NOT NULL,
+    is_correct INTEGER NOT NULL,
+    time_taken REAL NOT NULL,
+    PRIMARY KEY (session_id, question_key)
+);
+CREATE TABLE IF NOT EXISTS counters (
+    question_key INTEGER PRIMARY KEY,
+    times_answered INTEGER NOT NULL,
+    times_correct INTEGER NOT NULL,
+    last_answered REAL NOT NULL
+);
+"""
+
+
+def to_signed(key: int) -> int:
+    """Map an unsigned 64-bit question key onto SQLite's signed integers"""
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+class PerformanceStore:
+    """Answer history and per-question counters in SQLite, written off the UI thread
+    
+    Questions are identified by their content key, so counters follow a
+    question across reloads, cache rebuilds and merged dumps. Each quiz
+    keeps one attempt row per question with the chosen options as a
+    bitmask and the total response time; answering again in the same quiz
+    revises that row and moves ``times_correct`` accordingly, matching
+    QuizSession. Recording is idempotent, so replaying a journaled quiz
+    does not count answers twice.
+    
+    ``record`` only queues the answer. A writer thread commits queued
+    answers in one transaction per batch, with the database in WAL mode so
+    reads on other threads are not blocked.
+    """
+    
+    def __init__(self, db_file: str, batch_size: int = 64, flush_interval: float = 0.5):
+        self.db_file = db_file
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        
+        try:
+            connection = sqlite3.connect(db_file)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            connection.close()
+        except Exception as e:
+            print(f"Error opening performance store: {e}")
+            self._closed = True
+            return
+        
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+    
+    def record(self, session_id: int, question_key: int, chosen_mask: int,
+               is_correct: bool, time_taken: float, answered_at: Optional[float] = None) -> None:
+        """Queue an answer, or its revision within the same quiz
+        
+        ``time_taken`` is the time spent on the question in this quiz over
+        all its attempts; a revision replaces the stored value.
+        """
+        if self._closed:
+            return
+        answered_at = time.time() if answered_at is None else answered_at
+        self._queue.put((session_id, to_signed(question_key), answered_at,
+                         chosen_mask, int(is_correct), time_taken))
+    
+    def flush(self) -> None:
+        """Wait until every queued answer is committed"""
+        if not self._closed:
+            self._queue.join()
+    
+    def close(self) -> None:
+        """Commit queued answers and stop the writer"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+    
+    def _write_loop(self) -> None:
+        """Commit queued answers in batches until closed"""
+        connection = sqlite3.connect(self.db_file)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                running = False
+                batch.pop()
+            
+            try:
+                with connection:
+                    connection.execute("BEGIN")
+                    for answer in batch:
+                        # A bad answer is skipped without rolling back the rest of the batch
+                        connection.execute("SAVEPOINT answer")
+                        try:
+                            self._write_answer(connection, *answer)
+                        except (sqlite3.Error, OverflowError, ValueError, TypeError) as e:
+                            print(f"Error writing answer to performance store: {e}")
+                            connection.execute("ROLLBACK TO answer")
+                        connection.execute("RELEASE answer")
+            except Exception as e:
+                print(f"Error writing performance store: {e}")
+            for _ in range(len(batch) + (not running)):
+                self._queue.task_done()
+        connection.close()
+    
+    def _write_answer(self, connection: sqlite3.Connection, session_id: int, question_key: int,
+                      answered_at: float, chosen_mask: int, is_correct: int, time_taken: float) -> None:
+        """Upsert an attempt and move the question's counters by what changed"""
+        previous = connection.execute(
+            "SELECT is_correct FROM attempts WHERE session_id = ? AND question_key = ?",
+            (session_id, question_key)
+        ).fetchone()
+        answered_delta = 0 if previous else 1
+        correct_delta = is_correct - (previous[0] if previous else 0)
+        
+        connection.execute(
+            "INSERT INTO attempts VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (session_id, question_key) DO UPDATE SET "
+            "answered_at = excluded.answered_at, chosen_mask = excluded.chosen_mask, "
+            "is_correct = excluded.is_correct, time_taken = excluded.time_taken",
+            (session_id, question_key, answered_at, chosen_mask, is_correct, time_taken)
+        )
+        connection.execute(
+            "INSERT INTO counters VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (question_key) DO UPDATE SET "
+            "times_answered = times_answered + excluded.times_answered, "
+            "times_correct = times_correct + excluded.times_correct, "
+            "last_answered = MAX(last_answered, excluded.last_answered)",
+            (question_key, answered_delta, correct_delta, answered_at)
+        )
+    
+    def remap(self, key_map: Dict[int, int]) -> int:
+        """Move attempts and counters from old to new content keys; get how many counters moved
+        
+        Counters already kept under a new key are added to.
+        """
+        if self._closed or not key_map:
+            return 0
+        self.flush()
+        try:
+            connection = sqlite3.connect(self.db_file)
+            try:
+                with connection:
+                    connection.execute("CREATE TEMP TABLE key_map (old_key INTEGER PRIMARY KEY, new_key INTEGER)")
+                    connection.executemany("INSERT INTO key_map VALUES (?, ?)",
+                                           [(to_signed(old), to_signed(new)) for old, new in key_map.items()])
+                    moved = connection.execute(
+                        "INSERT INTO counters SELECT key_map.new_key, times_answered, times_correct, last_answered "
+                        "FROM counters JOIN key_map ON question_key = key_map.old_key WHERE true "
+                        "ON CONFLICT (question_key) DO UPDATE SET "
+                        "times_answered = times_answered + excluded.times_answered, "
+                        "times_correct = times_correct + excluded.times_correct, "
+                        "last_answered = MAX(last_answered, excluded.last_answered)"
+                    ).rowcount
+                    connection.execute("DELETE FROM counters WHERE question_key IN (SELECT old_key FROM key_map)")
+                    # An attempt already recorded under the new key in the same quiz wins
+                    connection.execute(
+                        "UPDATE OR IGNORE attempts SET question_key = "
+                        "(SELECT new_key FROM key_map WHERE old_key = question_key) "
+                        "WHERE question_key IN (SELECT old_key FROM key_map)"
+                    )
+                    connection.execute("DELETE FROM attempts WHERE question_key IN (SELECT old_key FROM key_map)")
+            finally:
+                connection.close()
+        except Exception as e:
+            print(f"Error remapping performance store: {e}")
+            return 0
+        return moved
+    
+    def load_counters(self) -> Dict[int, Tuple[int, int, float]]:
+        """Get answered and correct counts and last answer time of every known question"""
+        try:
+            connection = sqlite3.connect(self.db_file)
+            try:
+                rows = connection.execute(
+                    "SELECT question_key, times_answered, times_correct, last_answered FROM counters"
+                ).fetchall()
+            finally:
+                connection.close()
+        except Exception as e:
+            print(f"Error reading performance store: {e}")
+            return {}
+        return {key & 0xFFFFFFFFFFFFFFFF: (answered, correct, last)
+                for key, answered, correct, last in rows}
+    
+    def apply_to(self, bank: QuestionBank, start: int = 0) -> int:
+        """Load stored counters into the bank's questions from start on; get how many matched"""
+        counters = self.load_counters()
+        if not counters:
+            return 0
+        
+        matched = [(index, counters[key]) for index, key in enumerate(bank.keys[start:], start)
+                   if key in counters]
+        if matched:
+            indexes, values = zip(*matched)
+            values = np.array([value[:2] for value in values], dtype=np.int64)
+            bank.set_counters(np.array(indexes), values[:, 0], values[:, 1])
+        return len(matched)
@@ -0,0 +1,605 @@
+"""
+Compact In-Memory Question Bank
+"""
+
+import json
+import random
+import zlib
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping, Sequence
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from core.bank_cache import (BASE_FIELDS, QUESTION_SLOT, EXPLANATION_SLOT, EXTRAS_SLOT,
+                             OPTIONS_SLOT, MappedBank, MappedQuestion)
+from core.question_identity import content_key
+
+
+# Strings are compressed in blocks of about this many bytes; small blocks keep
+# a random read, which decompresses a whole block, cheap
+TEXT_BLOCK_SIZE = 8 * 1024
+# Decompressed blocks kept, least recently read evicted first; enough for
+# every block an exam's questions and shared options touch
+TEXT_BLOCK_CACHE_SIZE = 128
+
+
+class QuestionBank(Sequence):
+    """Question store with one typed array per field instead of a dict per question
+    
+    Ids, counters, topic and difficulty codes and correct answer bitmasks
+    live in typed arrays. Question text, explanations, options and extra
+    keys are stored as UTF-8 in zlib-compressed blocks; identical strings,
+    such as options repeated across dumps, are stored only once per load.
+    Filtering and sampling work on index lists, and a question's strings
+    are only decompressed when a ``QuestionView`` of it is read, and
+    recently read blocks stay decompressed in a small cache.
+    
+    Filterable attributes are also indexed as bitsets (one Python int per
+    topic, difficulty, source, and for multi-answer, previously wrong and
+    never seen questions), kept current as fields change. A combined
+    filter is a handful of big-int ANDs and ORs, independent of how many
+    questions match each attribute.
+    
+    Questions from a cached MappedBank keep their strings in the mapped
+    file: their numeric fields and content keys are copied from the fixed
+    records, and a payload is only decoded when the question is read. Such
+    a question's strings are copied into the bank once one of them changes.
+    """
+    
+    def __init__(self, questions: Iterable[Mapping] = ()):
+        self.ids = array('q')
+        # 64-bit hash of question text and options, stable across loads and banks
+        self.keys = array('Q')
+        self.times_answered = array('q')
+        self.times_correct = array('q')
+        self.topic_codes = array('H')
+        self.difficulty_codes = array('B')
+        self.source_codes = array('H')
+        self.correct_masks = array('Q')
+        self.topics: List[str] = []
+        self.difficulties: List[str] = []
+        self.sources: List[str] = []
+        self._topic_codes: Dict[str, int] = {}
+        self._difficulty_codes: Dict[str, int] = {}
+        self._source_codes: Dict[str, int] = {}
+        
+        # Bit i is set when question i has the attribute; per code for topics etc.
+        self._topic_bits: List[int] = []
+        self._difficulty_bits: List[int] = []
+        self._source_bits: List[int] = []
+        self._multi_answer_bits = 0
+        self._wrong_bits = 0
+        self._unseen_bits = 0
+        # Question indexes per topic code, rebuilt when topics change
+        self._topic_pools: Optional[List[np.ndarray]] = None
+        
+        # Strings are segments of text blocks, addressed by segment number
+        self._blocks: List[bytes] = []
+        self._open_block = bytearray()
+        self._segment_blocks = array('I')
+        self._segment_starts = array('I')
+        self._segment_lengths = array('I')
+        # Decompressed blocks by block number, least recently read first
+        self._decoded_blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        self._question_segments = array('I')
+        self._explanation_segments = array('I')
+        self._extras_segments = array('I')
+        self._option_segments = array('I')
+        self._option_starts = array('I')
+        self._option_counts = array('B')
+        self._empty_segment: Optional[int] = None
+        
+        # Strings still in a mapped cache file: bank number (-1 if none), payload offset and length
+        self._mapped_banks: List[MappedBank] = []
+        self._payload_banks = array('h')
+        self._payload_offsets = array('Q')
+        self._payload_lengths = array('I')
+        self._decoded_payload: Optional[int] = None
+        self._decoded_strings: List[str] = []
+        
+        self.extend(questions)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [QuestionView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("question index out of range")
+        return QuestionView(self, index)
+    
+    def copy(self) -> "QuestionSelection":
+        """Get a selection of every question, mirroring list.copy()"""
+        return QuestionSelection(self, list(range(len(self))))
+    
+    def select(self, indexes: Iterable[int]) -> "QuestionSelection":
+        """Get a selection of the questions at the given indexes"""
+        return QuestionSelection(self, list(indexes))
+    
+    def extend(self, questions: Iterable[Mapping]) -> None:
+        """Append questions, interning strings repeated within this batch
+        
+        Questions of a MappedBank, or MappedQuestions not decoded yet, keep
+        their strings in the mapped file.
+        """
+        start = len(self)
+        if isinstance(questions, MappedBank) and questions.untouched:
+            self._extend_records(questions)
+            self._index_range(start)
+            return
+        
+        # The lookup table is dropped afterwards so it never outweighs the savings
+        interned: Dict[str, int] = {}
+        for question in questions:
+            undecoded = question.get_undecoded() if isinstance(question, MappedQuestion) else None
+            if undecoded:
+                fields, bank, offset, length, content = undecoded
+                self._append_fields(fields, content)
+                extras = {key: value for key, value in fields.items() if key not in BASE_FIELDS}
+                self._append_payload(bank, offset, length, extras)
+                continue
+            
+            self._append_fields(question, self.get_key(question))
+            self._payload_banks.append(-1)
+            self._payload_offsets.append(0)
+            self._payload_lengths.append(0)
+            self._question_segments.append(self._intern(question.get("question", ""), interned))
+            self._explanation_segments.append(self._intern(question.get("explanation", ""), interned))
+            extras = {key: value for key, value in question.items() if key not in BASE_FIELDS}
+            self._extras_segments.append(self._intern(json.dumps(extras) if extras else "", interned))
+            
+            options = question.get("options", [])
+            self._option_starts.append(len(self._option_segments))
+            self._option_counts.append(len(options))
+            self._option_segments.extend(self._intern(option, interned) for option in options)
+        
+        self._index_range(start)
+    
+    def _append_fields(self, question: Mapping, key: int) -> None:
+        """Append the numeric fields, codes and content key of a question"""
+        self.ids.append(question.get("id", 0))
+        self.keys.append(key)
+        self.times_answered.append(question.get("times_answered", 0))
+        self.times_correct.append(question.get("times_correct", 0))
+        self.topic_codes.append(self._get_code(
+            question.get("topic", "General"), self.topics, self._topic_codes, self._topic_bits))
+        self.difficulty_codes.append(self._get_code(
+            question.get("difficulty", "Medium"), self.difficulties,
+            self._difficulty_codes, self._difficulty_bits))
+        self.source_codes.append(self._get_code(
+            question.get("source", ""), self.sources, self._source_codes, self._source_bits))
+        self.correct_masks.append(self._get_mask(question.get("correct_answers", [])))
+    
+    def _append_payload(self, bank: MappedBank, offset: int, length: int, extras: Dict) -> None:
+        """Point a question's strings at a mapped payload; ``extras`` are fields set since
+        
+        Option segments are filled in only if the question is materialized.
+        """
+        self._payload_banks.append(self._get_bank_number(bank))
+        self._payload_offsets.append(offset)
+        self._payload_lengths.append(length)
+        empty = self._get_empty_segment()
+        self._question_segments.append(empty)
+        self._explanation_segments.append(empty)
+        self._extras_segments.append(self._add_segment(json.dumps(extras)) if extras else empty)
+        self._option_starts.append(len(self._option_segments))
+        self._option_counts.append(0)
+    
+    def _extend_records(self, bank: MappedBank) -> None:
+        """Append every question of a mapped bank from its fixed-size records in bulk"""
+        records = bank.read_records()
+        count = len(records)
+        topic_map = np.array([self._get_code(topic, self.topics, self._topic_codes, self._topic_bits)
+                              for topic in bank.topics], dtype=np.uint16)
+        difficulty_map = np.array([self._get_code(difficulty, self.difficulties,
+                                                  self._difficulty_codes, self._difficulty_bits)
+                                   for difficulty in bank.difficulties], dtype=np.uint8)
+        source_code = self._get_code("", self.sources, self._source_codes, self._source_bits)
+        empty = self._get_empty_segment()
+        
+        for target, values, dtype in (
+            (self.ids, records["id"], np.int64),
+            (self.keys, records["key"], np.uint64),
+            (self.times_answered, records["times_answered"], np.int64),
+            (self.times_correct, records["times_correct"], np.int64),
+            (self.topic_codes, topic_map[records["topic_code"]], np.uint16),
+            (self.difficulty_codes, difficulty_map[records["difficulty_code"]], np.uint8),
+            (self.source_codes, np.full(count, source_code), np.uint16),
+            (self.correct_masks, records["correct_mask"], np.uint64),
+            (self._payload_banks, np.full(count, self._get_bank_number(bank)), np.int16),
+            (self._payload_offsets, records["offset"], np.uint64),
+            (self._payload_lengths, records["length"], np.uint32),
+            (self._question_segments, np.full(count, empty), np.uint32),
+            (self._explanation_segments, np.full(count, empty), np.uint32),
+            (self._extras_segments, np.full(count, empty), np.uint32),
+            (self._option_starts, np.full(count, len(self._option_segments)), np.uint32),
+            (self._option_counts, np.zeros(count), np.uint8)
+        ):
+            target.frombytes(values.astype(dtype).tobytes())
+    
+    def close(self) -> None:
+        """Release the cache files mapped for questions' strings; they are mapped again if read"""
+        for bank in self._mapped_banks:
+            bank.close()
+    
+    def _get_bank_number(self, bank: MappedBank) -> int:
+        """Get the number of a mapped bank, adding it if new"""
+        for number, mapped_bank in enumerate(self._mapped_banks):
+            if mapped_bank is bank:
+                return number
+        self._mapped_banks.append(bank)
+        return len(self._mapped_banks) - 1
+    
+    def _get_empty_segment(self) -> int:
+        """Get a segment holding the empty string, shared by mapped questions"""
+        if self._empty_segment is None:
+            self._empty_segment = self._add_segment("")
+        return self._empty_segment
+    
+    def _get_mapped_strings(self, index: int) -> Optional[List[str]]:
+        """Get the payload strings of a question still in a mapped file, else None"""
+        bank_number = self._payload_banks[index]
+        if bank_number < 0:
+            return None
+        # Fields of one question are usually read together, so keep the last payload
+        if index != self._decoded_payload:
+            self._decoded_strings = self._mapped_banks[bank_number].read_strings(
+                self._payload_offsets[index], self._payload_lengths[index]
+            )
+            self._decoded_payload = index
+        return self._decoded_strings
+    
+    def _materialize(self, index: int) -> None:
+        """Copy a mapped question's strings into the bank before one is changed"""
+        strings = self._get_mapped_strings(index)
+        if strings is None:
+            return
+        extras = self.get_extras(index)
+        self._question_segments[index] = self._add_segment(strings[QUESTION_SLOT])
+        self._explanation_segments[index] = self._add_segment(strings[EXPLANATION_SLOT])
+        self._option_starts[index] = len(self._option_segments)
+        self._option_counts[index] = len(strings) - OPTIONS_SLOT
+        self._option_segments.extend(self._add_segment(option) for option in strings[OPTIONS_SLOT:])
+        self._payload_banks[index] = -1
+        self._decoded_payload = None
+        self._set_extras(index, extras)
+    
+    @staticmethod
+    def get_key(question: Mapping) -> int:
+        """Get the content key of a question"""
+        return content_key(question)
+    
+    def filter(self, topics: Optional[Iterable[str]] = None,
+               difficulties: Optional[Iterable[str]] = None,
+               sources: Optional[Iterable[str]] = None,
+               multi_answer: Optional[bool] = None,
+               previously_wrong: bool = False,
+               never_seen: bool = False) -> "QuestionSelection":
+        """Get the questions matching every given criterion, in bank order
+        
+        A list of names matches any of them; None or False skips a criterion.
+        """
+        bits = (1 << len(self)) - 1
+        if topics is not None:
+            bits &= self._get_union(topics, self._topic_codes, self._topic_bits)
+        if difficulties is not None:
+            bits &= self._get_union(difficulties, self._difficulty_codes, self._difficulty_bits)
+        if sources is not None:
+            bits &= self._get_union(sources, self._source_codes, self._source_bits)
+        if multi_answer is not None:
+            bits &= self._multi_answer_bits if multi_answer else ~self._multi_answer_bits
+        if previously_wrong:
+            bits &= self._wrong_bits
+        if never_seen:
+            bits &= self._unseen_bits
+        return QuestionSelection(self, self._get_indexes(bits))
+    
+    def _get_union(self, names: Iterable[str], codes: Dict[str, int], bits: List[int]) -> int:
+        """Get the bitset of questions having any of the names"""
+        union = 0
+        for name in names:
+            code = codes.get(name)
+            if code is not None:
+                union |= bits[code]
+        return union
+    
+    def _get_indexes(self, bits: int) -> List[int]:
+        """Get the positions of the set bits of a bitset"""
+        if not bits:
+            return []
+        packed = np.frombuffer(bits.to_bytes((len(self) + 7) // 8, 'little'), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(packed, bitorder='little')).tolist()
+    
+    def _to_bits(self, mask: np.ndarray, start: int) -> int:
+        """Get a bitset from a boolean array covering questions from start on"""
+        return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little') << start
+    
+    def _index_range(self, start: int) -> None:
+        """Add questions from start on to the bitset indexes in bulk"""
+        if start == len(self):
+            return
+        self._topic_pools = None
+        for codes, dtype, bits in ((self.topic_codes, np.uint16, self._topic_bits),
+                                   (self.difficulty_codes, np.uint8, self._difficulty_bits),
+                                   (self.source_codes, np.uint16, self._source_bits)):
+            new_codes = np.frombuffer(codes, dtype=dtype)[start:]
+            for code in np.unique(new_codes).tolist():
+                bits[code] |= self._to_bits(new_codes == code, start)
+        
+        masks = np.frombuffer(self.correct_masks, dtype=np.uint64)[start:]
+        answered = np.frombuffer(self.times_answered, dtype=np.int64)[start:]
+        correct = np.frombuffer(self.times_correct, dtype=np.int64)[start:]
+        self._multi_answer_bits |= self._to_bits((masks & (masks - np.uint64(1))) != 0, start)
+        self._wrong_bits |= self._to_bits(answered > correct, start)
+        self._unseen_bits |= self._to_bits(answered == 0, start)
+    
+    def _update_bit(self, bits: int, index: int, value: bool) -> int:
+        """Get a bitset with one bit set or cleared"""
+        return bits | (1 << index) if value else bits & ~(1 << index)
+    
+    def _update_answer_bits(self, index: int) -> None:
+        """Refresh the previously wrong and never seen bits of a question"""
+        answered = self.times_answered[index]
+        self._wrong_bits = self._update_bit(self._wrong_bits, index, answered > self.times_correct[index])
+        self._unseen_bits = self._update_bit(self._unseen_bits, index, answered == 0)
+    
+    def _recode(self, index: int, name: str, codes_array: array, names: List[str],
+                codes: Dict[str, int], bits: List[int]) -> None:
+        """Change a question's topic, difficulty or source code and its bitsets"""
+        old_code = codes_array[index]
+        bits[old_code] = self._update_bit(bits[old_code], index, False)
+        new_code = self._get_code(name, names, codes, bits)
+        codes_array[index] = new_code
+        bits[new_code] = self._update_bit(bits[new_code], index, True)
+    
+    def set_counters(self, indexes: np.ndarray, answered: np.ndarray, correct: np.ndarray) -> None:
+        """Set the answer counters of many questions at once"""
+        all_answered = np.frombuffer(self.times_answered, dtype=np.int64)
+        all_correct = np.frombuffer(self.times_correct, dtype=np.int64)
+        all_answered[indexes] = answered
+        all_correct[indexes] = correct
+        self._wrong_bits = self._to_bits(all_answered > all_correct, 0)
+        self._unseen_bits = self._to_bits(all_answered == 0, 0)
+    
+    def get_topic_pools(self) -> List[np.ndarray]:
+        """Get the question indexes of each topic, by topic code, in bank order"""
+        if not self.topics:
+            return []
+        if self._topic_pools is None:
+            codes = np.frombuffer(self.topic_codes, dtype=np.uint16)
+            order = np.argsort(codes, kind='stable')
+            counts = np.bincount(codes, minlength=len(self.topics))
+            self._topic_pools = np.split(order, np.cumsum(counts)[:-1])
+        return self._topic_pools
+    
+    def sample(self, count: int) -> "QuestionSelection":
+        """Get a selection of distinct random questions"""
+        return QuestionSelection(self, random.sample(range(len(self)), count))
+    
+    def get_field(self, index: int, key: str):
+        """Get one field of a question"""
+        if key == "id":
+            return self.ids[index]
+        if key == "times_answered":
+            return self.times_answered[index]
+        if key == "times_correct":
+            return self.times_correct[index]
+        if key == "topic":
+            return self.topics[self.topic_codes[index]]
+        if key == "difficulty":
+            return self.difficulties[self.difficulty_codes[index]]
+        if key == "correct_answers":
+            mask = self.correct_masks[index]
+            return [i for i in range(mask.bit_length()) if mask >> i & 1]
+        if key in ("question", "explanation", "options"):
+            strings = self._get_mapped_strings(index)
+            if strings is not None:
+                if key == "options":
+                    return strings[OPTIONS_SLOT:]
+                return strings[QUESTION_SLOT if key == "question" else EXPLANATION_SLOT]
+        if key == "question":
+            return self._get_segment(self._question_segments[index])
+        if key == "explanation":
+            return self._get_segment(self._explanation_segments[index])
+        if key == "options":
+            start = self._option_starts[index]
+            segments = self._option_segments[start:start + self._option_counts[index]]
+            return [self._get_segment(segment) for segment in segments]
+        return self.get_extras(index)[key]
+    
+    def set_field(self, index: int, key: str, value) -> None:
+        """Set one field of a question"""
+        if key == "id":
+            self.ids[index] = value
+        elif key == "times_answered":
+            self.times_answered[index] = value
+            self._update_answer_bits(index)
+        elif key == "times_correct":
+            self.times_correct[index] = value
+            self._update_answer_bits(index)
+        elif key == "topic":
+            self._recode(index, value, self.topic_codes, self.topics,
+                         self._topic_codes, self._topic_bits)
+            self._topic_pools = None
+        elif key == "difficulty":
+            self._recode(index, value, self.difficulty_codes, self.difficulties,
+                         self._difficulty_codes, self._difficulty_bits)
+        elif key == "correct_answers":
+            mask = self._get_mask(value)
+            self.correct_masks[index] = mask
+            self._multi_answer_bits = self._update_bit(
+                self._multi_answer_bits, index, mask & (mask - 1) != 0)
+        elif key == "question":
+            self._materialize(index)
+            self._question_segments[index] = self._add_segment(value)
+            self.keys[index] = self.get_key(QuestionView(self, index))
+        elif key == "explanation":
+            self._materialize(index)
+            self._explanation_segments[index] = self._add_segment(value)
+        elif key == "options":
+            self._materialize(index)
+            self._option_starts[index] = len(self._option_segments)
+            self._option_counts[index] = len(value)
+            self._option_segments.extend(self._add_segment(option) for option in value)
+            self.keys[index] = self.get_key(QuestionView(self, index))
+        else:
+            extras = self.get_extras(index)
+            extras[key] = value
+            self._set_extras(index, extras)
+            if key == "source":
+                self._recode(index, value, self.source_codes, self.sources,
+                             self._source_codes, self._source_bits)
+    
+    def delete_field(self, index: int, key: str) -> None:
+        """Remove a non-base field of a question"""
+        if key in BASE_FIELDS:
+            raise KeyError(f"Cannot delete base field: {key}")
+        self._materialize(index)
+        extras = self.get_extras(index)
+        del extras[key]
+        self._set_extras(index, extras)
+        if key == "source":
+            self._recode(index, "", self.source_codes, self.sources,
+                         self._source_codes, self._source_bits)
+    
+    def get_extras(self, index: int) -> Dict:
+        """Get the non-base fields of a question, decoded afresh on each call"""
+        encoded = self._get_segment(self._extras_segments[index])
+        extras = json.loads(encoded) if encoded else {}
+        strings = self._get_mapped_strings(index)
+        if strings is not None and strings[EXTRAS_SLOT]:
+            # Fields set after loading take precedence over those in the file
+            extras = {**json.loads(strings[EXTRAS_SLOT]), **extras}
+        return extras
+    
+    def _set_extras(self, index: int, extras: Dict) -> None:
+        """Replace the non-base fields of a question"""
+        self._extras_segments[index] = self._add_segment(json.dumps(extras) if extras else "")
+    
+    def _get_code(self, name: str, names: List[str], codes: Dict[str, int],
+                  bits: List[int]) -> int:
+        """Get the code of a topic, difficulty or source name, adding it if new"""
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(names)
+            names.append(name)
+            bits.append(0)
+        return code
+    
+    def _get_mask(self, correct_answers: Iterable[int]) -> int:
+        """Pack correct answer indexes into a bitmask"""
+        mask = 0
+        for answer in correct_answers:
+            mask |= 1 << answer
+        return mask
+    
+    def _intern(self, text: str, interned: Dict[str, int]) -> int:
+        """Get the segment of a string, storing it only if not seen in this batch"""
+        segment = interned.get(text)
+        if segment is None:
+            segment = interned[text] = self._add_segment(text)
+        return segment
+    
+    def _add_segment(self, text: str) -> int:
+        """Store a string and get its segment number"""
+        encoded = text.encode('utf-8')
+        self._segment_blocks.append(len(self._blocks))
+        self._segment_starts.append(len(self._open_block))
+        self._segment_lengths.append(len(encoded))
+        self._open_block += encoded
+        if len(self._open_block) >= TEXT_BLOCK_SIZE:
+            self._blocks.append(zlib.compress(self._open_block))
+            self._open_block = bytearray()
+        return len(self._segment_lengths) - 1
+    
+    def _get_segment(self, segment: int) -> str:
+        """Decode a stored string"""
+        block = self._segment_blocks[segment]
+        if block == len(self._blocks):
+            text = self._open_block
+        else:
+            text = self._decoded_blocks.get(block)
+            if text is None:
+                text = self._decoded_blocks[block] = zlib.decompress(self._blocks[block])
+                if len(self._decoded_blocks) > TEXT_BLOCK_CACHE_SIZE:
+                    self._decoded_blocks.popitem(last=False)
+            else:
+                self._decoded_blocks.move_to_end(block)
+        start = self._segment_starts[segment]
+        return text[start:start + self._segment_lengths[segment]].decode('utf-8')
+
+
+class QuestionSelection(Sequence):
+    """Ordered subset of a QuestionBank, held as question indexes
+    
+    Views are created only for the questions actually read, so selecting,
+    shuffling and sorting never touch per-question objects.
+    """
+    
+    def __init__(self, bank: QuestionBank, indexes: List[int]):
+        self.bank = bank
+        self.indexes = indexes
+    
+    def __len__(self) -> int:
+        return len(self.indexes)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [QuestionView(self.bank, i) for i in self.indexes[index]]
+        return QuestionView(self.bank, self.indexes[index])
+    
+    def shuffle(self) -> None:
+        """Shuffle the selection in place"""
+        random.shuffle(self.indexes)
+    
+    def sort_by_id(self, reverse: bool = False) -> None:
+        """Sort the selection by question id in place"""
+        self.indexes.sort(key=self.bank.ids.__getitem__, reverse=reverse)
+
+
+class QuestionView(MutableMapping):
+    """Dict-like view of one question in a QuestionBank
+    
+    Reads and writes go straight to the bank. Values are decoded on every
+    access, so mutate a field by assigning it rather than changing the
+    returned list or dict in place.
+    """
+    
+    __slots__ = ("bank", "index")
+    
+    def __init__(self, bank: QuestionBank, index: int):
+        self.bank = bank
+        self.index = index
+    
+    def __getitem__(self, key):
+        return self.bank.get_field(self.index, key)
+    
+    def __setitem__(self, key, value):
+        self.bank.set_field(self.index, key, value)
+    
+    def __delitem__(self, key):
+        self.bank.delete_field(self.index, key)
+    
+    def __iter__(self):
+        yield from BASE_FIELDS
+        yield from self.bank.get_extras(self.index)
+    
+    def __len__(self) -> int:
+        return len(BASE_FIELDS) + len(self.bank.get_extras(self.index))
+    
+    def __contains__(self, key) -> bool:
+        return key in BASE_FIELDS or key in self.bank.get_extras(self.index)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, QuestionView):
+            return self.bank is other.bank and self.index == other.index
+        return super().__eq__(other)
+    
+    def __hash__(self) -> int:
+        return hash((id(self.bank), self.index))
+    
+    def __repr__(self) -> str:
+        return f"QuestionView({dict(self)!r})"
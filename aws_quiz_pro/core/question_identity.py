@@ -0,0 +1,105 @@
+"""
+Content-Based Question Identity
+"""
+
+import hashlib
+from collections import Counter, defaultdict
+from typing import Dict, List, Mapping, Sequence, Set, Tuple
+from core.topic_classifier import SEPARATOR_TABLE
+
+
+def normalize_words(question: Mapping) -> List[str]:
+    """Get the words of a question's stem and options, case and option order ignored"""
+    options = sorted(option.lower() for option in question.get("options", []))
+    text = " ".join([question.get("question", "").lower(), *options])
+    return text.translate(SEPARATOR_TABLE).split()
+
+
+def words_key(words: List[str]) -> int:
+    """Get the 64-bit content key of normalized question words"""
+    digest = hashlib.blake2b(" ".join(words).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def content_key(question: Mapping) -> int:
+    """Get a question's content key, independent of its number, case, punctuation and option order"""
+    return words_key(normalize_words(question))
+
+
+class QuestionMapper:
+    """Links the questions of an old bank version to a new one
+    
+    Questions whose content keys match are linked directly. The rest are
+    matched fuzzily on word shingles (runs of three words): each question
+    is reduced to its few rarest shingles across both versions, an
+    inverted index over those yields a handful of candidates per new
+    question, and the candidate with the highest shingle-set Jaccard
+    similarity above the threshold is linked. Links are assigned best
+    first, so each question is used once. Shingles indexing too many
+    questions to tell them apart are not looked up.
+    """
+    
+    def __init__(self, threshold: float = 0.7, rare_shingles: int = 8, candidates: int = 3,
+                 max_postings: int = 200):
+        self.threshold = threshold
+        self.rare_shingles = rare_shingles
+        self.candidates = candidates
+        self.max_postings = max_postings
+    
+    def map_keys(self, old_questions: Sequence[Mapping],
+                 new_questions: Sequence[Mapping]) -> Tuple[Dict[int, int], int]:
+        """Get old to new content keys of fuzzily linked questions, and the exact match count"""
+        old_words = [normalize_words(question) for question in old_questions]
+        new_words = [normalize_words(question) for question in new_questions]
+        old_keys = [words_key(words) for words in old_words]
+        new_keys = [words_key(words) for words in new_words]
+        
+        exact = set(old_keys) & set(new_keys)
+        old_rest = [i for i, key in enumerate(old_keys) if key not in exact]
+        new_rest = [i for i, key in enumerate(new_keys) if key not in exact]
+        links = self.match([self.shingles(old_words[i]) for i in old_rest],
+                           [self.shingles(new_words[i]) for i in new_rest])
+        key_map = {old_keys[old_rest[old]]: new_keys[new_rest[new]] for old, new in links.items()}
+        return key_map, len(exact)
+    
+    def shingles(self, words: List[str]) -> Set[Tuple[str, ...]]:
+        """Get the set of three-word runs of normalized words, or single words if too short"""
+        return set(zip(words, words[1:], words[2:])) or {(word,) for word in words}
+    
+    def match(self, old_docs: List[Set[Tuple[str, ...]]],
+              new_docs: List[Set[Tuple[str, ...]]]) -> Dict[int, int]:
+        """Get old position -> new position for shingle sets similar enough to link"""
+        frequency = Counter()
+        for shingles in old_docs:
+            frequency.update(shingles)
+        for shingles in new_docs:
+            frequency.update(shingles)
+        
+        def rarest(shingles: Set[Tuple[str, ...]]) -> List[Tuple[str, ...]]:
+            return sorted(shingles, key=lambda shingle: (frequency[shingle], shingle))[:self.rare_shingles]
+        
+        index: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        for position, shingles in enumerate(old_docs):
+            for shingle in rarest(shingles):
+                index[shingle].append(position)
+        
+        scored = []
+        for new_position, shingles in enumerate(new_docs):
+            shared = Counter()
+            for shingle in rarest(shingles):
+                postings = index.get(shingle, ())
+                if len(postings) <= self.max_postings:
+                    shared.update(postings)
+            for old_position, _ in shared.most_common(self.candidates):
+                old_shingles = old_docs[old_position]
+                similarity = len(shingles & old_shingles) / len(shingles | old_shingles)
+                if similarity >= self.threshold:
+                    scored.append((similarity, old_position, new_position))
+        
+        links: Dict[int, int] = {}
+        used = set()
+        for similarity, old_position, new_position in sorted(scored, reverse=True):
+            if old_position not in links and new_position not in used:
+                links[old_position] = new_position
+                used.add(new_position)
+        return links
@@ -0,0 +1,100 @@
+"""
+Question Number to Page Index
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+from core.question_tokenizer import QuestionTokenizer
+
+
+class QuestionIndex:
+    """Records which question headers appear on which pages
+    
+    Pages are scanned on demand. Dumps number their questions in page order,
+    so the pages of a question range are found by binary search, reading
+    only a handful of pages even when the index is still empty.
+    """
+    
+    VERSION = "1.0"
+    
+    def __init__(self, page_count: int, pages: Optional[Dict[int, List[int]]] = None):
+        self.page_count = page_count
+        self.pages: Dict[int, List[int]] = pages or {}
+        self.modified = False
+    
+    @property
+    def complete(self) -> bool:
+        return len(self.pages) == self.page_count
+    
+    def add_page(self, page_number: int, page_text: str) -> List[int]:
+        """Record the headers found in a page's text"""
+        headers = QuestionTokenizer.find_headers(page_text)
+        if self.pages.get(page_number) != headers:
+            self.pages[page_number] = headers
+            self.modified = True
+        return headers
+    
+    def get_page(self, question_number: int) -> Optional[int]:
+        """Get the page holding a question header, if that page was scanned"""
+        for page_number, headers in self.pages.items():
+            if question_number in headers:
+                return page_number
+        return None
+    
+    def find_page_range(self, start_question: int, end_question: int,
+                        read_page: Callable[[int], str]) -> Tuple[int, int]:
+        """Get the first and last page needed to parse a range of questions
+        
+        ``read_page`` returns the text of a page that has not been scanned.
+        The last page is the one where the next question starts, since the
+        end of the range can run onto it.
+        """
+        first_page = self._find_page(start_question, read_page)
+        last_page = self._find_page(end_question, read_page)
+        while last_page + 1 < self.page_count:
+            last_page += 1
+            if self._get_headers(last_page, read_page):
+                break
+        return first_page, last_page
+    
+    def _get_headers(self, page_number: int, read_page: Callable[[int], str]) -> List[int]:
+        """Get a page's headers, scanning it if needed"""
+        if page_number not in self.pages:
+            return self.add_page(page_number, read_page(page_number))
+        return self.pages[page_number]
+    
+    def _find_page(self, question_number: int, read_page: Callable[[int], str]) -> int:
+        """Get the last page whose first header is at most question_number"""
+        result = 0
+        low, high = 0, self.page_count - 1
+        while low <= high:
+            middle = (low + high) // 2
+            
+            # Pages without headers continue the previous question; probe past them
+            probe = middle
+            headers = self._get_headers(probe, read_page)
+            while not headers and probe < high:
+                probe += 1
+                headers = self._get_headers(probe, read_page)
+            
+            if not headers or headers[0] > question_number:
+                high = middle - 1
+            else:
+                result = probe
+                low = probe + 1
+        return result
+    
+    def to_dict(self) -> Dict:
+        """Get a JSON serializable form"""
+        return {
+            "version": self.VERSION,
+            "page_count": self.page_count,
+            "pages": {str(page_number): headers for page_number, headers in self.pages.items()}
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QuestionIndex":
+        """Build an index from its JSON form"""
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported question index version: {data.get('version')}")
+        pages = {int(page_number): headers for page_number, headers in data["pages"].items()}
+        return cls(data["page_count"], pages)
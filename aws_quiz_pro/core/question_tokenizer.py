@@ -0,0 +1,181 @@
+"""
+Line-Oriented Question Tokenizer
+"""
+
+import re
+from typing import Dict, Iterator, List, Optional
+
+
+class QuestionTokenizer:
+    """Single-pass state machine that splits dump text into question blocks
+    
+    Text is consumed line by line and every line is inspected once with
+    anchored checks, so running time is linear in the input no matter how
+    malformed it is. Blocks that cannot be completed are recorded in
+    ``errors`` instead of being skipped silently.
+    """
+    
+    HEADER_PREFIX = "Question #"
+    OPTION_LINE = re.compile(r"([A-Z])\. ")
+    ANSWER_LINE = re.compile(r"Correct Answer: ([A-Z]+)")
+    EXPLANATION_PREFIX = "Explanation:"
+    MOST_VOTED = "Most Voted"
+    
+    # States
+    IDLE, STEM, OPTIONS, ANSWERED, EXPLANATION, DONE = range(6)
+    
+    def __init__(self, errors: Optional[List[Dict]] = None):
+        self.errors: List[Dict] = [] if errors is None else errors
+        self._partial = ""
+        self._line_number = 0
+        self._reset_block()
+    
+    def tokenize(self, text: str) -> List[Dict]:
+        """Tokenize a complete text"""
+        blocks = list(self.feed(text))
+        blocks.extend(self.close())
+        return blocks
+    
+    def feed(self, text: str) -> Iterator[Dict]:
+        """Consume a chunk of text and yield blocks completed by it
+        
+        Chunks are treated as a continuous stream; the last line of a chunk
+        is held back until the next chunk (or close) finishes it.
+        """
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            block = self._process_line(line)
+            if block:
+                yield block
+    
+    def close(self) -> Iterator[Dict]:
+        """Flush the final line and block"""
+        block = self._process_line(self._partial)
+        self._partial = ""
+        if block:
+            yield block
+        block = self._finish_block()
+        if block:
+            yield block
+    
+    def _reset_block(self) -> None:
+        """Clear state for the next block"""
+        self._state = self.IDLE
+        self._number = None
+        self._start_line = 0
+        self._stem: List[str] = []
+        self._options: List[List[str]] = []
+        self._answer = ""
+        self._explanation: List[str] = []
+        self._explanation_started = False
+    
+    def _process_line(self, line: str) -> Optional[Dict]:
+        """Advance the state machine by one line; return a finished block if any"""
+        self._line_number += 1
+        
+        number = self._match_header(line)
+        if number is not None:
+            block = self._finish_block()
+            self._state = self.STEM
+            self._number = number
+            self._start_line = self._line_number
+            return block
+        
+        state = self._state
+        if state == self.STEM:
+            option = self.OPTION_LINE.match(line)
+            if option and option.group(1) == "A":
+                self._options.append([line[option.end():]])
+                self._state = self.OPTIONS
+            else:
+                self._stem.append(line)
+        
+        elif state == self.OPTIONS:
+            option = self.OPTION_LINE.match(line)
+            if option and ord(option.group(1)) - ord("A") == len(self._options):
+                self._options.append([line[option.end():]])
+                return None
+            
+            answer = self.ANSWER_LINE.match(line)
+            if answer:
+                self._answer = answer.group(1)
+                self._state = self.ANSWERED
+            elif line != self.MOST_VOTED:
+                self._options[-1].append(line)
+        
+        elif state == self.ANSWERED:
+            if line.startswith(self.EXPLANATION_PREFIX):
+                explanation = line[len(self.EXPLANATION_PREFIX):]
+                self._explanation.append(explanation)
+                self._explanation_started = bool(explanation.strip())
+                self._state = self.EXPLANATION
+            else:
+                self._state = self.DONE
+        
+        elif state == self.EXPLANATION:
+            # A blank line ends the explanation once it has started
+            if line.strip():
+                self._explanation.append(line)
+                self._explanation_started = True
+            elif self._explanation_started:
+                self._state = self.DONE
+        
+        return None
+    
+    @classmethod
+    def _match_header(cls, line: str) -> Optional[int]:
+        """Get question number if the line ends with a question header"""
+        index = line.rfind(cls.HEADER_PREFIX)
+        if index < 0:
+            return None
+        number = line[index + len(cls.HEADER_PREFIX):]
+        return int(number) if number.isascii() and number.isdigit() else None
+    
+    @classmethod
+    def find_headers(cls, text: str) -> List[int]:
+        """Get the question numbers of all headers in a text, in order"""
+        if cls.HEADER_PREFIX not in text:
+            return []
+        numbers = (cls._match_header(line) for line in text.split("\n")
+                   if cls.HEADER_PREFIX in line)
+        return [number for number in numbers if number is not None]
+    
+    def _finish_block(self) -> Optional[Dict]:
+        """Build the current block, or record why it is malformed"""
+        state = self._state
+        if state == self.IDLE:
+            return None
+        
+        block = None
+        if state == self.STEM:
+            self._report("no answer options found")
+        elif state == self.OPTIONS:
+            self._report("missing 'Correct Answer:' line")
+        else:
+            options = ["\n".join(lines).replace(self.MOST_VOTED, "").strip()
+                       for lines in self._options]
+            correct_answers = [ord(letter) - ord("A") for letter in self._answer
+                               if ord(letter) - ord("A") < len(options)]
+            if len(correct_answers) < len(self._answer):
+                self._report(f"correct answer '{self._answer}' does not match the options")
+            
+            if correct_answers:
+                block = {
+                    "id": self._number,
+                    "question": "\n".join(self._stem).strip(),
+                    "options": options,
+                    "correct_answers": correct_answers,
+                    "explanation": "\n".join(self._explanation).strip()
+                }
+        
+        self._reset_block()
+        return block
+    
+    def _report(self, reason: str) -> None:
+        """Record a malformed block"""
+        self.errors.append({
+            "question_number": self._number,
+            "line": self._start_line,
+            "reason": reason
+        })
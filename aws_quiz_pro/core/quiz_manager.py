@@ -3,79 +3,219 @@ Quiz Manager - Handles quiz logic and state
 """
 
 import random
+import time
 from typing import List, Dict, Set, Optional
 from datetime import datetime
+import numpy as np
+from core.exam_blueprint import ExamBlueprint
+from core.exam_sampler import WeightedExamSampler
+from core.performance_store import PerformanceStore
+from core.question_bank import QuestionBank, QuestionView
+from core.quiz_session import QuizSession
+from core.review_scheduler import ReviewScheduler
+from core.session_journal import SessionJournal
 
 
 class QuizManager:
     """Manages quiz state and logic"""
     
-    def __init__(self):
-        self.all_questions = []
-        self.filtered_questions = []
+    def __init__(self, scheduler: Optional[ReviewScheduler] = None,
+                 blueprint: Optional[ExamBlueprint] = None,
+                 journal: Optional[SessionJournal] = None,
+                 store: Optional[PerformanceStore] = None):
+        self.scheduler = scheduler
+        self.journal = journal
+        self.store = store
+        self.exam_sampler = WeightedExamSampler()
+        self.blueprint = blueprint or ExamBlueprint()
+        self.exam_distribution: Optional[Dict[str, Dict]] = None
+        self.all_questions = QuestionBank()
+        self.filtered_questions = self.all_questions.copy()
         self.current_question_index = 0
-        self.score = 0
+        self.session = QuizSession()
+        self.answer_count = 0
         self.answer_submitted = False
         self.start_time = None
         self.question_start_time = None
-        self.question_times = []
-        self.wrong_answers = []
-        self.answered_questions = []
         self.exam_mode = False
+        self.spaced_review = False
         self.exam_time_remaining = 0
     
+    @property
+    def score(self) -> int:
+        return self.session.score
+    
+    @property
+    def answered_questions(self) -> List[Dict]:
+        return self.session.answers
+    
+    @property
+    def wrong_answers(self) -> List[Dict]:
+        return self.session.wrong_answers
+    
     def load_questions(self, questions: List[Dict]) -> None:
-        """Load questions into the manager"""
+        """Load questions into the manager, packing them into a QuestionBank
+        
+        Answer counters kept in the performance store replace those loaded.
+        Cache files mapped by the previous bank are released.
+        """
+        if not isinstance(questions, QuestionBank):
+            questions = QuestionBank(questions)
+        if self.store:
+            self.store.apply_to(questions)
+        if self.all_questions is not questions:
+            self.all_questions.close()
         self.all_questions = questions
         self.filtered_questions = questions.copy()
+        if self.scheduler:
+            self.scheduler.attach(questions)
+    
+    def add_questions(self, questions: List[Dict]) -> None:
+        """Append questions to the bank without disturbing a running quiz"""
+        start = len(self.all_questions)
+        self.all_questions.extend(questions)
+        if self.store:
+            self.store.apply_to(self.all_questions, start)
+        if self.scheduler:
+            self.scheduler.attach(self.all_questions)
     
     def start_quiz(self, exam_mode: bool, difficulty_filter: str, 
-                   question_order: str, exam_question_count: int = 65) -> bool:
-        """Start a new quiz"""
+                   question_order: str, exam_question_count: int = 65,
+                   filters: Optional[Dict] = None, spaced_review: bool = False,
+                   review_batch_size: int = 20, weighted_exam: bool = False) -> bool:
+        """Start a new quiz; ``filters`` takes the keyword arguments of QuestionBank.filter
+        
+        Spaced review asks the questions the scheduler has due, most overdue
+        first, followed by questions never answered. A weighted exam draws
+        its questions favoring those answered wrong, not seen for a while or
+        from weak topics; a plain exam follows the topic blueprint, and
+        ``exam_distribution`` reports the topic mix it achieved.
+        """
         if not self.all_questions:
             return False
         
         self.exam_mode = exam_mode
+        self.spaced_review = spaced_review
+        self.exam_distribution = None
         
         # Select questions
-        if exam_mode:
+        if spaced_review:
+            if not self.scheduler:
+                return False
+            batch = self.scheduler.next_batch(review_batch_size)
+            if not batch:
+                return False
+            self.filtered_questions = self.all_questions.select(batch)
+        elif exam_mode:
             if len(self.all_questions) < exam_question_count:
                 return False
-            self.filtered_questions = random.sample(self.all_questions, exam_question_count)
+            if weighted_exam:
+                last_answered = self.scheduler.last_answered if self.scheduler else None
+                self.filtered_questions = self.all_questions.select(
+                    self.exam_sampler.sample(self.all_questions, exam_question_count, last_answered)
+                )
+            else:
+                exams, self.exam_distribution = self.blueprint.sample_exams(
+                    self.all_questions, exam_question_count
+                )
+                self.filtered_questions = self.all_questions.select(exams[0].tolist())
         else:
-            self.apply_filters(difficulty_filter)
+            self.apply_filters(difficulty_filter, filters)
+            if not self.filtered_questions:
+                return False
         
-        # Apply ordering
-        self.apply_question_order(question_order)
+        # Apply ordering; review batches keep the scheduler's order
+        if not spaced_review:
+            self.apply_question_order(question_order)
         
         # Reset state
         self.current_question_index = 0
-        self.score = 0
+        self.session = QuizSession()
+        self.answer_count = 0
         self.answer_submitted = False
         self.start_time = datetime.now()
-        self.question_times = []
-        self.wrong_answers = []
-        self.answered_questions = []
+        
+        if self.journal:
+            keys = self.all_questions.keys
+            self.journal.start([keys[index] for index in self.filtered_questions.indexes], {
+                "session_id": self.session.session_id,
+                "exam_mode": exam_mode,
+                "spaced_review": spaced_review
+            })
         
         return True
     
-    def apply_filters(self, difficulty_filter: str) -> None:
-        """Apply difficulty filter"""
-        filtered = self.all_questions.copy()
+    def resume_session(self) -> bool:
+        """Restore an unfinished quiz from the journal by replaying its events
         
-        if difficulty_filter != "All":
-            filtered = [q for q in filtered if q["difficulty"] == difficulty_filter]
+        Fails when the loaded bank lacks any of the quiz's questions. Replayed
+        answers rebuild the session; the review schedule only applies those
+        it had not saved yet, and question counters are reloaded from the
+        store, which records each answer once. Time spent while the app was
+        down is not counted.
+        """
+        state = self.journal.replay() if self.journal else None
+        if not state:
+            return False
+        
+        start = state["start"]
+        positions = {}
+        for index, key in enumerate(self.all_questions.keys):
+            positions.setdefault(key, index)
+        try:
+            indexes = [positions[key] for key in start["keys"]]
+        except KeyError:
+            return False
+        
+        self.filtered_questions = self.all_questions.select(indexes)
+        self.exam_mode = start["exam_mode"]
+        self.spaced_review = start["spaced_review"]
+        self.exam_distribution = None
+        self.current_question_index = 0
+        self.session = QuizSession(start["session_id"])
+        self.answer_count = 0
         
-        self.filtered_questions = filtered
+        elapsed = 0.0
+        for event in state["events"]:
+            elapsed = event["at"]
+            self.current_question_index = event["index"]
+            if event["event"] == "answer":
+                self._record_answer(self.get_current_question(), set(event["answers"]),
+                                    event["time_taken"], start["time"] + elapsed, replay=True)
+        if self.store:
+            self.store.flush()
+            self.store.apply_to(self.all_questions)
+        
+        self.answer_submitted = False
+        self.start_time = datetime.fromtimestamp(time.time() - elapsed)
+        self.journal.reopen(elapsed)
+        return True
+    
+    def end_session(self) -> None:
+        """Drop the journal of a finished quiz"""
+        if self.journal:
+            self.journal.discard()
+    
+    def generate_exams(self, num_exams: int, exam_question_count: int = 65) -> np.ndarray:
+        """Get bank indexes of a batch of blueprint exams, one row per exam"""
+        exams, _ = self.blueprint.sample_exams(self.all_questions, exam_question_count, num_exams)
+        return exams
+    
+    def apply_filters(self, difficulty_filter: str, filters: Optional[Dict] = None) -> None:
+        """Apply difficulty filter combined with any other bank filters"""
+        filters = dict(filters or {})
+        if difficulty_filter != "All":
+            filters["difficulties"] = [difficulty_filter]
+        self.filtered_questions = self.all_questions.filter(**filters)
     
     def apply_question_order(self, order: str) -> None:
         """Apply question ordering"""
         if order == "Random":
-            random.shuffle(self.filtered_questions)
+            self.filtered_questions.shuffle()
         elif order == "Sequential (First to Last)":
-            self.filtered_questions.sort(key=lambda q: q.get("id", 0))
+            self.filtered_questions.sort_by_id()
         elif order == "Reverse (Last to First)":
-            self.filtered_questions.sort(key=lambda q: q.get("id", 0), reverse=True)
+            self.filtered_questions.sort_by_id(reverse=True)
     
     def get_current_question(self) -> Optional[Dict]:
         """Get current question"""
@@ -84,7 +224,7 @@ class QuizManager:
         return None
     
     def submit_answer(self, user_answers: Set[int]) -> Dict:
-        """Submit and check answer"""
+        """Submit and check answer; answering a question again revises its answer"""
         if self.answer_submitted:
             return None
         
@@ -92,46 +232,57 @@ class QuizManager:
         if not question_data:
             return None
         
-        correct_answers = set(question_data['correct_answers'])
-        is_correct = user_answers == correct_answers
-        
-        # Record timing
         question_time = (datetime.now() - self.question_start_time).total_seconds()
-        self.question_times.append(question_time)
-        
-        # Update statistics
-        question_data['times_answered'] += 1
-        if is_correct:
-            self.score += 1
-            question_data['times_correct'] += 1
-        
-        # Store answered question
-        answered_question = {
-            "question": question_data,
-            "user_answer": user_answers,
-            "is_correct": is_correct,
-            "question_number": self.current_question_index + 1,
-            "time_taken": question_time
-        }
-        self.answered_questions.append(answered_question)
-        
-        if not is_correct:
-            self.wrong_answers.append(answered_question)
+        answered_question, revised = self._record_answer(question_data, user_answers, question_time)
+        if self.journal:
+            self.journal.append("answer", index=self.current_question_index,
+                                answers=sorted(user_answers), time_taken=round(question_time, 3))
         
         self.answer_submitted = True
         
         return {
-            "is_correct": is_correct,
-            "correct_answers": correct_answers,
+            "is_correct": answered_question["is_correct"],
+            "correct_answers": set(question_data['correct_answers']),
+            "revised": revised,
             "explanation": question_data.get('explanation', ''),
             "time_taken": question_time
         }
     
+    def _record_answer(self, question_data: Dict, user_answers: Set[int], question_time: float,
+                       now: Optional[float] = None, replay: bool = False):
+        """Store or revise an answer; get its record and whether it was revised
+        
+        A replayed answer leaves question counters to the store and is
+        skipped by the review schedule if it was saved there already.
+        """
+        self.answer_count += 1
+        answer = (self.session.session_id, self.answer_count)
+        # This also updates score and, unless restored from the store, question counters
+        revised = self.session.get(question_data.index) is not None
+        answered_question = self.session.record(
+            question_data, user_answers, self.current_question_index + 1, question_time,
+            count=not (replay and self.store)
+        )
+        if self.scheduler and not revised and not (replay and self.scheduler.has_applied(*answer)):
+            self.scheduler.record(question_data.index, answered_question["is_correct"], now, answer)
+        if self.store:
+            # Cumulative, like the session record; the store overwrites rather than adds
+            self.store.record(self.session.session_id, self.all_questions.keys[question_data.index],
+                              sum(1 << option for option in user_answers), answered_question["is_correct"],
+                              answered_question["time_taken"], now)
+        return answered_question, revised
+    
+    def get_answer(self, question: QuestionView) -> Optional[Dict]:
+        """Get this session's answer record for a question, if answered"""
+        return self.session.get(question.index)
+    
     def next_question(self) -> bool:
         """Move to next question"""
         self.current_question_index += 1
         self.answer_submitted = False
         self.question_start_time = datetime.now()
+        if self.journal:
+            self.journal.append("move", index=self.current_question_index)
         return self.current_question_index < len(self.filtered_questions)
     
     def prev_question(self) -> bool:
@@ -139,6 +290,8 @@ class QuizManager:
         if self.current_question_index > 0:
             self.current_question_index -= 1
             self.answer_submitted = False
+            if self.journal:
+                self.journal.append("move", index=self.current_question_index)
             return True
         return False
     
@@ -147,14 +300,16 @@ class QuizManager:
         total_time = (datetime.now() - self.start_time).total_seconds()
         total_questions = len(self.filtered_questions)
         percentage = (self.score / total_questions) * 100 if total_questions > 0 else 0
+        answers = self.session.answers
         
         return {
             "score": self.score,
             "total": total_questions,
             "percentage": percentage,
             "total_time": total_time,
-            "avg_time": sum(self.question_times) / len(self.question_times) if self.question_times else 0,
-            "wrong_count": len(self.wrong_answers),
+            # Revised answers count once, with the time of every attempt
+            "avg_time": sum(answer["time_taken"] for answer in answers) / len(answers) if answers else 0,
+            "wrong_count": self.session.wrong_count,
             "is_exam": self.exam_mode
         }
     
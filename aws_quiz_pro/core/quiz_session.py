@@ -0,0 +1,86 @@
+"""
+Quiz Session Answers
+"""
+
+import time
+from typing import Dict, List, Optional, Set
+from core.question_bank import QuestionView
+
+
+class QuizSession:
+    """Answers given during one quiz, keyed by the question's bank index
+    
+    Question ids are not unique in a bank (dumps may restart their
+    numbering, and flagged near-duplicates keep both copies), so answers
+    are keyed by position in the bank instead. Each question has at most
+    one answer record. Submitting again for the
+    same question revises the record and moves the score and the
+    question's ``times_correct`` counter accordingly, while
+    ``times_answered`` counts the question once per session. Records keep
+    the order in which questions were first answered.
+    """
+    
+    def __init__(self, session_id: Optional[int] = None):
+        # Start time in milliseconds unless given, e.g. when a journaled quiz resumes
+        self.session_id = int(time.time() * 1000) if session_id is None else session_id
+        self._answers: Dict[int, Dict] = {}
+        self.score = 0
+        self.wrong_count = 0
+    
+    def __len__(self) -> int:
+        return len(self._answers)
+    
+    def get(self, index: int) -> Optional[Dict]:
+        """Get the answer record of the question at a bank index, if answered"""
+        return self._answers.get(index)
+    
+    def record(self, question: QuestionView, user_answers: Set[int],
+               question_number: int, time_taken: float, count: bool = True) -> Dict:
+        """Record or revise the answer to a question and get its record
+        
+        With ``count`` off the question's counters are left alone, e.g. when
+        replaying answers whose counters were already saved.
+        """
+        is_correct = user_answers == set(question['correct_answers'])
+        answer = self._answers.get(question.index)
+        
+        if answer is None:
+            if count:
+                question['times_answered'] += 1
+            answer = {
+                "question": question,
+                "user_answer": user_answers,
+                "is_correct": is_correct,
+                "question_number": question_number,
+                "time_taken": time_taken
+            }
+            self._answers[question.index] = answer
+        else:
+            # Undo the previous outcome before applying the revised one
+            if answer["is_correct"]:
+                self.score -= 1
+                if count:
+                    question['times_correct'] -= 1
+            else:
+                self.wrong_count -= 1
+            answer["user_answer"] = user_answers
+            answer["is_correct"] = is_correct
+            answer["time_taken"] += time_taken
+        
+        if is_correct:
+            self.score += 1
+            if count:
+                question['times_correct'] += 1
+        else:
+            self.wrong_count += 1
+        return answer
+    
+    @property
+    def answers(self) -> List[Dict]:
+        """Get answer records in the order questions were first answered"""
+        return list(self._answers.values())
+    
+    @property
+    def wrong_answers(self) -> List[Dict]:
+        """Get wrong answer records in the order questions were first answered"""
+        return [answer for answer in self._answers.values() if not answer["is_correct"]]
@@ -0,0 +1,211 @@
+"""
+Spaced Repetition Scheduling
+"""
+
+import heapq
+import json
+import os
+import time
+from array import array
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+from core.cache_manager import atomic_write
+from core.question_bank import QuestionBank
+
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+class ReviewScheduler:
+    """SM-2 review schedule over a question bank with a heap of due questions
+    
+    Each question's ease factor, interval, repetition count and due time are
+    stored by content key, so schedules survive reloads and merged dumps.
+    Scheduled questions sit in a min-heap by due time. Answering pushes the
+    new due time and leaves the old entry to be skipped when popped, so
+    picking a batch of k questions costs O(k log n). Questions never
+    answered follow the due ones in bank order. The time each question was
+    last answered is kept in an array aligned with the bank. The schedule
+    is saved every ``save_every`` answers, so a crash loses at most that many.
+    The last quiz answer applied is saved with it, so replaying a quiz
+    journal after a crash skips the answers the schedule already holds.
+    """
+    
+    VERSION = "1.0"
+    DEFAULT_EASE = 2.5
+    MIN_EASE = 1.3
+    # SM-2 answer quality on its 0-5 scale
+    CORRECT_QUALITY = 4
+    WRONG_QUALITY = 1
+    
+    def __init__(self, review_file: str, save_every: int = 5):
+        self.review_file = review_file
+        self.save_every = save_every
+        # Last quiz answer applied, as (session id, answer number in the quiz)
+        self.applied: Tuple[int, int] = (0, 0)
+        # Content key -> [ease, interval days, repetitions, due timestamp]
+        self.schedule: Dict[int, List] = self.load()
+        self.modified = False
+        self._unsaved = 0
+        
+        self.bank: Optional[QuestionBank] = None
+        self._indexed = 0
+        self._heap: List[Tuple[float, int]] = []
+        self._new: Deque[int] = deque()
+        self._pending: Set[int] = set()
+        # Bank index -> timestamp of the last answer, 0 if never answered
+        self.last_answered = array('d')
+    
+    def load(self) -> Dict[int, List]:
+        """Load review schedule from file"""
+        try:
+            if os.path.exists(self.review_file):
+                with open(self.review_file, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == self.VERSION:
+                    self.applied = tuple(data.get("applied", self.applied))
+                    return {int(key, 16): entry for key, entry in data["questions"].items()}
+        except Exception as e:
+            print(f"Error loading review schedule: {e}")
+        return {}
+    
+    def save(self) -> bool:
+        """Save review schedule to file if it changed"""
+        if not self.modified:
+            return True
+        
+        data = {
+            "version": self.VERSION,
+            "applied": list(self.applied),
+            "questions": {f"{key:016x}": entry for key, entry in self.schedule.items()}
+        }
+        
+        def write(review_file):
+            with open(review_file, 'w') as f:
+                json.dump(data, f)
+        
+        try:
+            atomic_write(self.review_file, write)
+            self.modified = False
+            self._unsaved = 0
+            return True
+        except Exception as e:
+            print(f"Error saving review schedule: {e}")
+            return False
+    
+    def attach(self, bank: QuestionBank) -> None:
+        """Queue the questions of a bank; questions appended since the last call are added"""
+        if bank is not self.bank:
+            self.bank = bank
+            self._indexed = 0
+            self._heap = []
+            self._new = deque()
+            self._pending = set()
+            self.last_answered = array('d')
+        
+        start = self._indexed
+        scheduled = []
+        for index in range(start, len(bank)):
+            entry = self.schedule.get(bank.keys[index])
+            if entry is None:
+                self._new.append(index)
+                self.last_answered.append(0.0)
+            else:
+                scheduled.append((entry[3], index))
+                self.last_answered.append(entry[3] - entry[1] * DAY_SECONDS)
+        self._indexed = len(bank)
+        
+        if start == 0:
+            self._heap = scheduled
+            heapq.heapify(self._heap)
+        else:
+            for item in scheduled:
+                heapq.heappush(self._heap, item)
+    
+    def remap(self, key_map: Dict[int, int]) -> int:
+        """Move schedules from old to new content keys; get how many moved
+        
+        A question that already has a schedule under its new key keeps it.
+        Call before attaching a bank.
+        """
+        moved = 0
+        for old_key, new_key in key_map.items():
+            entry = self.schedule.pop(old_key, None)
+            if entry is not None and new_key not in self.schedule:
+                self.schedule[new_key] = entry
+                moved += 1
+        if key_map:
+            self.modified = True
+        return moved
+    
+    def next_batch(self, count: int, now: Optional[float] = None) -> List[int]:
+        """Get indexes of up to count questions: due ones first, most overdue first, then new ones"""
+        if self.bank is None:
+            return []
+        now = time.time() if now is None else now
+        self._requeue_pending()
+        
+        keys = self.bank.keys
+        batch = []
+        while self._heap and len(batch) < count and self._heap[0][0] <= now:
+            due, index = heapq.heappop(self._heap)
+            entry = self.schedule.get(keys[index])
+            # Entries superseded by a later answer are dropped here
+            if entry is not None and entry[3] == due:
+                batch.append(index)
+        
+        while self._new and len(batch) < count:
+            index = self._new.popleft()
+            if keys[index] not in self.schedule:
+                batch.append(index)
+        
+        self._pending = set(batch)
+        return batch
+    
+    def has_applied(self, session_id: int, answer_number: int) -> bool:
+        """Check whether a quiz answer is already in the schedule"""
+        return self.applied[0] == session_id and answer_number <= self.applied[1]
+    
+    def record(self, index: int, is_correct: bool, now: Optional[float] = None,
+               answer: Optional[Tuple[int, int]] = None) -> None:
+        """Update a question's schedule after an answer
+        
+        ``answer`` is the (session id, answer number) of a quiz answer,
+        remembered as the last one applied.
+        """
+        now = time.time() if now is None else now
+        key = self.bank.keys[index]
+        ease, interval, repetitions, _ = self.schedule.get(key, [self.DEFAULT_EASE, 0, 0, 0])
+        
+        quality = self.CORRECT_QUALITY if is_correct else self.WRONG_QUALITY
+        if quality >= 3:
+            repetitions += 1
+            interval = 1 if repetitions == 1 else 6 if repetitions == 2 else round(interval * ease)
+        else:
+            repetitions = 0
+            interval = 1
+        ease = max(self.MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        
+        due = now + interval * DAY_SECONDS
+        self.schedule[key] = [round(ease, 3), interval, repetitions, due]
+        heapq.heappush(self._heap, (due, index))
+        self.last_answered[index] = now
+        self._pending.discard(index)
+        if answer is not None:
+            self.applied = answer
+        self.modified = True
+        
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+    
+    def _requeue_pending(self) -> None:
+        """Put questions handed out but not answered back in their queues"""
+        keys = self.bank.keys
+        for index in sorted(self._pending, reverse=True):
+            entry = self.schedule.get(keys[index])
+            if entry is None:
+                self._new.appendleft(index)
+            else:
+                heapq.heappush(self._heap, (entry[3], index))
+        self._pending = set()
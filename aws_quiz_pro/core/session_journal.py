@@ -0,0 +1,122 @@
+"""
+Quiz Session Journal - Crash-Safe Progress
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+
+class SessionJournal:
+    """Append-only log of the running quiz, replayed after a crash
+    
+    A quiz writes one start record holding the content keys of its
+    questions in order, then one short JSON line per answer and per move
+    between questions, stamped with seconds since the quiz started. Each
+    line is flushed to the OS right away, so it survives the app crashing;
+    fsync, which also covers a system crash, runs once every few records.
+    A finished quiz deletes the journal. A partly written last line, left
+    by a crash mid-write, is ignored on replay.
+    """
+    
+    def __init__(self, journal_file: str, sync_every: int = 8):
+        self.journal_file = journal_file
+        self.sync_every = sync_every
+        self.started = 0.0
+        self._file = None
+        self._unsynced = 0
+        # Bytes of whole records found by the last replay
+        self._replayed_size = 0
+    
+    def start(self, keys: List[int], info: Dict) -> None:
+        """Begin a new journal for a quiz over the questions with these keys"""
+        self.close()
+        self.started = time.time()
+        try:
+            self._file = open(self.journal_file, 'w', encoding='utf-8')
+            self._write({"event": "start", "time": self.started, "keys": keys, **info})
+            self.sync()
+        except Exception as e:
+            print(f"Error starting session journal: {e}")
+            self._file = None
+    
+    def reopen(self, elapsed: float) -> None:
+        """Continue a replayed journal; time spent while the app was down is not counted"""
+        self.close()
+        self.started = time.time() - elapsed
+        try:
+            self._file = open(self.journal_file, 'a', encoding='utf-8')
+            # Drop a torn last line so new records start on a line of their own
+            self._file.truncate(self._replayed_size)
+        except Exception as e:
+            print(f"Error reopening session journal: {e}")
+            self._file = None
+    
+    def append(self, event: str, **fields) -> None:
+        """Append one event record"""
+        if self._file is None:
+            return
+        try:
+            self._write({"event": event, "at": round(time.time() - self.started, 3), **fields})
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every:
+                self.sync()
+        except Exception as e:
+            print(f"Error writing session journal: {e}")
+    
+    def _write(self, record: Dict) -> None:
+        """Write and flush one record line"""
+        self._file.write(json.dumps(record, separators=(',', ':')) + "\n")
+        self._file.flush()
+    
+    def sync(self) -> None:
+        """Force journaled records to disk"""
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+    
+    def close(self) -> None:
+        """Sync and close the journal file, keeping it on disk"""
+        if self._file is not None:
+            try:
+                self.sync()
+                self._file.close()
+            except Exception as e:
+                print(f"Error closing session journal: {e}")
+            self._file = None
+    
+    def discard(self) -> None:
+        """Close and delete the journal once its quiz is over"""
+        self.close()
+        try:
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+        except Exception as e:
+            print(f"Error removing session journal: {e}")
+    
+    def replay(self) -> Optional[Dict]:
+        """Get the start record and later events of an unfinished quiz, if any"""
+        try:
+            if not os.path.exists(self.journal_file):
+                return None
+            with open(self.journal_file, 'rb') as f:
+                lines = f.read().splitlines(keepends=True)
+        except Exception as e:
+            print(f"Error reading session journal: {e}")
+            return None
+        
+        records = []
+        self._replayed_size = 0
+        for line in lines:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("unterminated record")
+                records.append(json.loads(line))
+            except ValueError:
+                # Only the last line can be torn; nothing valid follows it
+                break
+            self._replayed_size += len(line)
+        if not records or records[0].get("event") != "start":
+            return None
+        return {"start": records[0], "events": records[1:]}
@@ -2,14 +2,32 @@
 Statistics Management
 """
 
+import copy
 import json
 import os
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional
 from datetime import datetime
+from core.cache_manager import atomic_write
+from core.question_identity import content_key
 
 
 class StatisticsManager:
-    """Manages quiz statistics"""
+    """Manages quiz statistics as an append-only event log with snapshots
+    
+    Each finished quiz is one line appended to an event log, holding the
+    quiz record and its answers, so recording costs the same however long
+    the history is. Totals, best score and per-topic and per-difficulty
+    performance are kept up to date in memory. Every COMPACT_EVENTS quizzes
+    the log is compacted: its quiz records and answers are appended to
+    history and answer archives, which are never rewritten, the aggregates
+    are saved as a small snapshot, and the log is emptied. Events carry
+    sequence numbers, so a crash part-way through compaction never counts
+    a quiz twice, and each archive is topped up with whatever it is missing
+    on the next compaction.
+    """
+    
+    VERSION = 2
+    COMPACT_EVENTS = 50
     
     DEFAULT_STATS = {
         "total_quizzes": 0,
@@ -23,48 +41,93 @@ class StatisticsManager:
         "difficulty_performance": {}
     }
     
+    # Aggregates kept in the snapshot; histories live in the archives
+    SNAPSHOT_KEYS = ["total_quizzes", "total_questions", "correct_answers", "average_score",
+                     "best_score", "topic_performance", "difficulty_performance"]
+    
     def __init__(self, stats_file: str):
         self.stats_file = stats_file
+        root = os.path.splitext(stats_file)[0]
+        self.log_file = f"{root}_events.jsonl"
+        self.history_file = f"{root}_history.jsonl"
+        self.answers_file = f"{root}_answers.jsonl"
+        # Last event recorded, last folded into the snapshot, last in the
+        # history archive and last in the answer archive
+        self.seq = 0
+        self.snapshot_seq = 0
+        self.archived_seq = 0
+        self.answers_seq = 0
+        self.logged_events = 0
+        # Bumped when the history is reset, as sequence numbers keep counting
+        self.generation = 0
         self.stats = self.load()
     
     def load(self) -> Dict:
-        """Load statistics from file"""
+        """Load the snapshot, then the archived history, then replay the event log"""
+        stats = copy.deepcopy(self.DEFAULT_STATS)
         try:
             if os.path.exists(self.stats_file):
                 with open(self.stats_file, 'r') as f:
-                    return {**self.DEFAULT_STATS, **json.load(f)}
-            else:
-                return self.DEFAULT_STATS.copy()
+                    data = json.load(f)
+                if data.get("version") == self.VERSION:
+                    stats.update({key: data[key] for key in self.SNAPSHOT_KEYS if key in data})
+                    self.snapshot_seq = data.get("seq", 0)
+                else:
+                    self._migrate(data, stats)
+            
+            self.seq = self.snapshot_seq
+            for record in self._read_log(self.history_file):
+                if record["seq"] > self.archived_seq:
+                    self.archived_seq = record["seq"]
+                    self._add_history(stats, record)
+            self.seq = max(self.seq, self.archived_seq)
+            self.answers_seq = self._get_last_seq(self.answers_file)
+            
+            for event in self._read_log(self.log_file):
+                self.logged_events += 1
+                if event["seq"] > self.snapshot_seq:
+                    self._apply_totals(stats, event["record"], event["answers"])
+                if event["seq"] > self.archived_seq:
+                    self._add_history(stats, event["record"])
+                self.seq = max(self.seq, event["seq"])
         except Exception as e:
             print(f"Error loading statistics: {e}")
-            return self.DEFAULT_STATS.copy()
+        return stats
+    
+    def _migrate(self, data: Dict, stats: Dict) -> None:
+        """Convert statistics saved as one JSON file to a snapshot and history archive"""
+        stats.update({key: data[key] for key in self.SNAPSHOT_KEYS if key in data})
+        history = sorted(data.get("quiz_history", []) + data.get("exam_history", []),
+                         key=lambda record: record["date"])
+        records = [{"seq": seq, **record} for seq, record in enumerate(history, 1)]
+        self._append_lines(self.history_file, records)
+        self.seq = len(records)
+        self._write_snapshot(stats)
     
     def save(self) -> bool:
-        """Save statistics to file"""
+        """Save a snapshot of the aggregates"""
         try:
-            with open(self.stats_file, 'w') as f:
-                json.dump(self.stats, f, indent=2)
+            self._write_snapshot(self.stats)
             return True
         except Exception as e:
             print(f"Error saving statistics: {e}")
             return False
     
-    def record_quiz(self, results: Dict, question_order: str) -> None:
-        """Record quiz results"""
-        self.stats["total_quizzes"] += 1
-        self.stats["total_questions"] += results["total"]
-        self.stats["correct_answers"] += results["score"]
+    def _write_snapshot(self, stats: Dict) -> None:
+        """Write the aggregates as of the last recorded event"""
+        data = {"version": self.VERSION, "seq": self.seq,
+                **{key: stats[key] for key in self.SNAPSHOT_KEYS}}
         
-        # Calculate averages
-        if self.stats["total_questions"] > 0:
-            self.stats["average_score"] = (
-                self.stats["correct_answers"] / self.stats["total_questions"]
-            ) * 100
-        
-        # Update best score
-        if results["percentage"] > self.stats.get("best_score", 0):
-            self.stats["best_score"] = results["percentage"]
+        def write(stats_file):
+            with open(stats_file, 'w') as f:
+                json.dump(data, f, indent=2)
         
+        atomic_write(self.stats_file, write)
+        self.snapshot_seq = self.seq
+    
+    def record_quiz(self, results: Dict, question_order: str,
+                    answers: Optional[List[Dict]] = None) -> None:
+        """Record quiz results and the answers given, as one appended event"""
         # Create quiz record
         passing_score = 70 if results["is_exam"] else 80
         quiz_record = {
@@ -79,19 +142,144 @@ class StatisticsManager:
             "question_order": question_order
         }
         
-        # Add to appropriate history
-        if results["is_exam"]:
-            if "exam_history" not in self.stats:
-                self.stats["exam_history"] = []
-            self.stats["exam_history"].append(quiz_record)
-            self.stats["exam_history"] = self.stats["exam_history"][-20:]
-        else:
-            if "quiz_history" not in self.stats:
-                self.stats["quiz_history"] = []
-            self.stats["quiz_history"].append(quiz_record)
-            self.stats["quiz_history"] = self.stats["quiz_history"][-50:]
+        # Answers are stored column-wise to keep the line short
+        answers = answers or []
+        questions = [answer["question"] for answer in answers]
+        answer_columns = {
+            "key": [content_key(question) for question in questions],
+            "id": [question.get("id", 0) for question in questions],
+            "topic": [question.get("topic", "General") for question in questions],
+            "difficulty": [question.get("difficulty", "Medium") for question in questions],
+            "correct": [int(answer["is_correct"]) for answer in answers],
+            "time": [round(answer["time_taken"], 3) for answer in answers]
+        }
+        
+        self.seq += 1
+        event = {"seq": self.seq, "record": quiz_record, "answers": answer_columns}
+        try:
+            self._append_lines(self.log_file, [event])
+            self.logged_events += 1
+        except Exception as e:
+            print(f"Error saving statistics: {e}")
         
-        self.save()
+        self._apply_totals(self.stats, quiz_record, answer_columns)
+        self._add_history(self.stats, {"seq": self.seq, **quiz_record})
+        
+        if self.logged_events >= self.COMPACT_EVENTS:
+            self.compact()
+    
+    def _apply_totals(self, stats: Dict, record: Dict, answers: Dict) -> None:
+        """Fold one quiz into the aggregates"""
+        stats["total_quizzes"] += 1
+        stats["total_questions"] += record["total"]
+        stats["correct_answers"] += record["score"]
+        
+        # Calculate averages
+        if stats["total_questions"] > 0:
+            stats["average_score"] = (stats["correct_answers"] / stats["total_questions"]) * 100
+        
+        # Update best score
+        if record["percentage"] > stats.get("best_score", 0):
+            stats["best_score"] = record["percentage"]
+        
+        for name, performance in (("topic", stats["topic_performance"]),
+                                  ("difficulty", stats["difficulty_performance"])):
+            for value, correct in zip(answers[name], answers["correct"]):
+                entry = performance.setdefault(value, {"answered": 0, "correct": 0})
+                entry["answered"] += 1
+                entry["correct"] += correct
+    
+    def _add_history(self, stats: Dict, record: Dict) -> None:
+        """Add a quiz record to the exam or practice history"""
+        stats["exam_history" if record["is_exam"] else "quiz_history"].append(record)
+    
+    def compact(self) -> bool:
+        """Move logged events to the archives, save a snapshot and empty the log"""
+        try:
+            events = list(self._read_log(self.log_file, min(self.archived_seq, self.answers_seq)))
+            self._append_lines(self.history_file,
+                               [{"seq": event["seq"], **event["record"]}
+                                for event in events if event["seq"] > self.archived_seq])
+            self._append_lines(self.answers_file,
+                               [{"seq": event["seq"], "date": event["record"]["date"], **event["answers"]}
+                                for event in events if event["seq"] > self.answers_seq])
+            if events:
+                self.archived_seq = max(self.archived_seq, events[-1]["seq"])
+                self.answers_seq = max(self.answers_seq, events[-1]["seq"])
+            
+            self._write_snapshot(self.stats)
+            open(self.log_file, 'w').close()
+            self.logged_events = 0
+            return True
+        except Exception as e:
+            print(f"Error compacting statistics: {e}")
+            return False
+    
+    def iter_answers(self, after_seq: int = 0) -> Iterator[Dict]:
+        """Iterate over the answers of quizzes recorded after after_seq, oldest first
+        
+        Yields one dict per quiz with its seq, date and answer columns
+        (key, id, topic, difficulty, correct, time).
+        """
+        last = after_seq
+        for entry in self._read_log(self.answers_file, after_seq):
+            if entry["seq"] > last:
+                last = entry["seq"]
+                yield entry
+        for event in self._read_log(self.log_file, last):
+            if event["seq"] > last:
+                yield {"seq": event["seq"], "date": event["record"]["date"], **event["answers"]}
+    
+    def _read_log(self, log_file: str, after_seq: int = 0) -> Iterator[Dict]:
+        """Iterate over the records of a JSON lines file, stopping at a torn last line
+        
+        Records up to after_seq are skipped by reading the leading seq field
+        alone, without parsing the rest of the line.
+        """
+        if not os.path.exists(log_file):
+            return
+        with open(log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                if after_seq and line.startswith('{"seq":'):
+                    seq = line[7:line.find(",")]
+                    if seq.isdigit() and int(seq) <= after_seq:
+                        continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    break
+    
+    def _get_last_seq(self, log_file: str) -> int:
+        """Get the seq of the last complete record, reading only the end of the file"""
+        try:
+            with open(log_file, 'rb') as f:
+                position = f.seek(0, os.SEEK_END)
+                tail = b""
+                while position > 0:
+                    step = min(position, 64 * 1024)
+                    position -= step
+                    f.seek(position)
+                    tail = f.read(step) + tail
+                    # A torn last line has no newline yet and is ignored
+                    complete = tail[:tail.rfind(b"\n") + 1]
+                    start = complete.rfind(b"\n", 0, len(complete) - 1)
+                    if complete and (start >= 0 or position == 0):
+                        return json.loads(complete[start + 1:])["seq"]
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(log_file):
+                print(f"Error reading statistics archive: {e}")
+        return 0
+    
+    def _append_lines(self, log_file: str, records: List[Dict]) -> None:
+        """Append records to a JSON lines file and force them to disk"""
+        if not records:
+            return
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write("".join(json.dumps(record, separators=(',', ':')) + "\n" for record in records))
+            f.flush()
+            os.fsync(f.fileno())
     
     def get_summary(self) -> Dict:
         """Get statistics summary"""
@@ -110,5 +298,14 @@ class StatisticsManager:
     
     def reset(self) -> None:
         """Reset all statistics"""
-        self.stats = self.DEFAULT_STATS.copy()
-        self.save()
\ No newline at end of file
+        for log_file in (self.log_file, self.history_file, self.answers_file):
+            try:
+                if os.path.exists(log_file):
+                    os.remove(log_file)
+            except Exception as e:
+                print(f"Error resetting statistics: {e}")
+        self.stats = copy.deepcopy(self.DEFAULT_STATS)
+        self.archived_seq = self.answers_seq = self.seq
+        self.logged_events = 0
+        self.generation += 1
+        self.save()
@@ -0,0 +1,214 @@
+"""
+PDF Page Text Extraction
+"""
+
+import os
+import math
+import hashlib
+import re
+import threading
+from collections import deque
+from itertools import chain, islice
+import fitz  # PyMuPDF
+from typing import Dict, List, Iterable, Iterator, Tuple, Optional, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config.constants import (
+    PDF_SERIAL_PAGE_THRESHOLD, PDF_MIN_PAGES_PER_CHUNK, PDF_MAX_PAGES_PER_CHUNK
+)
+
+
+# Indirect references inside a PDF object's source; Parent links lead back up the page tree
+OBJECT_REFERENCE = re.compile(r"(\d+) 0 R")
+PARENT_REFERENCE = re.compile(r"/Parent\s*\d+ 0 R")
+
+
+def _extract_pages(pdf_filename: str, page_numbers: Sequence[int]) -> List[str]:
+    """Extract text for a chunk of pages using a worker-local document handle"""
+    doc = fitz.open(pdf_filename)
+    try:
+        return [doc[page_number].get_text() for page_number in page_numbers]
+    finally:
+        doc.close()
+
+
+class PageTextExtractor:
+    """Extracts page text serially for small files and in a process pool for large ones
+    
+    The pool is started on first use and shared by every extraction, so
+    several PDFs parsed at once never run more than ``max_workers``
+    processes between them.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None,
+                 serial_threshold: int = PDF_SERIAL_PAGE_THRESHOLD):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.serial_threshold = serial_threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """Stop the worker processes, if started"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the shared process pool, starting it if needed"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+    
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken pool so the next extraction starts a fresh one"""
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    def get_page_count(self, pdf_filename: str) -> int:
+        """Get number of pages in a PDF"""
+        doc = fitz.open(pdf_filename)
+        try:
+            return doc.page_count
+        finally:
+            doc.close()
+    
+    def get_page_fingerprints(self, pdf_filename: str,
+                              page_numbers: Optional[Sequence[int]] = None) -> List[str]:
+        """Get a fingerprint per page, following ``page_numbers`` if given, else every page"""
+        return [fingerprint for _, fingerprint in
+                self.iter_page_fingerprints(pdf_filename, page_numbers)]
+    
+    def iter_page_fingerprints(self, pdf_filename: str,
+                               page_numbers: Optional[Iterable[int]] = None
+                               ) -> Iterator[Tuple[int, str]]:
+        """Yield (page_number, fingerprint) from each page's raw content and resources
+        
+        Reading content streams is much cheaper than text extraction, so this
+        is used to find which pages changed between versions of a document.
+        A page's content stream may only name the fonts and XObjects it
+        draws, so the objects reachable from those resources are hashed in
+        too; each object is hashed once per document.
+        """
+        doc = fitz.open(pdf_filename)
+        try:
+            if page_numbers is None:
+                page_numbers = range(doc.page_count)
+            objects: Dict[int, Tuple[bytes, List[int]]] = {}
+            for page_number in page_numbers:
+                page = doc[page_number]
+                digest = hashlib.blake2b(digest_size=16)
+                digest.update(f"{page.rect}|{page.rotation}|".encode())
+                digest.update(page.read_contents())
+                for xref in self._get_resource_xrefs(doc, page, objects):
+                    digest.update(objects[xref][0])
+                yield page_number, digest.hexdigest()
+        finally:
+            doc.close()
+    
+    def _get_resource_xrefs(self, doc, page, objects: Dict[int, Tuple[bytes, List[int]]]) -> List[int]:
+        """Get the sorted xrefs of every object reachable from a page's fonts and XObjects"""
+        pending = [item[0] for item in page.get_fonts(full=True)]
+        pending.extend(item[0] for item in page.get_xobjects())
+        pending.extend(item[0] for item in page.get_images(full=True))
+        reachable = set()
+        while pending:
+            xref = pending.pop()
+            if xref <= 0 or xref in reachable:
+                continue
+            reachable.add(xref)
+            if xref not in objects:
+                source = doc.xref_object(xref, compressed=True)
+                digest = hashlib.blake2b(source.encode(), digest_size=16)
+                if doc.xref_is_stream(xref):
+                    digest.update(doc.xref_stream_raw(xref) or b"")
+                references = [int(ref) for ref in OBJECT_REFERENCE.findall(PARENT_REFERENCE.sub("", source))]
+                objects[xref] = (digest.digest(), references)
+            pending.extend(objects[xref][1])
+        return sorted(reachable)
+    
+    def get_worker_count(self, page_count: int) -> int:
+        """Get number of worker processes for a document of the given size"""
+        if page_count < self.serial_threshold:
+            return 1
+        return max(1, min(self.max_workers, page_count // PDF_MIN_PAGES_PER_CHUNK))
+    
+    def iter_page_texts(self, pdf_filename: str,
+                        page_numbers: Optional[Iterable[int]] = None,
+                        page_count: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Yield (page_number, text) in page order
+        
+        ``page_numbers`` may be a lazy iterator, pulled only as far as the
+        extraction work queued ahead needs; ``page_count`` is then an upper
+        bound on how many it yields, used to size the work.
+        """
+        if page_numbers is None:
+            page_numbers = range(self.get_page_count(pdf_filename))
+        if page_count is None:
+            page_numbers = list(page_numbers)
+            page_count = len(page_numbers)
+        page_numbers = iter(page_numbers)
+        
+        workers = self.get_worker_count(page_count)
+        if workers <= 1:
+            yield from self._iter_serial(pdf_filename, page_numbers)
+            return
+        
+        # Small chunks keep workers balanced and the first pages arriving early
+        chunk_size = math.ceil(page_count / (workers * 4))
+        chunk_size = max(PDF_MIN_PAGES_PER_CHUNK, min(PDF_MAX_PAGES_PER_CHUNK, chunk_size))
+        chunks = iter(lambda: list(islice(page_numbers, chunk_size)), [])
+        
+        in_flight = deque()
+        try:
+            for chunk, texts in self._iter_parallel(pdf_filename, chunks, workers, in_flight):
+                yield from zip(chunk, texts)
+        except (BrokenProcessPool, OSError) as e:
+            # Process pools can be unavailable (sandboxes, frozen apps); finish serially
+            print(f"Parallel extraction failed, continuing serially: {e}")
+            remaining = chain.from_iterable(chunk for chunk, _ in in_flight)
+            yield from self._iter_serial(pdf_filename, chain(remaining, page_numbers))
+    
+    def _iter_serial(self, pdf_filename: str, page_numbers: Iterable[int]) -> Iterator[Tuple[int, str]]:
+        """Yield page texts from a single document handle, opened at the first page"""
+        page_numbers = iter(page_numbers)
+        first_page = next(page_numbers, None)
+        if first_page is None:
+            return
+        doc = fitz.open(pdf_filename)
+        try:
+            for page_number in chain([first_page], page_numbers):
+                yield page_number, doc[page_number].get_text()
+        finally:
+            doc.close()
+    
+    def _iter_parallel(self, pdf_filename: str, chunks: Iterator[List[int]], workers: int,
+                       in_flight: deque) -> Iterator[Tuple[List[int], List[str]]]:
+        """Yield (chunk, texts) in order, keeping a bounded number of chunks in flight
+        
+        ``in_flight`` holds the (chunk, future) pairs submitted but not yet
+        yielded, so the caller can finish them another way if the pool breaks.
+        """
+        executor = self._get_executor()
+        try:
+            while True:
+                while len(in_flight) < workers * 2:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    in_flight.append((chunk, executor.submit(_extract_pages, pdf_filename, chunk)))
+                if not in_flight:
+                    return
+                texts = in_flight[0][1].result()
+                chunk, _ = in_flight.popleft()
+                yield chunk, texts
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            raise
+        finally:
+            # Also reached when the consumer stops early; drop queued work
+            for _, future in in_flight:
+                future.cancel()
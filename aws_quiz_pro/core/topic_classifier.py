@@ -0,0 +1,284 @@
+"""
+Keyword Topic Classification
+"""
+
+from collections import deque
+from itertools import compress, count
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from config.constants import TOPIC_KEYWORDS
+
+
+# Everything but ASCII letters and digits separates words
+WORD_SEPARATORS = "".join(ch for ch in map(chr, range(128)) if not ch.isalnum()) + "‘’“”–—•…\u00a0"
+SEPARATOR_TABLE = str.maketrans(WORD_SEPARATORS, " " * len(WORD_SEPARATORS))
+
+# Bytes that are part of a word once non-ASCII separators are translated away
+WORD_BYTES = np.ones(256, dtype=bool)
+WORD_BYTES[[ord(ch) for ch in WORD_SEPARATORS if ord(ch) < 128]] = False
+# str.split in score also breaks words on Unicode whitespace, all of which lies below U+3001
+BATCH_SEPARATORS = WORD_SEPARATORS + "".join(ch for ch in map(chr, range(128, 0x3001)) if ch.isspace())
+BATCH_SEPARATOR_TABLE = str.maketrans(BATCH_SEPARATORS, " " * len(BATCH_SEPARATORS))
+# Masks keeping the first n bytes of a little-endian 8-byte word chunk
+CHUNK_MASKS = np.array([(1 << (8 * n)) - 1 for n in range(9)], dtype=np.uint64)
+CHUNK_MIXER = np.uint64(0x100000001B3)
+
+
+class TopicClassifier:
+    """Scores every topic in one pass with an Aho-Corasick automaton over words
+    
+    Keywords are matched on whole words (multi-word keywords like "load
+    balancer" must appear as consecutive words), case-insensitively and
+    with simple plural forms. A keyword listed under several topics splits
+    its weight between them. The automaton is built once, so the cost per
+    question depends on its length rather than on the number of keywords.
+    Texts without the first word of any multi-word keyword skip the
+    automaton and are scored from their single-word keywords alone.
+    ``classify_many`` does the word pass for a whole batch in numpy.
+    """
+    
+    # Smaller batches are classified one text at a time; the numpy pass has a fixed cost
+    MIN_BATCH = 32
+    
+    def __init__(self, topic_keywords: Optional[Dict[str, List[str]]] = None,
+                 default_topic: str = "General"):
+        topic_keywords = TOPIC_KEYWORDS if topic_keywords is None else topic_keywords
+        self.topics = list(topic_keywords)
+        self.default_topic = default_topic
+        
+        # Keyword -> topic indexes, keyed by its word sequence
+        keyword_topics: Dict[Tuple[str, ...], List[int]] = {}
+        for topic_index, keywords in enumerate(topic_keywords.values()):
+            for keyword in keywords:
+                words = tuple(keyword.lower().translate(SEPARATOR_TABLE).split())
+                if words and topic_index not in keyword_topics.setdefault(words, []):
+                    keyword_topics[words].append(topic_index)
+        
+        # Map words and their plurals to ids so text words resolve with one lookup
+        # Ids start at 1 so they are always truthy, unlike None for unknown words
+        self.word_ids: Dict[str, int] = {}
+        word_count = 0
+        for words in keyword_topics:
+            for word in words:
+                if word not in self.word_ids:
+                    word_count += 1
+                    word_id = word_count
+                    self.word_ids[word] = word_id
+                    for plural in self._plurals(word):
+                        self.word_ids.setdefault(plural, word_id)
+        
+        self._build_automaton(keyword_topics)
+        self._build_word_table()
+    
+    def _plurals(self, word: str) -> List[str]:
+        """Get plural forms that should match a keyword word"""
+        if not word.isalpha():
+            return []
+        if word.endswith("y") and len(word) > 2 and word[-2] not in "aeiou":
+            return [word + "s", word[:-1] + "ies"]
+        if word.endswith(("s", "x", "ch", "sh")):
+            return [word + "es"]
+        return [word + "s"]
+    
+    def _build_automaton(self, keyword_topics: Dict[Tuple[str, ...], List[int]]) -> None:
+        """Build goto, failure and output tables over word ids"""
+        self._goto: List[Dict[int, int]] = [{}]
+        outputs: List[List[Tuple[int, float]]] = [[]]
+        
+        for words, topic_indexes in keyword_topics.items():
+            state = 0
+            for word in words:
+                word_id = self.word_ids[word]
+                if word_id not in self._goto[state]:
+                    self._goto[state][word_id] = len(self._goto)
+                    self._goto.append({})
+                    outputs.append([])
+                state = self._goto[state][word_id]
+            weight = 1.0 / len(topic_indexes)
+            outputs[state].extend((topic_index, weight) for topic_index in topic_indexes)
+        
+        # Breadth-first failure links; outputs of the failure state are merged in
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word_id, next_state in self._goto[state].items():
+                queue.append(next_state)
+                if state:
+                    fail = self._fail[state]
+                    while fail and word_id not in self._goto[fail]:
+                        fail = self._fail[fail]
+                    self._fail[next_state] = self._goto[fail].get(word_id, 0)
+                outputs[next_state] = outputs[next_state] + outputs[self._fail[next_state]]
+        self._outputs = [tuple(output) for output in outputs]
+        
+        # Single-word keyword outputs per word id, and words starting longer keywords
+        self._word_outputs = {word_id: self._outputs[state]
+                              for word_id, state in self._goto[0].items()}
+        self._phrase_starts = {word_id for word_id, state in self._goto[0].items()
+                               if self._goto[state]}
+        # The same keyed by word text, so the common case skips the id lookup
+        self._word_text_outputs = {word: self._word_outputs[word_id]
+                                   for word, word_id in self.word_ids.items()
+                                   if self._word_outputs.get(word_id)}
+        self._phrase_words = {word for word, word_id in self.word_ids.items()
+                              if word_id in self._phrase_starts}
+    
+    def _build_word_table(self) -> None:
+        """Build sorted arrays of known words, packed into 8-byte chunks, for the batch pass"""
+        words = [word.encode('utf-8') for word in self.word_ids]
+        self._chunk_count = -(-max(map(len, words), default=0) // 8)
+        if not words:
+            return
+        width = self._chunk_count * 8
+        packed = np.zeros((len(words), width), dtype=np.uint8)
+        for row, word in enumerate(words):
+            packed[row, :len(word)] = np.frombuffer(word, dtype=np.uint8)
+        chunks = packed.view('<u8')
+        keys = self._combine_chunks([chunks[:, k] for k in range(self._chunk_count)])
+        order = np.argsort(keys)
+        self._word_keys = keys[order]
+        self._word_chunks = chunks[order]
+        self._word_key_ids = np.array(list(self.word_ids.values()), dtype=np.int64)[order]
+        # Known (first byte, length) pairs rule out most other words before the lookup
+        self._word_shapes = np.zeros((256, width + 1), dtype=bool)
+        self._word_shapes[[word[0] for word in words], [len(word) for word in words]] = True
+        
+        # Single-word keyword weight per word id and topic, and the ids starting phrases
+        self._word_weights = np.zeros((max(self.word_ids.values()) + 1, len(self.topics)))
+        for word_id, outputs in self._word_outputs.items():
+            for topic_index, weight in outputs:
+                self._word_weights[word_id, topic_index] += weight
+        self._starts_phrase = np.zeros(len(self._word_weights), dtype=bool)
+        self._starts_phrase[list(self._phrase_starts)] = True
+    
+    def _combine_chunks(self, chunks: List[np.ndarray]) -> np.ndarray:
+        """Get one 64-bit key per word from its chunks; equal keys are checked chunk by chunk"""
+        keys = chunks[0].copy()
+        for chunk in chunks[1:]:
+            keys *= CHUNK_MIXER
+            keys ^= chunk
+        return keys
+    
+    def score(self, text: str) -> List[float]:
+        """Get a keyword match score per topic, in topic order"""
+        scores = [0.0] * len(self.topics)
+        # Word splitting and lookups stay in C
+        words = text.lower().translate(SEPARATOR_TABLE).split()
+        
+        if self._phrase_words.isdisjoint(words):
+            for outputs in filter(None, map(self._word_text_outputs.get, words)):
+                for topic_index, weight in outputs:
+                    scores[topic_index] += weight
+            return scores
+        
+        # Unknown words map to None
+        ids = list(map(self.word_ids.get, words))
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+        previous_position = -2
+        for position, word_id in zip(compress(count(), ids), filter(None, ids)):
+            # Unknown words in between break any multi-word match
+            if position != previous_position + 1:
+                state = 0
+            previous_position = position
+            
+            while state and word_id not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word_id, 0)
+            for topic_index, weight in outputs[state]:
+                scores[topic_index] += weight
+        return scores
+    
+    def classify(self, text: str) -> Tuple[str, Dict[str, float]]:
+        """Get the primary topic and the weights of the other matched topics
+        
+        Weights are each topic's share of the total score, listed in keyword
+        table order. Ties for primary go to the topic listed first.
+        """
+        scores = self.score(text)
+        total = sum(scores)
+        if not total:
+            return self.default_topic, {}
+        
+        primary_index = scores.index(max(scores))
+        secondary = {self.topics[index]: round(score / total, 3)
+                     for index, score in enumerate(scores)
+                     if score and index != primary_index}
+        return self.topics[primary_index], secondary
+    
+    def score_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Get keyword match scores of shape (texts, topics), equal to ``score`` per text
+        
+        All texts are joined into one byte array. Word boundaries, and the
+        words of keyword length, are found with array operations; each such
+        word is packed into 8-byte chunks and looked up among the known words
+        with a binary search. Only texts holding the first word of a
+        multi-word keyword go through the automaton.
+        """
+        scores = np.zeros((len(texts), len(self.topics)))
+        if not len(texts) or not self._chunk_count:
+            return scores
+        
+        # Non-ASCII separators and whitespace are rare, so only texts holding any are translated
+        lowered = [text.lower() for text in texts]
+        lowered = [text if text.isascii() else text.translate(BATCH_SEPARATOR_TABLE)
+                   for text in lowered]
+        lengths = np.fromiter((len(text) if text.isascii() else len(text.encode('utf-8'))
+                               for text in lowered), dtype=np.int64, count=len(lowered))
+        text_ends = np.cumsum(lengths + 1)
+        width = self._chunk_count * 8
+        buffer = ("\n".join(lowered) + "\n").encode('utf-8') + bytes(width)
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        
+        is_word = WORD_BYTES[data]
+        is_word[-width:] = False
+        edges = np.diff(is_word.view(np.int8), prepend=np.int8(0))
+        starts = np.flatnonzero(edges == 1)
+        word_lengths = np.flatnonzero(edges == -1) - starts
+        candidates = np.flatnonzero(word_lengths <= width)
+        candidates = candidates[self._word_shapes[data[starts[candidates]], word_lengths[candidates]]]
+        starts = starts[candidates]
+        word_lengths = word_lengths[candidates]
+        
+        # An unaligned 8-byte view at every offset reads each chunk with one gather
+        offsets = np.ndarray((len(data) - 7,), dtype='<u8', buffer=buffer, strides=(1,))
+        chunks = [offsets[starts + 8 * k] & CHUNK_MASKS[np.clip(word_lengths - 8 * k, 0, 8)]
+                  for k in range(self._chunk_count)]
+        keys = self._combine_chunks(chunks)
+        positions = np.minimum(np.searchsorted(self._word_keys, keys), len(self._word_keys) - 1)
+        found = self._word_keys[positions] == keys
+        for k, chunk in enumerate(chunks):
+            found &= self._word_chunks[positions, k] == chunk
+        
+        word_ids = self._word_key_ids[positions[found]]
+        text_numbers = np.searchsorted(text_ends, starts[found], side='right')
+        for topic_index in range(len(self.topics)):
+            scores[:, topic_index] = np.bincount(text_numbers, self._word_weights[word_ids, topic_index],
+                                                 minlength=len(texts))
+        for text_number in np.unique(text_numbers[self._starts_phrase[word_ids]]).tolist():
+            scores[text_number] = self.score(texts[text_number])
+        return scores
+    
+    def classify_many(self, texts: Sequence[str]) -> List[Tuple[str, Dict[str, float]]]:
+        """Get ``classify`` results for a batch of texts with one vectorized word pass"""
+        if len(texts) < self.MIN_BATCH or not self.topics:
+            return [self.classify(text) for text in texts]
+        
+        scores = self.score_many(texts)
+        # Summed column by column, in the same order as classify
+        totals = scores[:, 0].copy()
+        for topic_index in range(1, len(self.topics)):
+            totals += scores[:, topic_index]
+        primary = scores.argmax(axis=1)
+        scores[np.arange(len(texts)), primary] = 0
+        
+        secondary = [{} for _ in range(len(texts))]
+        rows, columns = np.nonzero(scores)
+        shares = (scores[rows, columns] / totals[rows]).tolist()
+        for row, column, share in zip(rows.tolist(), columns.tolist(), shares):
+            secondary[row][self.topics[column]] = round(share, 3)
+        return [(self.topics[index] if total else self.default_topic, weights)
+                for index, total, weights in zip(primary.tolist(), totals.tolist(), secondary)]
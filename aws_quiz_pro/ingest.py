@@ -0,0 +1,137 @@
+"""
+AWS Quiz Pro - Headless Bulk Ingest
+
+Pre-builds question caches for every PDF in a directory without starting
+the GUI. Run from the aws_quiz_pro directory:
+    python -m ingest path/to/pdfs [--workers N] [--cache-dir DIR]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+from config.constants import CACHE_PREFIX
+from core.cache_manager import CacheManager
+from core.fingerprint import FileFingerprinter
+from core.pdf_parser import PDFParser
+from core.text_extraction import PageTextExtractor
+
+
+MANIFEST_FILE = "ingest_manifest.json"
+
+
+def find_pdfs(directory: str, recursive: bool = True) -> List[str]:
+    """Find PDF files in a directory"""
+    pdf_files = []
+    for root, dirs, files in os.walk(directory):
+        pdf_files.extend(os.path.join(root, f) for f in files if f.lower().endswith('.pdf'))
+        if not recursive:
+            break
+    return sorted(pdf_files)
+
+
+def ingest_file(pdf_filename: str, cache_prefix: str) -> Dict:
+    """Parse one PDF into the cache; runs in a worker process
+    
+    The file's fingerprint entry is returned rather than saved, since every
+    worker shares one fingerprint index; the parent merges them all.
+    """
+    start = time.perf_counter()
+    # Files are already spread across processes, so extract pages serially
+    parser = PDFParser(cache_prefix, extractor=PageTextExtractor(max_workers=1))
+    parser.fingerprinter.autosave = False
+    result = {"file": pdf_filename, "status": "cached", "questions": 0, "parse_errors": []}
+    
+    try:
+        questions = parser.get_cached_questions(pdf_filename)
+        if questions:
+            # Only counted, so release the mapping right away
+            questions.close()
+        else:
+            result["status"] = "parsed"
+            questions = list(parser.iter_questions(pdf_filename, errors=result["parse_errors"]))
+            if questions:
+                parser.save_questions(pdf_filename, questions)
+            else:
+                result["status"] = "failed"
+                result["error"] = "no questions found"
+        result["questions"] = len(questions)
+        result["cache_file"] = parser.get_cache_file(pdf_filename)
+        result["fingerprint"] = parser.fingerprinter.get_entry(pdf_filename)
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def ingest_directory(directory: str, cache_dir: str, workers: int,
+                     recursive: bool = True) -> Dict:
+    """Parse every PDF in a directory in parallel and write a manifest"""
+    pdf_files = find_pdfs(directory, recursive)
+    cache_prefix = os.path.join(cache_dir, CACHE_PREFIX)
+    start = time.perf_counter()
+    
+    results = []
+    fingerprints = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(ingest_file, pdf, cache_prefix) for pdf in pdf_files]
+        for future in as_completed(futures):
+            result = future.result()
+            fingerprint = result.pop("fingerprint", None)
+            if fingerprint:
+                fingerprints[os.path.abspath(result["file"])] = fingerprint
+            results.append(result)
+            print(f"[{len(results)}/{len(pdf_files)}] {result['status']:<7} "
+                  f"{result['questions']:>6} questions {result['seconds']:>8.2f}s  "
+                  f"{result['file']}")
+    
+    if fingerprints:
+        cache_manager = CacheManager(cache_dir, CACHE_PREFIX)
+        FileFingerprinter(cache_manager.pin("fingerprints.json")).merge(fingerprints)
+    
+    manifest = {
+        "created": datetime.now().isoformat(),
+        "directory": os.path.abspath(directory),
+        "cache_dir": os.path.abspath(cache_dir),
+        "workers": workers,
+        "total_seconds": round(time.perf_counter() - start, 3),
+        "total_questions": sum(r["questions"] for r in results),
+        "files": sorted(results, key=lambda r: r["file"])
+    }
+    with open(os.path.join(cache_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Pre-build question caches for a PDF directory")
+    parser.add_argument("directory", help="directory containing quiz PDFs")
+    parser.add_argument("--cache-dir", default=".", help="where caches and the manifest go")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes")
+    parser.add_argument("--no-recursive", action="store_true",
+                        help="only look at the top level of the directory")
+    args = parser.parse_args()
+    
+    if not os.path.isdir(args.directory):
+        print(f"Not a directory: {args.directory}")
+        return 1
+    os.makedirs(args.cache_dir, exist_ok=True)
+    
+    manifest = ingest_directory(args.directory, args.cache_dir, args.workers,
+                                recursive=not args.no_recursive)
+    failed = [r for r in manifest["files"] if r["status"] == "failed"]
+    print(f"Ingested {len(manifest['files'])} PDFs ({manifest['total_questions']} questions) "
+          f"in {manifest['total_seconds']:.1f}s, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,13 +14,11 @@ def main():
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("blue")
     
-    # Check if PDF filename provided as argument
-    pdf_file = None
-    if len(sys.argv) > 1:
-        pdf_file = sys.argv[1]
+    # Check if PDF filenames provided as arguments; several are merged into one bank
+    pdf_files = sys.argv[1:] or None
     
     # Create and run the app
-    app = MainWindow(pdf_file)
+    app = MainWindow(pdf_files)
     app.run()
 
 
@@ -0,0 +1,74 @@
+"""
+AWS Quiz Pro - Carry History Over to a New Dump Version
+
+Links the questions of an old PDF version to a renumbered or lightly
+edited new one and moves their answer counters, attempts and review
+schedule to the new questions. Run from the aws_quiz_pro directory:
+    python -m migrate_history old.pdf new.pdf [--threshold 0.7] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List
+from config.constants import CACHE_PREFIX, PERFORMANCE_DB, REVIEW_FILE
+from core.pdf_parser import PDFParser
+from core.performance_store import PerformanceStore
+from core.question_identity import QuestionMapper
+from core.review_scheduler import ReviewScheduler
+
+
+def load_questions(parser: PDFParser, pdf_filename: str) -> List[Dict]:
+    """Get a PDF's questions from its cache, parsing and caching it if needed"""
+    questions = parser.get_cached_questions(pdf_filename)
+    if not questions:
+        questions = list(parser.iter_questions(pdf_filename))
+        if questions:
+            parser.save_questions(pdf_filename, questions)
+    return questions
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Carry answer history over to a new dump version")
+    parser.add_argument("old_pdf", help="PDF the history was recorded against")
+    parser.add_argument("new_pdf", help="new version of the same dump")
+    parser.add_argument("--threshold", type=float, default=0.7,
+                        help="minimum word similarity for linking edited questions")
+    parser.add_argument("--cache-dir", default=".", help="where question caches live")
+    parser.add_argument("--dry-run", action="store_true", help="report links without moving history")
+    args = parser.parse_args()
+    
+    for pdf_filename in (args.old_pdf, args.new_pdf):
+        if not os.path.isfile(pdf_filename):
+            print(f"Not a file: {pdf_filename}")
+            return 1
+    
+    pdf_parser = PDFParser(os.path.join(args.cache_dir, CACHE_PREFIX))
+    old_questions = load_questions(pdf_parser, args.old_pdf)
+    new_questions = load_questions(pdf_parser, args.new_pdf)
+    if not old_questions or not new_questions:
+        print("No questions found")
+        return 1
+    
+    start = time.perf_counter()
+    key_map, exact = QuestionMapper(args.threshold).map_keys(old_questions, new_questions)
+    print(f"{exact} questions unchanged, {len(key_map)} linked by similarity, "
+          f"{len(old_questions) - exact - len(key_map)} old questions unmatched "
+          f"({time.perf_counter() - start:.2f}s)")
+    if args.dry_run or not key_map:
+        return 0
+    
+    store = PerformanceStore(PERFORMANCE_DB)
+    counters = store.remap(key_map)
+    store.close()
+    scheduler = ReviewScheduler(REVIEW_FILE)
+    schedules = scheduler.remap(key_map)
+    scheduler.save()
+    print(f"Moved answer counters of {counters} and review schedules of {schedules} questions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -169,6 +169,7 @@ class ReviewWrongDialog:
     
     def __init__(self, parent, wrong_answers: List[Dict]):
         self.wrong_answers = wrong_answers
+        self.wrong_by_number = {wrong["question_number"]: wrong for wrong in wrong_answers}
         self.create_dialog(parent)
     
     def create_dialog(self, parent):
@@ -241,10 +242,7 @@ class ReviewWrongDialog:
         question_num = int(selection.split(":")[0][1:])
         
         # Find question
-        wrong_answer = next(
-            (w for w in self.wrong_answers if w["question_number"] == question_num),
-            None
-        )
+        wrong_answer = self.wrong_by_number.get(question_num)
         
         if not wrong_answer:
             return
@@ -7,7 +7,14 @@ from tkinter import messagebox
 from config.settings import ConfigManager
 from config.constants import *
 from core.quiz_manager import QuizManager
+from core.exam_blueprint import ExamBlueprint
+from core.review_scheduler import ReviewScheduler
+from core.session_journal import SessionJournal
+from core.performance_store import PerformanceStore
 from core.pdf_parser import PDFParser
+from core.cache_manager import CacheManager
+from core.load_controller import LoadController
+from core.dedup import QuestionDeduplicator
 from core.statistics import StatisticsManager
 from ui.quiz_tab import QuizTab
 from ui.review_tab import ReviewTab
@@ -28,11 +35,34 @@ class MainWindow:
         # Initialize managers
         self.config_manager = ConfigManager(CONFIG_FILE)
         self.stats_manager = StatisticsManager(STATS_FILE)
-        self.quiz_manager = QuizManager()
-        self.pdf_parser = PDFParser(CACHE_PREFIX)
+        journal = None
+        if self.config_manager.get("auto_save_progress", True):
+            journal = SessionJournal(JOURNAL_FILE, JOURNAL_SYNC_EVERY)
+        self.performance_store = PerformanceStore(PERFORMANCE_DB, STORE_BATCH_SIZE, STORE_FLUSH_INTERVAL)
+        self.quiz_manager = QuizManager(
+            ReviewScheduler(REVIEW_FILE, REVIEW_SAVE_EVERY), ExamBlueprint(BLUEPRINT_FILE), journal, self.performance_store
+        )
+        self.apply_exam_weights()
+        self.cache_manager = CacheManager(
+            self.config_manager.get("cache_dir", "."),
+            CACHE_PREFIX,
+            self.config_manager.get("cache_max_mb", 512) * 1024 * 1024
+        )
+        self.cache_manager.evict()
+        self.pdf_parser = PDFParser(
+            CACHE_PREFIX,
+            cache_compression=self.config_manager.get("cache_compression", "none"),
+            cache_manager=self.cache_manager
+        )
+        self.load_controller = LoadController(
+            self.pdf_parser,
+            lambda callback: self.root.after(0, callback),
+            postprocess=self.deduplicate_questions
+        )
         
         # PDF filename
         self.pdf_filename = pdf_filename
+        self.streamed_ids = set()
         
         # Create UI
         self.create_ui()
@@ -70,41 +100,91 @@ class MainWindow:
             self.notebook.add("⚙️ Settings"),
             self.config_manager,
             self.on_settings_saved,
-            self.on_clear_data
+            self.on_clear_data,
+            self.cache_manager
         )
     
-    def on_load_pdf_clicked(self, filename=None):
-        """Handle PDF load request"""
-        if filename:
-            self.pdf_filename = filename
+    def on_load_pdf_clicked(self, filenames=None):
+        """Handle PDF load request for one file or a list of files"""
+        if filenames:
+            self.pdf_filename = filenames
         
         if self.pdf_filename:
             self.load_pdf(self.pdf_filename)
     
-    def load_pdf(self, filename):
-        """Load PDF file"""
-        import threading
-        
-        def load():
-            questions = self.pdf_parser.parse_pdf(filename)
-            self.root.after(0, lambda: self.on_pdf_loaded(questions))
-        
+    def load_pdf(self, filenames):
+        """Load one or more PDFs into a single bank, streaming the first questions in"""
+        self.streamed_ids = set()
         self.quiz_tab.show_loading()
-        threading.Thread(target=load, daemon=True).start()
+        self.load_controller.start(
+            filenames,
+            on_complete=self.on_pdf_loaded,
+            on_first_batch=lambda questions: self.on_pdf_loaded(questions, complete=False),
+            on_progress=self.quiz_tab.show_progress
+        )
     
-    def on_pdf_loaded(self, questions):
-        """Handle PDF loading completion"""
-        if questions:
+    def apply_exam_weights(self):
+        """Set weighted exam sampling exponents from settings"""
+        sampler = self.quiz_manager.exam_sampler
+        sampler.error_exponent = self.config_manager.get("weight_error_exponent", 1.0)
+        sampler.recency_exponent = self.config_manager.get("weight_recency_exponent", 0.5)
+        sampler.topic_exponent = self.config_manager.get("weight_topic_exponent", 1.0)
+    
+    def deduplicate_questions(self, questions):
+        """Merge or flag near-duplicate questions per settings; runs on the loader thread"""
+        mode = self.config_manager.get("dedup_mode", "off")
+        if mode not in ("merge", "flag"):
+            return questions
+        
+        deduplicator = QuestionDeduplicator(self.config_manager.get("dedup_threshold", 0.85))
+        questions, report = deduplicator.deduplicate(questions, merge=mode == "merge")
+        if report:
+            duplicates = sum(len(cluster["duplicate_ids"]) for cluster in report)
+            action = "Merged" if mode == "merge" else "Flagged"
+            print(f"{action} {duplicates} near-duplicate questions in {len(report)} clusters")
+        return questions
+    
+    def on_pdf_loaded(self, questions, complete=True):
+        """Handle PDF loading completion or arrival of the first streamed batch"""
+        if not complete:
             self.quiz_manager.load_questions(questions)
+            self.streamed_ids = {id(question) for question in questions}
+            self.quiz_tab.on_questions_loaded(len(questions), complete=False)
+        elif questions:
+            if self.streamed_ids:
+                # Keep a quiz started from the first batch running; deduplication
+                # may have dropped some of the streamed questions from the list
+                self.quiz_manager.add_questions(
+                    [question for question in questions if id(question) not in self.streamed_ids]
+                )
+            else:
+                self.quiz_manager.load_questions(questions)
+            self.streamed_ids = set()
             self.quiz_tab.on_questions_loaded(len(questions))
+            self.offer_resume()
         else:
+            self.streamed_ids = set()
             messagebox.showerror("Error", "Failed to load questions from PDF")
             self.quiz_tab.on_questions_load_failed()
     
+    def offer_resume(self):
+        """Offer to continue a quiz left unfinished by a crash"""
+        journal = self.quiz_manager.journal
+        if not journal or self.quiz_manager.start_time or not journal.replay():
+            return
+        
+        if messagebox.askyesno("Resume Quiz", "A quiz was interrupted before it finished.\nResume it?"):
+            if not self.quiz_tab.resume_quiz():
+                messagebox.showwarning("Resume Quiz", "The interrupted quiz's questions are not all loaded.")
+        else:
+            journal.discard()
+    
     def on_quiz_finished(self, results):
         """Handle quiz completion"""
+        self.quiz_manager.end_session()
         question_order = self.quiz_tab.get_question_order()
-        self.stats_manager.record_quiz(results, question_order)
+        self.stats_manager.record_quiz(results, question_order, self.quiz_manager.answered_questions)
+        self.quiz_manager.scheduler.save()
         self.stats_tab.update_display()
         
         # Update review tab
@@ -115,6 +195,12 @@ class MainWindow:
         # Apply appearance mode
         appearance = self.config_manager.get("appearance_mode", "dark")
         ctk.set_appearance_mode(appearance)
+        self.apply_exam_weights()
+        
+        # Apply cache size limit
+        self.cache_manager.max_bytes = self.config_manager.get("cache_max_mb", 512) * 1024 * 1024
+        self.cache_manager.evict()
+        self.settings_tab.update_cache_stats()
         messagebox.showinfo("Settings", "Settings saved successfully!")
     
     def on_clear_data(self):
@@ -133,4 +219,9 @@ class MainWindow:
     def run(self):
         """Start the application"""
         self.stats_tab.update_display()
-        self.root.mainloop()
\ No newline at end of file
+        self.root.mainloop()
+        # Answers since the last periodic save, e.g. from an unfinished quiz
+        self.quiz_manager.scheduler.save()
+        self.performance_store.close()
+        self.quiz_manager.all_questions.close()
+        self.pdf_parser.extractor.close()
\ No newline at end of file
@@ -2,10 +2,11 @@
 Quiz Tab Interface
 """
 
+import os
 import tkinter as tk
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-from typing import Callable, Set
+from typing import Callable, Dict, Set
 from datetime import datetime
 from config.constants import EXAM_QUESTION_COUNT, PDF_EXTENSIONS
 from ui.dialogs import ResultsDialog, ReviewWrongDialog
@@ -23,6 +24,7 @@ class QuizTab:
         self.on_quiz_finished = on_quiz_finished
         
         self.exam_timer_id = None
+        self.showing_load_progress = False
         self.selected_option = None
         self.selected_options = []
         
@@ -33,6 +35,9 @@ class QuizTab:
         # Top controls
         self.create_top_controls()
         
+        # Question filters
+        self.create_filter_controls()
+        
         # Progress section
         self.create_progress_section()
         
@@ -57,7 +62,15 @@ class QuizTab:
             command=self.load_pdf_dialog,
             width=120, 
             height=35
-        ).pack(side="left", padx=(10, 20))
+        ).pack(side="left", padx=(10, 5))
+        
+        ctk.CTkButton(
+            top_frame,
+            text="📂 Load Folder",
+            command=self.load_folder_dialog,
+            width=120,
+            height=35
+        ).pack(side="left", padx=(5, 20))
         
         # Quiz mode
         mode_frame = ctk.CTkFrame(top_frame)
@@ -67,7 +80,8 @@ class QuizTab:
         self.quiz_mode = tk.StringVar(value="Practice")
         self.mode_combo = ctk.CTkComboBox(
             mode_frame,
-            values=["Practice", f"Exam ({EXAM_QUESTION_COUNT} Questions)"],
+            values=["Practice", f"Exam ({EXAM_QUESTION_COUNT} Questions)",
+                    f"Weak Spots Exam ({EXAM_QUESTION_COUNT} Questions)", "Spaced Review"],
             variable=self.quiz_mode,
             width=180,
             command=self.on_mode_changed
@@ -117,6 +131,82 @@ class QuizTab:
         )
         self.start_button.pack(side="left", padx=5)
     
+    def create_filter_controls(self):
+        """Create question filter bar"""
+        filters_frame = ctk.CTkFrame(self.parent)
+        filters_frame.pack(fill="x", padx=10, pady=(0, 20))
+        
+        ctk.CTkLabel(filters_frame, text="Topic:").pack(side="left", padx=(10, 5))
+        self.topic_filter = tk.StringVar(value="All")
+        self.topic_combo = ctk.CTkComboBox(
+            filters_frame,
+            values=["All"],
+            variable=self.topic_filter,
+            width=150
+        )
+        self.topic_combo.pack(side="left", padx=(0, 10))
+        
+        ctk.CTkLabel(filters_frame, text="Answers:").pack(side="left", padx=(10, 5))
+        self.answer_type_filter = tk.StringVar(value="All")
+        self.answer_type_combo = ctk.CTkComboBox(
+            filters_frame,
+            values=["All", "Single", "Multiple"],
+            variable=self.answer_type_filter,
+            width=100
+        )
+        self.answer_type_combo.pack(side="left", padx=(0, 10))
+        
+        ctk.CTkLabel(filters_frame, text="Source:").pack(side="left", padx=(10, 5))
+        self.source_filter = tk.StringVar(value="All")
+        self.source_combo = ctk.CTkComboBox(
+            filters_frame,
+            values=["All"],
+            variable=self.source_filter,
+            width=180
+        )
+        self.source_combo.pack(side="left", padx=(0, 10))
+        
+        self.wrong_filter = tk.BooleanVar(value=False)
+        self.wrong_check = ctk.CTkCheckBox(
+            filters_frame,
+            text="Previously wrong",
+            variable=self.wrong_filter
+        )
+        self.wrong_check.pack(side="left", padx=10)
+        
+        self.unseen_filter = tk.BooleanVar(value=False)
+        self.unseen_check = ctk.CTkCheckBox(
+            filters_frame,
+            text="Never seen",
+            variable=self.unseen_filter
+        )
+        self.unseen_check.pack(side="left", padx=10)
+    
+    def get_filters(self) -> Dict:
+        """Get the selected filters as QuestionBank.filter arguments"""
+        filters = {
+            "previously_wrong": self.wrong_filter.get(),
+            "never_seen": self.unseen_filter.get()
+        }
+        if self.topic_filter.get() != "All":
+            filters["topics"] = [self.topic_filter.get()]
+        if self.source_filter.get() != "All":
+            filters["sources"] = [self.source_filter.get()]
+        if self.answer_type_filter.get() != "All":
+            filters["multi_answer"] = self.answer_type_filter.get() == "Multiple"
+        return filters
+    
+    def update_filter_choices(self):
+        """Offer the topics and sources of the loaded bank"""
+        bank = self.quiz_manager.all_questions
+        self.topic_combo.configure(values=["All"] + sorted(bank.topics))
+        sources = sorted(source for source in bank.sources if source)
+        self.source_combo.configure(values=["All"] + sources)
+        if self.topic_filter.get() not in bank.topics:
+            self.topic_filter.set("All")
+        if self.source_filter.get() not in sources:
+            self.source_filter.set("All")
+    
     def create_progress_section(self):
         """Create progress display section"""
         progress_frame = ctk.CTkFrame(self.parent)
@@ -248,44 +338,90 @@ class QuizTab:
         self.review_all_button.pack(side="right", padx=5)
     
     def load_pdf_dialog(self):
-        """Open file dialog to load PDF"""
-        filename = filedialog.askopenfilename(
-            title="Select AWS Quiz PDF",
+        """Open file dialog to load one or more PDFs"""
+        filenames = filedialog.askopenfilenames(
+            title="Select AWS Quiz PDFs",
             filetypes=PDF_EXTENSIONS
         )
-        if filename:
-            self.on_load_pdf(filename)
+        if filenames:
+            self.on_load_pdf(list(filenames))
+    
+    def load_folder_dialog(self):
+        """Open folder dialog to load every PDF in a folder"""
+        folder = filedialog.askdirectory(title="Select Folder of AWS Quiz PDFs")
+        if not folder:
+            return
+        
+        filenames = sorted(
+            os.path.join(folder, name) for name in os.listdir(folder)
+            if name.lower().endswith(".pdf")
+        )
+        if filenames:
+            self.on_load_pdf(filenames)
+        else:
+            messagebox.showwarning("No PDFs", "The selected folder contains no PDF files.")
     
     def show_loading(self):
         """Show loading state"""
+        self.showing_load_progress = True
         self.question_label.configure(text="📚 Loading questions from PDF...")
         self.start_button.configure(state="disabled", text="Loading...")
+        self.progress_bar.set(0)
     
-    def on_questions_loaded(self, count):
+    def show_progress(self, pages_done, total_pages):
+        """Show PDF parsing progress until a quiz is started"""
+        if not self.showing_load_progress:
+            return
+        self.progress_label.configure(text=f"Parsing page {pages_done} of {total_pages}")
+        self.progress_bar.set(pages_done / total_pages if total_pages else 0)
+    
+    def on_questions_loaded(self, count, complete=True):
         """Handle successful question loading"""
-        self.question_label.configure(text=f"✅ Loaded {count} questions successfully!")
+        if complete and self.showing_load_progress:
+            self.showing_load_progress = False
+            self.progress_label.configure(text="No quiz loaded")
+            self.progress_bar.set(0)
+        
+        self.update_filter_choices()
+        if complete:
+            self.question_label.configure(text=f"✅ Loaded {count} questions successfully!")
+        else:
+            self.question_label.configure(
+                text=f"📚 {count} questions ready, still loading the rest..."
+            )
         self.start_button.configure(state="normal", text="🚀 Start Quiz")
     
     def on_questions_load_failed(self):
         """Handle failed question loading"""
+        self.showing_load_progress = False
+        self.progress_label.configure(text="No quiz loaded")
+        self.progress_bar.set(0)
         self.question_label.configure(text="❌ Failed to load questions from PDF")
         self.start_button.configure(state="disabled", text="No Questions")
     
     def on_mode_changed(self, *args):
         """Handle quiz mode change"""
         is_exam = "Exam" in self.quiz_mode.get()
+        is_review = self.quiz_mode.get() == "Spaced Review"
         
-        if is_exam:
+        filter_widgets = [self.difficulty_combo, self.topic_combo, self.answer_type_combo,
+                          self.source_combo, self.wrong_check, self.unseen_check]
+        if is_exam or is_review:
             self.order_combo.configure(state="disabled")
-            self.order_combo.set("Random")
-            self.difficulty_combo.configure(state="disabled")
+            if is_exam:
+                self.order_combo.set("Random")
+            for widget in filter_widgets:
+                widget.configure(state="disabled")
         else:
             self.order_combo.configure(state="normal")
-            self.difficulty_combo.configure(state="normal")
+            for widget in filter_widgets:
+                widget.configure(state="normal")
     
     def start_quiz(self):
         """Start the quiz"""
         exam_mode = "Exam" in self.quiz_mode.get()
+        spaced_review = self.quiz_mode.get() == "Spaced Review"
+        weighted_exam = self.quiz_mode.get().startswith("Weak Spots")
         difficulty = self.difficulty_filter.get()
         order = self.question_order.get()
         
@@ -293,34 +429,77 @@ class QuizTab:
             exam_mode, 
             difficulty, 
             order,
-            EXAM_QUESTION_COUNT
+            EXAM_QUESTION_COUNT,
+            self.get_filters(),
+            spaced_review,
+            self.config_manager.get("review_batch_size", 20),
+            weighted_exam
         )
         
         if not success:
-            messagebox.showwarning(
-                "Warning",
-                f"Not enough questions for exam mode. Need {EXAM_QUESTION_COUNT}."
-            )
+            if exam_mode:
+                message = f"Not enough questions for exam mode. Need {EXAM_QUESTION_COUNT}."
+            elif spaced_review:
+                message = "No questions are due for review right now."
+            else:
+                message = "No questions match the selected filters."
+            messagebox.showwarning("Warning", message)
             return
         
-        # Update UI state
-        if exam_mode:
+        # Tell when the bank could not fill the blueprint's topic targets
+        distribution = self.quiz_manager.exam_distribution
+        if distribution and self.quiz_manager.blueprint.topics:
+            short = [f"{topic}: {entry['count']} of {entry['target']}"
+                     for topic, entry in distribution.items() if entry["count"] < entry["target"]]
+            if short:
+                messagebox.showinfo(
+                    "Exam Blueprint",
+                    "Not enough questions for some blueprint topics:\n" + "\n".join(short)
+                    + "\n\nOther topics were used to fill the exam."
+                )
+        
+        self.begin_quiz()
+    
+    def resume_quiz(self) -> bool:
+        """Continue the quiz a crash interrupted, if the session journal has one"""
+        if not self.quiz_manager.resume_session():
+            return False
+        
+        if self.quiz_manager.exam_mode:
+            self.quiz_mode.set(f"Exam ({EXAM_QUESTION_COUNT} Questions)")
+        elif self.quiz_manager.spaced_review:
+            self.quiz_mode.set("Spaced Review")
+        else:
+            self.quiz_mode.set("Practice")
+        self.on_mode_changed()
+        self.score_label.configure(
+            text=f"Score: {self.quiz_manager.score}/{len(self.quiz_manager.session)}"
+        )
+        
+        elapsed = (datetime.now() - self.quiz_manager.start_time).total_seconds()
+        self.begin_quiz(int(elapsed))
+        return True
+    
+    def begin_quiz(self, elapsed: int = 0):
+        """Set up controls for a started or resumed quiz and show its question"""
+        self.showing_load_progress = False
+        if self.quiz_manager.exam_mode:
             self.difficulty_combo.configure(state="disabled")
             self.hint_button.configure(state="disabled")
-            self.start_exam_timer()
+            self.start_exam_timer(elapsed)
         else:
             self.hint_button.configure(state="normal")
         
         self.submit_button.configure(state="normal")
         self.load_question()
     
-    def start_exam_timer(self):
-        """Start exam countdown timer"""
+    def start_exam_timer(self, elapsed: int = 0):
+        """Start exam countdown timer, less any time already spent"""
         if self.exam_timer_id:
             self.parent.after_cancel(self.exam_timer_id)
         
         exam_time = self.config_manager.get("exam_time_limit", 90)
-        self.quiz_manager.exam_time_remaining = exam_time * 60
+        self.quiz_manager.exam_time_remaining = max(exam_time * 60 - elapsed, 0)
         self.update_exam_timer()
     
     def update_exam_timer(self):
@@ -371,7 +550,9 @@ class QuizTab:
         
         # Display question
         question_display = f"Q{current}"
-        if not self.quiz_manager.exam_mode and question_data.get('id'):
+        if not self.quiz_manager.exam_mode and question_data.get('source'):
+            question_display += f" (Original Q#{question_data['source_id']} in {question_data['source']})"
+        elif not self.quiz_manager.exam_mode and question_data.get('id'):
             question_display += f" (Original Q#{question_data['id']})"
         question_display += f": {question_data['question']}"
         
@@ -432,11 +613,7 @@ class QuizTab:
     
     def restore_previous_answer(self, question_data):
         """Restore previously selected answer"""
-        answered_q = next(
-            (q for q in self.quiz_manager.answered_questions 
-             if q["question"]["id"] == question_data["id"]),
-            None
-        )
+        answered_q = self.quiz_manager.get_answer(question_data)
         
         if answered_q:
             user_answers = answered_q["user_answer"]
@@ -498,8 +675,8 @@ class QuizTab:
         
         # Update score
         score = self.quiz_manager.score
-        current = self.quiz_manager.current_question_index + 1
-        self.score_label.configure(text=f"Score: {score}/{current}")
+        answered = len(self.quiz_manager.session)
+        self.score_label.configure(text=f"Score: {score}/{answered}")
         
         # Update buttons
         self.submit_button.configure(state="disabled", text="Answer Submitted")
@@ -4,18 +4,20 @@ Settings Tab Interface
 
 import tkinter as tk
 import customtkinter as ctk
-from typing import Callable
+from tkinter import messagebox
+from typing import Callable, Optional
 
 
 class SettingsTab:
     """Settings interface tab"""
     
     def __init__(self, parent, config_manager, on_settings_saved: Callable, 
-                 on_clear_data: Callable):
+                 on_clear_data: Callable, cache_manager: Optional[object] = None):
         self.parent = parent
         self.config_manager = config_manager
         self.on_settings_saved = on_settings_saved
         self.on_clear_data = on_clear_data
+        self.cache_manager = cache_manager
         
         self.create_ui()
     
@@ -99,6 +101,25 @@ class SettingsTab:
         )
         self.default_order_combo.pack(side="left", padx=10)
         
+        # Near-duplicate handling when loading
+        dedup_frame = ctk.CTkFrame(quiz_settings_frame)
+        dedup_frame.pack(fill="x", padx=20, pady=5)
+        
+        ctk.CTkLabel(
+            dedup_frame,
+            text="Near-duplicate questions:"
+        ).pack(side="left")
+        
+        self.dedup_mode_var = tk.StringVar(
+            value=self.config_manager.get("dedup_mode", "off")
+        )
+        ctk.CTkComboBox(
+            dedup_frame,
+            values=["off", "flag", "merge"],
+            variable=self.dedup_mode_var,
+            width=120
+        ).pack(side="right", padx=10)
+        
         # Show explanations
         self.explanations_var = tk.BooleanVar(
             value=self.config_manager.get("show_explanations", True)
@@ -175,6 +196,59 @@ class SettingsTab:
             width=200,
             height=40
         ).pack(pady=10)
+        
+        if self.cache_manager:
+            self.create_cache_settings(data_frame)
+    
+    def create_cache_settings(self, parent):
+        """Create question cache size and usage controls"""
+        cache_limit_frame = ctk.CTkFrame(parent)
+        cache_limit_frame.pack(fill="x", padx=20, pady=5)
+        
+        ctk.CTkLabel(
+            cache_limit_frame,
+            text="Cache size limit (MB):"
+        ).pack(side="left")
+        
+        self.cache_limit_entry = ctk.CTkEntry(cache_limit_frame, width=100)
+        self.cache_limit_entry.insert(0, str(self.config_manager.get("cache_max_mb", 512)))
+        self.cache_limit_entry.pack(side="right", padx=10)
+        
+        self.cache_stats_label = ctk.CTkLabel(parent, text="", justify="left")
+        self.cache_stats_label.pack(anchor="w", padx=20, pady=5)
+        self.update_cache_stats()
+        
+        ctk.CTkButton(
+            parent,
+            text="🗑️ Clear Question Cache",
+            command=self.clear_cache,
+            width=200,
+            height=40
+        ).pack(pady=10)
+    
+    def update_cache_stats(self):
+        """Refresh cache usage display"""
+        if not self.cache_manager:
+            return
+        
+        stats = self.cache_manager.get_stats()
+        self.cache_stats_label.configure(
+            text=f"Cache: {stats['files']} files, {stats['bytes'] / (1024 * 1024):.1f} MB used\n"
+                 f"Hits: {stats['hits']}  Misses: {stats['misses']}  "
+                 f"Evictions: {stats['evictions']}"
+        )
+    
+    def clear_cache(self):
+        """Delete all cached question banks and page texts"""
+        confirm = messagebox.askyesno(
+            "Clear Cache",
+            "Cached PDFs will be parsed again on next load.\nAre you sure?"
+        )
+        
+        if confirm:
+            count = self.cache_manager.clear()
+            self.update_cache_stats()
+            messagebox.showinfo("Success", f"Removed {count} cache files.")
     
     def save_settings(self):
         """Save all settings"""
@@ -182,6 +256,7 @@ class SettingsTab:
         self.config_manager.set("timer_enabled", self.timer_var.get())
         self.config_manager.set("appearance_mode", self.appearance_mode.get())
         self.config_manager.set("default_question_order", self.default_order_var.get())
+        self.config_manager.set("dedup_mode", self.dedup_mode_var.get())
         
         try:
             self.config_manager.set("time_per_question", int(self.timer_entry.get()))
@@ -193,5 +268,11 @@ class SettingsTab:
         except ValueError:
             self.config_manager.set("exam_time_limit", 90)
         
+        if self.cache_manager:
+            try:
+                self.config_manager.set("cache_max_mb", max(1, int(self.cache_limit_entry.get())))
+            except ValueError:
+                self.config_manager.set("cache_max_mb", 512)
+        
         self.config_manager.save()
         self.on_settings_saved()
\ No newline at end of file
@@ -7,6 +7,7 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from datetime import datetime
 import numpy as np
+from core.analytics import AttemptAnalytics
 
 
 class StatsTab:
@@ -15,6 +16,7 @@ class StatsTab:
     def __init__(self, parent, stats_manager):
         self.parent = parent
         self.stats_manager = stats_manager
+        self.analytics = AttemptAnalytics(stats_manager)
         
         self.create_ui()
     
@@ -55,6 +57,10 @@ class StatsTab:
         self.exam_attempts_label = ctk.CTkLabel(exam_card, text="0", font=("Arial", 24, "bold"))
         self.exam_attempts_label.pack(pady=(0, 10))
         
+        # Weakest topics by answer accuracy
+        self.weak_topics_label = ctk.CTkLabel(summary_frame, text="", font=("Arial", 12))
+        self.weak_topics_label.pack(pady=(0, 10))
+        
         # Charts frame
         self.charts_frame = ctk.CTkFrame(self.parent)
         self.charts_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -67,9 +73,30 @@ class StatsTab:
         self.avg_score_label.configure(text=f"{summary['average_score']:.1f}%")
         self.best_score_label.configure(text=f"{summary['best_score']:.1f}%")
         self.exam_attempts_label.configure(text=str(summary["exam_attempts"]))
+        self.update_weak_topics()
         
         self.update_charts()
     
+    def update_weak_topics(self):
+        """Show the topics answered least accurately"""
+        try:
+            report = self.analytics.get_report()
+        except Exception as e:
+            print(f"Error computing analytics: {e}")
+            report = {}
+        if not report:
+            self.weak_topics_label.configure(text="")
+            return
+        
+        by_topic = report["by_topic"]
+        weakest = by_topic[by_topic["attempts"] >= 5].sort_values("accuracy").head(3)
+        parts = [f"{topic} {row.accuracy * 100:.0f}% ({row.attempts})" for topic, row in weakest.iterrows()]
+        percentiles = report["time_percentiles"]
+        self.weak_topics_label.configure(
+            text=f"Weakest topics: {', '.join(parts) or 'n/a'}   |   "
+                 f"Answer time median {percentiles[50]:.0f}s, p90 {percentiles[90]:.0f}s"
+        )
+    
     def update_charts(self):
         """Update statistics charts"""
         try:
@@ -111,7 +138,7 @@ class StatsTab:
             canvas = FigureCanvasTkAgg(fig, self.charts_frame)
             canvas.draw()
             canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
-            
+        
         except Exception as e:
             error_label = ctk.CTkLabel(
                 self.charts_frame,
@@ -73,7 +73,7 @@ class FileUtils:
         """Get all cache files with given prefix"""
         try:
             return [f for f in os.listdir(directory) 
-                   if f.startswith(prefix) and f.endswith('.json')]
+                   if f.startswith(prefix) and f.endswith(('.json', '.bank'))]
         except:
             return []
     